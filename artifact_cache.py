@@ -0,0 +1,193 @@
+"""
+Cache em disco dos artefatos de compilação, endereçado por conteúdo.
+
+Cada entrada é um diretório cujo nome é o hash de tudo que influencia o
+resultado:
+    frontend: hash(fonte .lps, versão do compilador, opções do frontend) -> tac.pickle
+    backend:  hash(chave do frontend, opções do backend)  -> program.asm, program.o, program
+
+(na emissão direta não há .asm nem .o: a entrada guarda só o executável)
+
+Assim, um programa inalterado vai direto ao executável em cache, e se apenas
+as opções do backend mudarem o TAC em cache é reaproveitado sem refazer
+parse e análise semântica.
+
+A "versão do compilador" é o hash do código-fonte do pacote (todos os .py e
+.asm da raiz e as tabelas do PLY em tables/), então qualquer alteração nele
+invalida o cache. O tamanho total é limitado, com remoção LRU (pela data de
+modificação da entrada, atualizada a cada acesso). Percorrer o diretório custa
+O(entradas), então a remoção não roda a cada gravação: cada processo soma o
+que gravou e a executa quando isso passa de max_size / EVICT_FRACTION (e
+evict() pode ser chamada ao fim de um lote). O cache pode passar do limite em
+até essa fração por processo entre duas remoções.
+"""
+import glob
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# Arquivos que entram na versão do compilador (relativos a ROOT)
+COMPILER_FILES = ('*.py', '*.asm', os.path.join('tables', '*.py'))
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'LPMS_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'lpms')
+)
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024  # 256 MB
+EVICT_FRACTION = 16
+
+TAC_FILE = 'tac.pickle'
+ASM_FILE = 'program.asm'
+OBJ_FILE = 'program.o'
+EXE_FILE = 'program'
+
+_compiler_version = None
+_written = {}  # Diretório do cache -> bytes gravados por este processo desde a última remoção
+
+
+def compiler_files():
+    """Caminhos (relativos a ROOT, em ordem) dos arquivos que formam a versão do compilador"""
+    files = set()
+    for pattern in COMPILER_FILES:
+        files.update(os.path.relpath(path, ROOT) for path in glob.glob(os.path.join(ROOT, pattern)))
+    return sorted(files)
+
+
+def compiler_version():
+    global _compiler_version
+    if _compiler_version is None:
+        digest = hashlib.sha256()
+        for name in compiler_files():
+            with open(os.path.join(ROOT, name), 'rb') as f:
+                content = f.read()
+            # O nome entra no hash: renomear ou mover um módulo também muda a versão
+            digest.update(_hash(name, content).encode())
+        _compiler_version = digest.hexdigest()
+    return _compiler_version
+
+
+def _hash(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode()
+        elif not isinstance(part, bytes):
+            part = repr(part).encode()
+        digest.update(len(part).to_bytes(8, 'little'))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class ArtifactCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_size=DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+
+    def frontend_key(self, source, options=None):
+        return _hash('frontend', compiler_version(), source, sorted((options or {}).items()))
+
+    def backend_key(self, frontend_key, options=None):
+        return _hash('backend', frontend_key, sorted((options or {}).items()))
+
+    def _entry(self, key):
+        return os.path.join(self.directory, key)
+
+    def _touch(self, path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def load_tac(self, key):
+        """TAC em cache para a chave do frontend, ou None"""
+        path = os.path.join(self._entry(key), TAC_FILE)
+        try:
+            with open(path, 'rb') as f:
+                instructions = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        self._touch(self._entry(key))
+        return instructions
+
+    def store_tac(self, key, instructions):
+        self._store(key, {TAC_FILE: pickle.dumps(instructions, pickle.HIGHEST_PROTOCOL)})
+
+    def fetch_executable(self, key, output_dir, output_file):
+        """Copia .asm, .o (se houver) e o executável em cache para output_dir. Retorna o executável ou None."""
+        entry = self._entry(key)
+        if not os.path.isfile(os.path.join(entry, EXE_FILE)):
+            return None
+        os.makedirs(output_dir, exist_ok=True)
+        exe_file = os.path.join(output_dir, output_file)
+        try:
+            for name, suffix in ((ASM_FILE, '.asm'), (OBJ_FILE, '.o')):
+                if os.path.isfile(os.path.join(entry, name)):
+                    shutil.copy2(os.path.join(entry, name), exe_file + suffix)
+            shutil.copy2(os.path.join(entry, EXE_FILE), exe_file)
+        except OSError:
+            return None
+        self._touch(entry)
+        return exe_file
+
+    def store_executable(self, key, asm_file, obj_file, exe_file):
+        files = {ASM_FILE: asm_file, OBJ_FILE: obj_file, EXE_FILE: exe_file}
+        self._store(key, {name: path for name, path in files.items() if path is not None})
+
+    def _store(self, key, files):
+        # Escreve num diretório temporário e renomeia, para que processos
+        # concorrentes nunca vejam uma entrada pela metade
+        entry = self._entry(key)
+        if os.path.isdir(entry):
+            return
+        staging = tempfile.mkdtemp(prefix='.tmp-', dir=self.directory)
+        try:
+            for name, content in files.items():
+                target = os.path.join(staging, name)
+                if isinstance(content, bytes):
+                    with open(target, 'wb') as f:
+                        f.write(content)
+                else:
+                    shutil.copy2(content, target)
+            os.rename(staging, entry)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+        written = _written.get(self.directory, 0) + self._size(entry)
+        if written > self.max_size // EVICT_FRACTION:
+            self.evict()
+        else:
+            _written[self.directory] = written
+
+    def _size(self, path):
+        return sum(entry.stat().st_size for entry in os.scandir(path))
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.startswith('.tmp-'):
+                continue
+            path = self._entry(name)
+            try:
+                size = self._size(path)
+                entries.append((os.stat(path).st_mtime, size, path))
+            except OSError:
+                continue
+        return entries
+
+    def evict(self):
+        """Remove as entradas menos usadas recentemente até caber em max_size"""
+        _written[self.directory] = 0
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        for _, _, path in self._entries():
+            shutil.rmtree(path, ignore_errors=True)
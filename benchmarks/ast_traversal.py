@@ -0,0 +1,125 @@
+"""
+Benchmark dos percursos da AST (análise semântica, geração do TAC e print_tree).
+
+Mede cada passe em dois formatos de árvore:
+    larga:    N comandos em sequência no corpo do programa
+    profunda: N while aninhados, e no mais interno uma expressão com N somas
+              (uma árvore de BinOp com N níveis)
+e reporta o tempo por nó. Com os percursos iterativos (NodeVisitor) as árvores
+profundas não dependem do limite de recursão do Python, que fica no padrão.
+
+Uso:
+    python benchmarks/ast_traversal.py [--sizes 1000 10000 50000] [--runs N] [--json]
+"""
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Node, TACGenerator, parse_file  # noqa: E402
+from semantic_analyzer import SemanticAnalyzer  # noqa: E402
+
+
+def wide_program(size):
+    lines = ["Program Larga {", "    int a, b;", "    a = 1;", "    b = 2;"]
+    for index in range(size):
+        if index % 2:
+            lines.append(f"    a = a + b * {index % 97};")
+        else:
+            lines.append("    if (a > b) { b = b - 1; } else { print(a); }")
+    lines.append("}")
+    return '\n'.join(lines) + '\n'
+
+
+def deep_program(size):
+    lines = ["Program Profunda {", "    int a;", "    a = 0;"]
+    lines.extend("while (a < 1) {" for _ in range(size))
+    lines.append("a = a" + " + 1" * size + ";")
+    lines.extend("}" for _ in range(size))
+    lines.append("}")
+    return '\n'.join(lines) + '\n'
+
+
+def parse(source):
+    with tempfile.NamedTemporaryFile('w', suffix='.lps', delete=False) as f:
+        f.write(source)
+        filename = f.name
+    try:
+        return parse_file(filename)
+    finally:
+        os.unlink(filename)
+
+
+def count_nodes(ast):
+    count = 0
+    stack = [ast]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(child for child in node.children if isinstance(child, Node))
+    return count
+
+
+def print_tree(ast):
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        ast.print_tree()
+
+
+def measure(source, runs):
+    samples = {'semântica': [], 'tac': [], 'print_tree': []}
+    nodes = 0
+    for _ in range(runs):
+        ast = parse(source)  # A análise anota a AST: cada medição usa uma nova
+        nodes = count_nodes(ast)
+        start = time.perf_counter()
+        ok, errors = SemanticAnalyzer().analyze(ast)
+        samples['semântica'].append(time.perf_counter() - start)
+        if not ok:
+            raise AssertionError(f"Análise falhou: {errors}")
+        start = time.perf_counter()
+        ast.generate_tac(TACGenerator())
+        samples['tac'].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        print_tree(ast)
+        samples['print_tree'].append(time.perf_counter() - start)
+    return nodes, {name: statistics.median(values) for name, values in samples.items()}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000],
+                            help='comandos da árvore larga e níveis da árvore profunda')
+    arg_parser.add_argument('--runs', type=int, default=3)
+    arg_parser.add_argument('--json', action='store_true', help='emite os resultados em JSON')
+    args = arg_parser.parse_args()
+
+    results = []
+    for shape, generate in (('larga', wide_program), ('profunda', deep_program)):
+        for size in args.sizes:
+            # print_tree indenta cada linha pelo nível: na árvore profunda a
+            # saída cresce com o quadrado da profundidade, então para em 5 mil
+            if shape == 'profunda' and size > 5000:
+                continue
+            nodes, timings = measure(generate(size), args.runs)
+            results.append({'shape': shape, 'size': size, 'nodes': nodes,
+                            'us_per_node': {name: round(value / nodes * 1e6, 3) for name, value in timings.items()}})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    passes = list(results[0]['us_per_node'])
+    print(f"{'árvore':>10}{'tamanho':>9}{'nós':>9}" + ''.join(f"{name:>14}" for name in passes))
+    for result in results:
+        per_node = ''.join(f"{result['us_per_node'][name]:>10.3f}µs/n" for name in passes)
+        print(f"{result['shape']:>10}{result['size']:>9}{result['nodes']:>9}{per_node}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Benchmark do CFG e das análises de fluxo de dados (cfg.py, dataflow.py).
+
+Gera programas TAC sintéticos com milhares de blocos básicos (sequências de
+if/else e laços while aninhados) e mede a construção do CFG, os dominadores
+(com as fronteiras de dominância e as arestas de retorno) e cada análise. O
+custo por bloco deve ficar aproximadamente constante conforme o programa
+cresce: se o custo por bloco de alguma fase no maior tamanho passar de
+--tolerance vezes o do menor, ela é marcada e o benchmark sai com status 1.
+Como no timeit, o coletor de lixo fica desligado durante as medições.
+
+Uso:
+    python benchmarks/cfg_dataflow.py [--sizes 1000 2000 4000 8000 16000] [--runs N]
+                                      [--tolerance X] [--json]
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cfg import ControlFlowGraph  # noqa: E402
+from dataflow import AvailableExpressions, Liveness, ReachingDefinitions, solve  # noqa: E402
+from tac import Op, Quad, label, literal, temp, var  # noqa: E402
+
+VARIABLES = 32
+
+
+class ProgramBuilder:
+    def __init__(self, seed):
+        self.random = random.Random(seed)
+        self.instructions = [Quad(Op.DECLARE, var(f"v{i}")) for i in range(VARIABLES)]
+        self.temps = 0
+        self.labels = 0
+
+    def new_temp(self):
+        self.temps += 1
+        return temp(f"t{self.temps}")
+
+    def new_label(self):
+        self.labels += 1
+        return label(f"L{self.labels}")
+
+    def variable(self):
+        return var(f"v{self.random.randrange(VARIABLES)}")
+
+    def straight_line(self):
+        for _ in range(self.random.randint(1, 4)):
+            t = self.new_temp()
+            op = self.random.choice((Op.ADD, Op.SUB, Op.MUL))
+            self.instructions.append(Quad(op, t, self.variable(), self.variable()))
+            self.instructions.append(Quad(Op.COPY, self.variable(), t))
+
+    def condition(self):
+        t = self.new_temp()
+        self.instructions.append(Quad(Op.LT, t, self.variable(), literal(self.random.randint(0, 100))))
+        return t
+
+    def diamond(self):
+        # if (...) { ... } else { ... }: 4 blocos
+        else_label, end_label = self.new_label(), self.new_label()
+        self.instructions.append(Quad(Op.IF_FALSE, else_label, self.condition()))
+        self.straight_line()
+        self.instructions.append(Quad(Op.GOTO, end_label))
+        self.instructions.append(Quad(Op.LABEL, else_label))
+        self.straight_line()
+        self.instructions.append(Quad(Op.LABEL, end_label))
+        self.straight_line()
+
+    def loop(self, depth):
+        # while (...) { ... }: 3 blocos mais o corpo
+        start_label, end_label = self.new_label(), self.new_label()
+        self.instructions.append(Quad(Op.LABEL, start_label))
+        self.instructions.append(Quad(Op.IF_FALSE, end_label, self.condition()))
+        self.body(depth + 1)
+        self.instructions.append(Quad(Op.GOTO, start_label))
+        self.instructions.append(Quad(Op.LABEL, end_label))
+        self.instructions.append(Quad(Op.PRINT, None, self.variable()))
+
+    def body(self, depth):
+        for _ in range(self.random.randint(1, 3)):
+            if depth < 3 and self.random.random() < 0.3:
+                self.loop(depth)
+            else:
+                self.diamond()
+
+
+def generate(blocks, seed=0):
+    builder = ProgramBuilder(seed)
+    while True:
+        builder.body(0)
+        if len(ControlFlowGraph(builder.instructions).blocks) >= blocks:
+            return builder.instructions
+        # Evita reconstruir o CFG a cada passo em programas grandes
+        for _ in range(blocks // 100):
+            builder.body(0)
+
+
+def measure(function, runs, setup=None):
+    """Mediana em ms; setup, se dado, prepara fora da medição o argumento de function"""
+    samples = []
+    for _ in range(runs):
+        argument = setup() if setup is not None else None
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            function() if setup is None else function(argument)
+            samples.append((time.perf_counter() - start) * 1000)
+        finally:
+            gc.enable()
+    return statistics.median(samples)
+
+
+def growth(results):
+    """Razão entre o custo por bloco no maior e no menor tamanho, por fase"""
+    first, last = results[0], results[-1]
+    return {name: (last['ms'][name] / last['blocks']) / (first['ms'][name] / first['blocks'])
+            for name in first['ms']}
+
+
+def benchmark(instructions, runs):
+    cfg = ControlFlowGraph(instructions)
+
+    def dominators(graph):
+        graph.immediate_dominators()
+        graph.dominance_frontiers()
+        graph.back_edges()
+
+    timings = {
+        'cfg': measure(lambda: ControlFlowGraph(instructions), runs),
+        # Um grafo novo a cada medição, construído fora dela: os dominadores ficam em cache
+        'dominadores': measure(dominators, runs, setup=lambda: ControlFlowGraph(instructions)),
+        'liveness': measure(lambda: solve(Liveness(cfg)), runs),
+        'reaching': measure(lambda: solve(ReachingDefinitions(cfg)), runs),
+        'available': measure(lambda: solve(AvailableExpressions(cfg)), runs),
+    }
+    return len(cfg.blocks), timings
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 2000, 4000, 8000, 16000],
+                            help='número aproximado de blocos básicos')
+    arg_parser.add_argument('--runs', type=int, default=5)
+    arg_parser.add_argument('--tolerance', type=float, default=1.5,
+                            help='crescimento máximo do custo por bloco entre o menor e o maior tamanho')
+    arg_parser.add_argument('--json', action='store_true', help='emite os resultados em JSON')
+    args = arg_parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        instructions = generate(size)
+        blocks, timings = benchmark(instructions, args.runs)
+        results.append({'blocks': blocks, 'instructions': len(instructions),
+                        'ms': {name: round(value, 3) for name, value in timings.items()}})
+
+    ratios = growth(results)
+    superlinear = sorted(name for name, ratio in ratios.items() if ratio > args.tolerance)
+
+    if args.json:
+        print(json.dumps({'results': results, 'growth': {name: round(ratio, 2) for name, ratio in ratios.items()},
+                          'superlinear': superlinear}, indent=2))
+    else:
+        phases = list(results[0]['ms'])
+        print(f"{'blocos':>8}{'instruções':>12}" + ''.join(f"{name:>14}" for name in phases))
+        for result in results:
+            per_block = ''.join(f"{result['ms'][name] * 1000 / result['blocks']:>11.2f}µs/b" for name in phases)
+            print(f"{result['blocks']:>8}{result['instructions']:>12}{per_block}")
+        print(f"{'crescimento':>20}" + ''.join(f"{ratios[name]:>13.2f}x" for name in phases))
+        for name in superlinear:
+            print(f"SUPERLINEAR: {name} (custo por bloco {ratios[name]:.2f}x, tolerância {args.tolerance}x)")
+    if superlinear:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark de vazão de compile_source chamada de várias threads ao mesmo tempo.
+
+Compila os programas de benchmarks/programs e de programs/ (mais alguns com
+erros léxicos, sintáticos e semânticos, para os diagnósticos também passarem
+pelo teste) muitas vezes, com um ThreadPoolExecutor de 1, 2, 4 e 8 threads, e
+mede as compilações por segundo. Todo resultado é comparado com o da compilação
+sequencial: o artefato e os diagnósticos (com as linhas) precisam ser iguais,
+o que falharia se duas chamadas compartilhassem o lexer ou o parser.
+
+Com --processes mede também um ProcessPoolExecutor do mesmo tamanho: com o GIL
+as threads não compilam em paralelo, e a comparação mostra quanto se ganha
+trocando threads por processos.
+
+Uso:
+    python benchmarks/concurrency.py [--workers 1 2 4 8] [--tasks N] [--emit asm] [--processes] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from compiler_api import EMIT, compile_source  # noqa: E402
+
+PROGRAMS = [
+    os.path.join(ROOT, 'benchmarks', 'programs', name)
+    for name in sorted(os.listdir(os.path.join(ROOT, 'benchmarks', 'programs')))
+] + [os.path.join(ROOT, 'programs', name) for name in ('teste1.lps', 'teste2.lps', 'teste4.lps', 'teste5.lps')]
+
+INVALID_SOURCES = [
+    "Program Lexico {\n    int a;\n\n    a = 1 $ 2;\n}\n",
+    "Program Sintatico {\n    int a;\n    a = ;\n    print(a);\n}\n",
+    "Program Semantico {\n    int a;\n    b = a + 1;\n}\n",
+]
+
+
+def load_sources():
+    sources = []
+    for path in PROGRAMS:
+        with open(path) as f:
+            sources.append(f.read())
+    return sources + INVALID_SOURCES
+
+
+def summarize(text, emit):
+    """Resultado comparável (e serializável) de uma compilação"""
+    result = compile_source(text, {'emit': emit})
+    artifacts = result.as_dict()['artifacts']
+    return artifacts.get(emit), [(d.stage, d.line, d.message) for d in result.diagnostics]
+
+
+def run(executor_class, workers, sources, tasks, emit, expected):
+    start = time.perf_counter()
+    with executor_class(max_workers=workers) as pool:
+        futures = [pool.submit(summarize, sources[index % len(sources)], emit) for index in range(tasks)]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+    for index, result in enumerate(results):
+        if result != expected[index % len(sources)]:
+            raise AssertionError(f"Resultado divergente do sequencial no programa {index % len(sources)} "
+                                 f"com {workers} workers")
+    return tasks / elapsed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    arg_parser.add_argument('--tasks', type=int, default=400, help='compilações por medição')
+    arg_parser.add_argument('--emit', choices=EMIT, default='asm')
+    arg_parser.add_argument('--processes', action='store_true', help='mede também com processos')
+    arg_parser.add_argument('--json', action='store_true', help='emite os resultados em JSON')
+    args = arg_parser.parse_args()
+    if args.emit == 'executable':
+        arg_parser.error("use --emit asm, tac ou bytecode: o executável em memória exige o runtime freestanding")
+
+    sources = load_sources()
+    expected = [summarize(source, args.emit) for source in sources]
+    executors = [('threads', ThreadPoolExecutor)]
+    if args.processes:
+        executors.append(('processos', ProcessPoolExecutor))
+
+    results = []
+    for workers in args.workers:
+        result = {'workers': workers}
+        for name, executor_class in executors:
+            result[name] = round(run(executor_class, workers, sources, args.tasks, args.emit, expected), 1)
+        results.append(result)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    names = [name for name, _ in executors]
+    print(f"{len(sources)} programas, {args.tasks} compilações por medição, emit={args.emit}; "
+          f"resultados iguais aos sequenciais")
+    print(f"{'workers':>8}" + ''.join(f"{name + ' (comp/s)':>20}" for name in names))
+    for result in results:
+        print(f"{result['workers']:>8}" + ''.join(f"{result[name]:>20.1f}" for name in names))
+
+
+if __name__ == "__main__":
+    main()
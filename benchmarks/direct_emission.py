@@ -0,0 +1,95 @@
+"""
+Benchmark da latência de compilação com e sem o toolchain externo.
+
+Compila cada programa de benchmarks/programs (e de programs/, exceto os que não
+terminam) do .lps ao executável com --assembler nasm (nasm + ld, com .asm e .o
+em disco) e com --assembler direct (x86_encoder + elf_writer, em processo), sem
+cache, e compara a mediana do tempo de ponta a ponta. Os executáveis dos dois
+caminhos são executados com a mesma entrada e as saídas precisam ser iguais.
+Sem nasm no PATH, mede só a emissão direta.
+
+Uso:
+    python benchmarks/direct_emission.py [--runs N] [--json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from main import compile_to_nasm  # noqa: E402
+
+PROGRAMS = [
+    os.path.join(ROOT, 'benchmarks', 'programs', name)
+    for name in sorted(os.listdir(os.path.join(ROOT, 'benchmarks', 'programs')))
+] + [os.path.join(ROOT, 'programs', name) for name in ('teste1.lps', 'teste2.lps', 'teste4.lps', 'teste5.lps')]
+
+INPUT = b"7\n3\n5\n"
+
+
+def measure(program, assembler, output_dir, runs):
+    name = os.path.splitext(os.path.basename(program))[0]
+    samples = []
+    exe_file = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            exe_file = compile_to_nasm(program, f"{name}_{assembler}", output_dir, runtime='freestanding',
+                                       assembler=assembler)
+        samples.append((time.perf_counter() - start) * 1000)
+        if exe_file is None:
+            raise RuntimeError(f"Falha ao compilar {program} com --assembler {assembler}")
+    output = subprocess.run([exe_file], input=INPUT, stdout=subprocess.PIPE, timeout=10, check=True).stdout
+    return statistics.median(samples), output
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--runs', type=int, default=10)
+    arg_parser.add_argument('--json', action='store_true', help='emite os resultados em JSON')
+    args = arg_parser.parse_args()
+
+    assemblers = ['nasm', 'direct'] if shutil.which('nasm') and shutil.which('ld') else ['direct']
+    results = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        for program in PROGRAMS:
+            timings = {}
+            outputs = set()
+            for assembler in assemblers:
+                timings[assembler], output = measure(program, assembler, output_dir, args.runs)
+                outputs.add(output)
+            if len(outputs) != 1:
+                raise AssertionError(f"Saídas diferentes entre os montadores para {program}")
+            results.append({'program': os.path.relpath(program, ROOT),
+                             'ms': {name: round(value, 3) for name, value in timings.items()}})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    if assemblers == ['direct']:
+        print("nasm ou ld não encontrado: medindo só a emissão direta\n")
+    width = max(len(result['program']) for result in results)
+    header = f"{'programa':<{width}}" + ''.join(f"{name:>12}" for name in assemblers)
+    if len(assemblers) == 2:
+        header += f"{'aceleração':>14}"
+    print(header)
+    for result in results:
+        timings = result['ms']
+        line = f"{result['program']:<{width}}" + ''.join(f"{timings[name]:>9.2f} ms" for name in assemblers)
+        if len(assemblers) == 2:
+            line += f"{timings['nasm'] / timings['direct']:>13.1f}x"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Benchmark de vazão do lexer: PLY (expressão mestre) contra o DFA de dfa_lexer.py.
+
+Gera um fonte de alguns MB com todos os tipos de token (palavras reservadas,
+identificadores, inteiros, floats, strings com escapes, comentários, todos os
+operadores, '!=' contra '!', '12abc'). Antes de medir, confere que o DFA produz
+os mesmos tokens que o PLY (tipo, valor, linha e posição) nesse fonte e em
+EDGE_CASES, que têm os caracteres ilegais ('1.', '1.5.3', aspas sem
+fechamento, '\\r', '$'), com os mesmos erros.
+
+Os fontes medidos não têm caracteres ilegais: a cada erro o t_error do PLY
+recebe uma cópia do resto do texto (lexdata[lexpos:]), o que o torna
+quadrático em fontes grandes com erros. --with-errors inclui os casos de borda
+no fonte medido.
+
+Mede, em tokens/s e MB/s:
+    ply          lexer do PLY, LexToken com o valor convertido, até o fim
+    dfa          tokenize: só os arrays (tipo, início, fim, linha)
+    dfa+valores  tokenize e o valor de todos os tokens (TokenArray.value)
+    dfa+parser   DFALexer: LexToken por token, como o parser os consome
+
+Uso:
+    python benchmarks/lexer_throughput.py [--sizes 1 4 16] [--runs N] [--seed N] [--json]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dfa_lexer import DFALexer, tokenize  # noqa: E402
+from lexer import new_lexer  # noqa: E402
+
+STATEMENTS = [
+    "int {a}, {b}_2, c{n};",
+    "float f{n} = {n}.{n};",
+    "const int K{n} = {n};",
+    "str s{n} = \"linha {n}\\n \\\"aspas\\\" // não é comentário\";",
+    "bool ok{n} = true;",
+    "if ({a} >= {n} == !({b} != {a})) {{ {a} = {a} - 1; }} else {{ {b} = {b} / 2; }}",
+    "while ({a} <= {b} == ({a} == {n})) {{ {a} = {a} * 2 + ({b} - {n}) / 3; break; }}",
+    "print({a}, \"x = \", {a} < {b}, {a} > {b}); // comentário {n}",
+    "input({a});",
+    "{a} = -{a} + 1.5 - 12abc;",
+    "\t{a}  =  false ;",
+]
+
+EDGE_CASES = [
+    "{a} = 1.5.3 - 1. + 12abc;",
+    "\t{a}  =  false ;\r",
+    "x = 1 $ 2; \"sem fechamento",
+    "y = \"a\\\"b\" // fim \"",
+    "z = ٣٤.٥ + 3٤;",
+]
+
+
+def generate_source(megabytes, seed, statements=STATEMENTS):
+    rng = random.Random(seed)
+    lines = ["Program Vazao {"]
+    size = 0
+    while size < megabytes * 1024 * 1024:
+        line = rng.choice(statements).format(a=f"v{rng.randrange(100)}", b=f"w{rng.randrange(100)}",
+                                             n=rng.randrange(10000))
+        lines.append("    " + line)
+        size += len(line) + 5
+    lines.append("}")
+    return '\n'.join(lines) + '\n'
+
+
+def ply_tokens(source, diagnostics):
+    lexer = new_lexer(diagnostics)
+    lexer.input(source)
+    return list(iter(lexer.token, None))
+
+
+def dfa_tokens(source, diagnostics):
+    lexer = DFALexer(diagnostics)
+    lexer.input(source)
+    return list(iter(lexer.token, None))
+
+
+def dfa_values(source):
+    tokens = tokenize(source)
+    value = tokens.value
+    return [value(index) for index in range(len(tokens))]
+
+
+def check(source):
+    """Mesmos tokens e erros nos dois lexers; retorna o número de tokens"""
+    ply_diagnostics, dfa_diagnostics = [], []
+    expected = ply_tokens(source, ply_diagnostics)
+    found = dfa_tokens(source, dfa_diagnostics)
+    for index, (a, b) in enumerate(zip(expected, found)):
+        if (a.type, a.value, type(a.value), a.lineno, a.lexpos) != (b.type, b.value, type(b.value), b.lineno, b.lexpos):
+            raise AssertionError(f"Token {index} divergente: PLY {a} contra DFA {b}")
+    if len(expected) != len(found):
+        raise AssertionError(f"PLY produziu {len(expected)} tokens e o DFA {len(found)}")
+    if [str(d) for d in ply_diagnostics] != [str(d) for d in dfa_diagnostics]:
+        raise AssertionError("Erros léxicos divergentes")
+    return len(expected)
+
+
+def measure(function, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--sizes', type=float, nargs='+', default=[1, 4, 16], help='tamanhos do fonte em MB')
+    arg_parser.add_argument('--runs', type=int, default=3)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--with-errors', action='store_true',
+                            help='inclui os caracteres ilegais de EDGE_CASES no fonte medido')
+    arg_parser.add_argument('--json', action='store_true', help='emite os resultados em JSON')
+    args = arg_parser.parse_args()
+
+    statements = STATEMENTS + EDGE_CASES if args.with_errors else STATEMENTS
+    check(generate_source(0.05, args.seed, STATEMENTS + EDGE_CASES))
+    results = []
+    for megabytes in args.sizes:
+        source = generate_source(megabytes, args.seed, statements)
+        count = check(source)
+        timings = {
+            'ply': measure(lambda: ply_tokens(source, []), args.runs),
+            'dfa': measure(lambda: tokenize(source), args.runs),
+            'dfa+valores': measure(lambda: dfa_values(source), args.runs),
+            'dfa+parser': measure(lambda: dfa_tokens(source, []), args.runs),
+        }
+        mb = len(source.encode()) / (1024 * 1024)
+        results.append({'mb': round(mb, 2), 'tokens': count,
+                        'tokens_per_s': {name: round(count / value) for name, value in timings.items()},
+                        'mb_per_s': {name: round(mb / value, 2) for name, value in timings.items()},
+                        'speedup': round(timings['ply'] / timings['dfa'], 2)})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    names = list(results[0]['tokens_per_s'])
+    print("tokens e erros idênticos aos do PLY (fontes medidos e casos de borda)")
+    print(f"{'MB':>7}{'tokens':>10}" + ''.join(f"{name + ' (tok/s)':>22}" for name in names) + f"{'dfa/ply':>9}")
+    for result in results:
+        row = ''.join(f"{result['tokens_per_s'][name]:>13,} ({result['mb_per_s'][name]:>5.1f}MB/s)" for name in names)
+        print(f"{result['mb']:>7.2f}{result['tokens']:>10}{row}{result['speedup']:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark da otimização de laços (loops.py).
+
+Compila os programas de benchmarks/programs até o TAC otimizado, com e sem
+LoopOptimizer, e executa os dois num interpretador de TAC que conta as
+instruções executadas (labels e declarações não contam) e, à parte, as
+multiplicações e divisões. As saídas das duas versões são comparadas para
+garantir que a otimização preserva o resultado.
+
+Uso:
+    python benchmarks/loops.py [--input N] [--json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from constant_folding import ConstantFolder, _fold_binary, _fold_unary  # noqa: E402
+from dead_code import DeadCodeEliminator  # noqa: E402
+from loops import LoopOptimizer  # noqa: E402
+from parser import TACGenerator, parse_file  # noqa: E402
+from semantic_analyzer import SemanticAnalyzer  # noqa: E402
+from tac import Op, BINARY_OPCODES, UNARY_OPCODES  # noqa: E402
+from value_numbering import GlobalValueNumbering  # noqa: E402
+
+PROGRAMS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'programs')
+
+
+def execute(instructions, inputs):
+    """Executa o TAC. Retorna a saída (valores impressos), as instruções e as multiplicações/divisões executadas."""
+    labels = {instr.result: index for index, instr in enumerate(instructions) if instr.op == Op.LABEL}
+    values = {}
+    pending = list(inputs)
+    output = []
+    executed = 0
+    multiplications = 0
+
+    def value(operand):
+        return operand.value if operand.is_literal else values.get(operand, 0)
+
+    pc = 0
+    while pc < len(instructions):
+        instr = instructions[pc]
+        op = instr.op
+        pc += 1
+        if op in (Op.LABEL, Op.DECLARE):
+            continue
+        executed += 1
+        if op == Op.COPY:
+            values[instr.result] = value(instr.arg1)
+        elif op in BINARY_OPCODES:
+            multiplications += op in (Op.MUL, Op.DIV)
+            values[instr.result] = _fold_binary(op, value(instr.arg1), value(instr.arg2))
+        elif op in UNARY_OPCODES:
+            values[instr.result] = _fold_unary(op, value(instr.arg1))
+        elif op == Op.INPUT:
+            values[instr.result] = pending.pop(0)
+        elif op == Op.PRINT:
+            output.append(value(instr.arg1))
+        elif op == Op.GOTO:
+            pc = labels[instr.result]
+        elif op == Op.IF_FALSE:
+            if not value(instr.arg1):
+                pc = labels[instr.result]
+    return output, executed, multiplications
+
+
+def compile_tac(filename, loop_optimization):
+    ast = parse_file(filename)
+    success, errors = SemanticAnalyzer().analyze(ast)
+    if not success:
+        raise ValueError(f"{filename}: {errors}")
+    generator = TACGenerator()
+    ast.generate_tac(generator)
+
+    passes = [ConstantFolder(), GlobalValueNumbering()]
+    if loop_optimization:
+        passes.append(LoopOptimizer())
+    passes.append(DeadCodeEliminator())
+    instructions = generator.instructions
+    with contextlib.redirect_stdout(io.StringIO()):
+        for optimization in passes:
+            instructions = optimization.run(instructions)
+    return instructions
+
+
+def benchmark(filename, inputs):
+    baseline = compile_tac(filename, False)
+    optimized = compile_tac(filename, True)
+    base_output, base_executed, base_multiplications = execute(baseline, inputs)
+    opt_output, opt_executed, opt_multiplications = execute(optimized, inputs)
+    if base_output != opt_output:
+        raise AssertionError(f"{filename}: saída diferente ({base_output} != {opt_output})")
+    return {
+        'static': [len(baseline), len(optimized)],
+        'dynamic': [base_executed, opt_executed],
+        'multiplications': [base_multiplications, opt_multiplications],
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--input', type=int, default=1000, help='valor lido por cada input() dos programas')
+    arg_parser.add_argument('--json', action='store_true', help='emite os resultados em JSON')
+    args = arg_parser.parse_args()
+
+    results = {}
+    for name in sorted(os.listdir(PROGRAMS)):
+        if name.endswith('.lps'):
+            results[name] = benchmark(os.path.join(PROGRAMS, name), [args.input] * 16)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'programa':<22}{'estáticas':>16}{'executadas (sem)':>20}{'executadas (com)':>20}"
+          f"{'redução':>10}{'mul/div':>18}")
+    for name, result in results.items():
+        before, after = result['dynamic']
+        static = f"{result['static'][0]} -> {result['static'][1]}"
+        multiplications = f"{result['multiplications'][0]} -> {result['multiplications'][1]}"
+        print(f"{name:<22}{static:>16}{before:>20}{after:>20}{(1 - after / before) * 100:>9.1f}%"
+              f"{multiplications:>18}")
+
+
+if __name__ == "__main__":
+    main()
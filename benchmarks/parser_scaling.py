@@ -0,0 +1,86 @@
+"""
+Benchmark de escalabilidade do parser em programas com muitos comandos.
+
+Gera programas com N comandos em sequência (atribuições, print e input com
+vários argumentos e declarações com listas de IDs, as quatro listas da
+gramática) e mede o tempo de parser.parse_file. Com as listas recursivas à
+esquerda o tempo por comando fica constante; o expoente entre tamanhos
+consecutivos (tempo ~ N^k) deve ficar perto de 1.
+
+Uso:
+    python benchmarks/parser_scaling.py [--sizes 1000 10000 100000 1000000] [--json]
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import parse_file  # noqa: E402
+
+
+def generate_program(statements):
+    lines = ["Program Escala {", "    int a, b, c;"]
+    for index in range(statements):
+        kind = index % 4
+        if kind == 0:
+            lines.append(f"    a = a + b * {index % 97};")
+        elif kind == 1:
+            lines.append('    print("a = ", a, " b = ", b);')
+        elif kind == 2:
+            lines.append("    input(a, b, c);")
+        else:
+            lines.append(f"    int x{index}, y{index}, z{index};")
+    lines.append("}")
+    return '\n'.join(lines) + '\n'
+
+
+def measure(statements):
+    with tempfile.NamedTemporaryFile('w', suffix='.lps', delete=False) as f:
+        f.write(generate_program(statements))
+        filename = f.name
+    try:
+        start = time.perf_counter()
+        ast = parse_file(filename)
+        elapsed = time.perf_counter() - start
+    finally:
+        os.unlink(filename)
+    if ast is None or len(ast.children[1].children) != statements + 1:
+        raise AssertionError(f"Parse incorreto com {statements} comandos")
+    return elapsed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                            help='número de comandos de cada programa')
+    arg_parser.add_argument('--json', action='store_true', help='emite os resultados em JSON')
+    args = arg_parser.parse_args()
+
+    results = []
+    previous = None
+    for size in args.sizes:
+        elapsed = measure(size)
+        result = {'statements': size, 's': round(elapsed, 4), 'us_per_statement': round(elapsed / size * 1e6, 2)}
+        if previous is not None:
+            # Expoente k de tempo ~ N^k entre este tamanho e o anterior
+            result['exponent'] = round(math.log(elapsed / previous[1]) / math.log(size / previous[0]), 2)
+        previous = (size, elapsed)
+        results.append(result)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'comandos':>10}{'tempo':>12}{'µs/comando':>13}{'expoente':>10}")
+    for result in results:
+        exponent = f"{result['exponent']:>10.2f}" if 'exponent' in result else f"{'-':>10}"
+        print(f"{result['statements']:>10}{result['s']:>10.3f} s{result['us_per_statement']:>13.2f}{exponent}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark dos runtimes dos executáveis gerados (libc e freestanding).
+
+Compila benchmarks/programs/imprime.lps, um laço que imprime um inteiro por
+iteração, com cada runtime e mede o tempo de execução para entradas
+crescentes. Com a libc cada print é uma chamada printf; no runtime
+freestanding a saída vai para um buffer e é escrita com um write por buffer.
+Precisa de nasm, gcc e ld (gcc -m32 no alvo x86).
+
+Uso:
+    python benchmarks/runtime.py [--counts 1000 100000 1000000] [--runs N] [--target x86-64] [--json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from main import compile_to_nasm  # noqa: E402
+from nasm_generator import RUNTIMES  # noqa: E402
+from targets import TARGETS  # noqa: E402
+
+PROGRAM = os.path.join(ROOT, 'benchmarks', 'programs', 'imprime.lps')
+
+
+def build(runtime, target, output_dir):
+    with contextlib.redirect_stdout(io.StringIO()):
+        exe_file = compile_to_nasm(PROGRAM, f"imprime_{runtime}", output_dir, runtime=runtime, target=target)
+    if exe_file is None:
+        raise RuntimeError(f"Falha ao compilar com o runtime {runtime}")
+    return exe_file
+
+
+def measure(exe_file, count, runs):
+    samples = []
+    stdin = f"{count}\n".encode()
+    output = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([exe_file], input=stdin, stdout=subprocess.PIPE, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+        output = result.stdout
+    return statistics.median(samples), output
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--counts', type=int, nargs='+', default=[1000, 100000, 1000000],
+                            help='número de valores impressos')
+    arg_parser.add_argument('--runs', type=int, default=5)
+    arg_parser.add_argument('--target', choices=list(TARGETS), default='x86')
+    arg_parser.add_argument('--json', action='store_true', help='emite os resultados em JSON')
+    args = arg_parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        executables = {runtime: build(runtime, args.target, output_dir) for runtime in RUNTIMES}
+        for count in args.counts:
+            timings = {}
+            outputs = set()
+            for runtime, exe_file in executables.items():
+                timings[runtime], output = measure(exe_file, count, args.runs)
+                outputs.add(output)
+            if len(outputs) != 1:
+                raise AssertionError(f"Saídas diferentes entre os runtimes para {count} valores")
+            results.append({'count': count, 'ms': {name: round(value, 3) for name, value in timings.items()}})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'valores':>10}" + ''.join(f"{runtime:>16}" for runtime in RUNTIMES) + f"{'aceleração':>14}")
+    for result in results:
+        timings = result['ms']
+        columns = ''.join(f"{timings[runtime]:>13.2f} ms" for runtime in RUNTIMES)
+        print(f"{result['count']:>10}{columns}{timings['libc'] / timings['freestanding']:>13.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Benchmark de escalabilidade de cada fase do compilador em programas sintéticos.
+
+Gera com program_generator.py programas válidos de 1 mil a 100 mil comandos
+(mesma semente e mesmas opções em todos os tamanhos; --sizes aceita outros,
+como 1000000) e mede, em memória, cada fase:
+    lexer      todos os tokens do lexer do PLY
+    parser     parse_source (inclui o lexer, que o parser chama token a token)
+    semantic   SemanticAnalyzer.analyze
+    tac        TACGenerator
+    optimizer  optimize_tac
+    nasm       NASMGenerator.generate_nasm sobre o TAC otimizado
+
+Como no timeit, cada fase roda com o coletor de lixo desligado, depois de uma
+coleta: uma coleta completa percorre todos os objetos vivos (a AST inteira
+durante o TAC, por exemplo) e cai na fase que por acaso cruza o limiar, o que
+com poucos tamanhos distorce o expoente dela sem dizer nada sobre o algoritmo.
+
+Para cada fase ajusta tempo ~ c * N^k por mínimos quadrados em escala log-log
+e reporta o expoente k e o tempo por comando no maior tamanho. k perto de 1 é
+linear; uma fase com k acima de 1 + --tolerance é superlinear e faz o
+benchmark sair com status 1, com ou sem baseline.
+
+Com --save-baseline os expoentes vão para benchmarks/scaling_baseline.json (ou
+--baseline ARQUIVO). Nas execuções seguintes cada fase também é comparada com o
+baseline, e um expoente que cresceu mais que --tolerance é uma regressão, que
+também falha. O tempo por comando depende da máquina e só é mostrado ao lado
+do baseline, sem falhar.
+
+Uso:
+    python benchmarks/scaling.py [--sizes 1000 10000 100000] [--runs N] [--seed N]
+                                 [--nesting N] [--expr-depth N] [--variables N] [--string-ratio R]
+                                 [--tolerance K] [--baseline ARQUIVO] [--save-baseline] [--json]
+"""
+import argparse
+import gc
+import json
+import math
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lexer import new_lexer  # noqa: E402
+from nasm_generator import NASMGenerator  # noqa: E402
+from optimizer import optimize_tac  # noqa: E402
+from parser import TACGenerator, parse_source  # noqa: E402
+from program_generator import generate_program  # noqa: E402
+from semantic_analyzer import SemanticAnalyzer  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'scaling_baseline.json')
+PHASES = ('lexer', 'parser', 'semantic', 'tac', 'optimizer', 'nasm')
+
+
+def timed(function, *args):
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        value = function(*args)
+        return value, time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def lex_all(source):
+    lexer = new_lexer([])
+    lexer.input(source)
+    return sum(1 for _ in iter(lexer.token, None))
+
+
+def parse(source):
+    diagnostics = []
+    ast = parse_source(source, diagnostics)
+    if ast is None or diagnostics:
+        raise AssertionError(f"Programa gerado inválido: {[str(d) for d in diagnostics]}")
+    return ast
+
+
+def analyze(ast):
+    ok, errors = SemanticAnalyzer().analyze(ast)
+    if not ok:
+        raise AssertionError(f"Programa gerado inválido: {errors}")
+
+
+def generate_tac(ast):
+    generator = TACGenerator()
+    ast.generate_tac(generator)
+    return generator.instructions
+
+
+def measure(source):
+    """Tempo de cada fase numa compilação de source"""
+    timings = {}
+    _, timings['lexer'] = timed(lex_all, source)
+    ast, timings['parser'] = timed(parse, source)
+    _, timings['semantic'] = timed(analyze, ast)
+    instructions, timings['tac'] = timed(generate_tac, ast)
+    (instructions, _), timings['optimizer'] = timed(optimize_tac, instructions)
+    _, timings['nasm'] = timed(NASMGenerator().generate_nasm, instructions)
+    return timings
+
+
+def fit(sizes, times):
+    """Expoente k de tempo ~ c * N^k (mínimos quadrados em log-log)"""
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(value, 1e-9)) for value in times]
+    mean_x = statistics.fmean(xs)
+    mean_y = statistics.fmean(ys)
+    k = (sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+         / sum((x - mean_x) ** 2 for x in xs))
+    return k
+
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                            help='número de comandos de cada programa')
+    arg_parser.add_argument('--runs', type=int, default=3, help='medições por tamanho (mediana)')
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--nesting', type=int, default=3, help='profundidade máxima de if/while')
+    arg_parser.add_argument('--expr-depth', type=int, default=3, help='profundidade máxima das expressões')
+    arg_parser.add_argument('--variables', type=int, default=8, help='variáveis de cada tipo')
+    arg_parser.add_argument('--string-ratio', type=float, default=0.2,
+                            help='fração dos comandos simples com strings')
+    arg_parser.add_argument('--tolerance', type=float, default=0.1,
+                            help='folga do expoente sobre 1 (superlinear) e sobre o baseline (regressão)')
+    arg_parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='arquivo JSON do baseline')
+    arg_parser.add_argument('--save-baseline', action='store_true', help='grava os resultados como baseline')
+    arg_parser.add_argument('--json', action='store_true', help='emite os resultados em JSON')
+    args = arg_parser.parse_args()
+    if len(args.sizes) < 2:
+        arg_parser.error("o ajuste precisa de pelo menos dois tamanhos")
+
+    config = {'seed': args.seed, 'nesting': args.nesting, 'expr_depth': args.expr_depth,
+              'variables': args.variables, 'string_ratio': args.string_ratio, 'sizes': sorted(args.sizes)}
+    samples = {phase: [] for phase in PHASES}
+    for size in config['sizes']:
+        source = generate_program(size, args.seed, nesting=args.nesting, expr_depth=args.expr_depth,
+                                  variables=args.variables, string_ratio=args.string_ratio)
+        runs = [measure(source) for _ in range(args.runs)]
+        for phase in PHASES:
+            samples[phase].append(statistics.median(run[phase] for run in runs))
+
+    baseline = None if args.save_baseline else load_baseline(args.baseline)
+    if baseline is not None and baseline['config'] != config:
+        print(f"Aviso: o baseline foi medido com outras opções ({baseline['config']})", file=sys.stderr)
+    phases = {}
+    superlinear = []
+    regressions = []
+    for phase in PHASES:
+        k = fit(config['sizes'], samples[phase])
+        result = {'exponent': round(k, 3),
+                  'us_per_statement': round(samples[phase][-1] / config['sizes'][-1] * 1e6, 3),
+                  'seconds': [round(value, 4) for value in samples[phase]],
+                  'superlinear': k > 1 + args.tolerance}
+        if result['superlinear']:
+            superlinear.append(phase)
+        if baseline is not None and phase in baseline['phases']:
+            expected = baseline['phases'][phase]['exponent']
+            result['baseline_exponent'] = expected
+            result['regression'] = k > expected + args.tolerance
+            if result['regression']:
+                regressions.append(phase)
+        phases[phase] = result
+    results = {'config': config, 'phases': phases}
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({'config': config, 'phases': {phase: {'exponent': result['exponent'],
+                                                             'us_per_statement': result['us_per_statement']}
+                                                     for phase, result in phases.items()}}, f, indent=2)
+            f.write('\n')
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        sizes = ''.join(f"{size:>11}" for size in config['sizes'])
+        print(f"{'fase':<10}{sizes}{'k':>8}{'µs/comando':>12}{'baseline k':>12}")
+        for phase, result in phases.items():
+            seconds = ''.join(f"{value:>10.3f}s" for value in result['seconds'])
+            expected = f"{result['baseline_exponent']:>12.3f}" if 'baseline_exponent' in result else f"{'-':>12}"
+            flags = (' superlinear' if result['superlinear'] else '') + (' REGRESSÃO' if result.get('regression') else '')
+            print(f"{phase:<10}{seconds}{result['exponent']:>8.2f}{result['us_per_statement']:>12.2f}"
+                  f"{expected}{flags}")
+        if args.save_baseline:
+            print(f"\nBaseline gravado em {args.baseline}")
+    if superlinear:
+        print(f"Fases superlineares (k > {1 + args.tolerance:g}): {', '.join(superlinear)}", file=sys.stderr)
+    if regressions:
+        print(f"Regressão de escalabilidade: {', '.join(regressions)}", file=sys.stderr)
+    if superlinear or regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
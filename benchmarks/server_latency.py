@@ -0,0 +1,168 @@
+"""
+Benchmark de latência do servidor de compilação contra um processo por compilação.
+
+Compila os programas de benchmarks/programs e de programs/ de três formas:
+    processo   um Python novo por arquivo, que importa o compilador (PLY,
+               tabelas, passes) e chama compile_source: o custo atual
+    cliente    um Python novo por arquivo rodando compile_client.py, que só
+               usa a biblioteca padrão, contra o servidor já aquecido
+    conexão    pedidos numa conexão aberta com o servidor (compile_client.Client),
+               como numa integração com o editor
+e reporta a mediana e o p95 da latência e as compilações por minuto. Depois
+mede a vazão do servidor com --clients conexões pedindo ao mesmo tempo. As
+respostas do servidor são comparadas com compile_source no próprio processo.
+
+O servidor é iniciado num socket temporário com --workers workers e encerrado
+no fim.
+
+Uso:
+    python benchmarks/server_latency.py [--requests N] [--clients 1 4 16] [--workers N]
+                                        [--pool process|thread] [--emit asm] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from compile_client import Client  # noqa: E402
+from compiler_api import compile_source  # noqa: E402
+
+PROGRAMS = [
+    os.path.join(ROOT, 'benchmarks', 'programs', name)
+    for name in sorted(os.listdir(os.path.join(ROOT, 'benchmarks', 'programs')))
+] + [os.path.join(ROOT, 'programs', name) for name in ('teste1.lps', 'teste2.lps', 'teste4.lps', 'teste5.lps')]
+
+PROCESS_SCRIPT = ("import sys; from compiler_api import compile_source; "
+                  "compile_source(open(sys.argv[1]).read(), {'emit': sys.argv[2]})")
+
+
+def start_server(socket_path, workers, pool):
+    server = subprocess.Popen([sys.executable, os.path.join(ROOT, 'compile_server.py'), '--socket', socket_path,
+                               '--workers', str(workers), '--pool', pool], stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            with Client(socket_path) as client:
+                client.request({'action': 'ping'})
+            return server
+        except (ConnectionRefusedError, FileNotFoundError):
+            time.sleep(0.05)
+    server.kill()
+    raise RuntimeError("O servidor não respondeu")
+
+
+def latencies(function, requests):
+    samples = []
+    for index in range(requests):
+        start = time.perf_counter()
+        function(PROGRAMS[index % len(PROGRAMS)])
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {'median_ms': round(statistics.median(samples) * 1000, 2),
+            'p95_ms': round(samples[int(len(samples) * 0.95) - 1 if len(samples) > 1 else 0] * 1000, 2),
+            'per_minute': round(60 / statistics.fmean(samples))}
+
+
+def throughput(socket_path, clients, requests, emit, sources):
+    """Compilações por minuto com clients conexões pedindo ao mesmo tempo"""
+    errors = []
+
+    def worker(offset):
+        try:
+            with Client(socket_path) as client:
+                for index in range(offset, requests, clients):
+                    response = client.request({'source': sources[index % len(sources)], 'options': {'emit': emit}})
+                    if not response['ok']:
+                        errors.append(response)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if errors:
+        raise AssertionError(f"Pedidos com erro: {errors[:3]}")
+    return round(requests / elapsed * 60)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--requests', type=int, default=40, help='compilações por medição')
+    arg_parser.add_argument('--clients', type=int, nargs='+', default=[1, 4, 16])
+    arg_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    arg_parser.add_argument('--pool', choices=('process', 'thread'), default='process')
+    arg_parser.add_argument('--emit', choices=('ast', 'tac', 'bytecode', 'asm'), default='asm')
+    arg_parser.add_argument('--json', action='store_true', help='emite os resultados em JSON')
+    args = arg_parser.parse_args()
+
+    sources = []
+    for path in PROGRAMS:
+        with open(path) as f:
+            sources.append(f.read())
+
+    with tempfile.TemporaryDirectory() as directory:
+        socket_path = os.path.join(directory, 'lpms.sock')
+        server = start_server(socket_path, args.workers, args.pool)
+        try:
+            with Client(socket_path) as client:
+                for source in sources:
+                    expected = json.loads(json.dumps(compile_source(source, {'emit': args.emit}).as_dict()))
+                    response = client.request({'source': source, 'options': {'emit': args.emit}})
+                    del response['id']
+                    if response != expected:
+                        raise AssertionError("Resposta do servidor diferente de compile_source")
+
+                results = {
+                    'processo': summarize(latencies(
+                        lambda path: subprocess.run([sys.executable, '-c', PROCESS_SCRIPT, path, args.emit],
+                                                    cwd=ROOT, check=True), args.requests)),
+                    'cliente': summarize(latencies(
+                        lambda path: subprocess.run([sys.executable, os.path.join(ROOT, 'compile_client.py'), path,
+                                                     '--emit', args.emit, '--socket', socket_path],
+                                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL),
+                        args.requests)),
+                    'conexão': summarize(latencies(
+                        lambda path: client.request({'source': sources[PROGRAMS.index(path)],
+                                                     'options': {'emit': args.emit}}),
+                        args.requests * 10)),
+                }
+            concurrent = {clients: throughput(socket_path, clients, args.requests * 10, args.emit, sources)
+                          for clients in args.clients}
+        finally:
+            with Client(socket_path) as client:
+                client.request({'action': 'shutdown'})
+            server.wait(timeout=30)
+
+    if args.json:
+        print(json.dumps({'latency': results, 'throughput_per_minute': concurrent,
+                          'workers': args.workers, 'pool': args.pool}, indent=2))
+        return
+
+    print(f"{len(PROGRAMS)} programas, emit={args.emit}, servidor com {args.workers} workers ({args.pool}); "
+          f"respostas iguais a compile_source")
+    print(f"{'modo':>10}{'mediana':>12}{'p95':>12}{'comp/min':>12}")
+    for mode, summary in results.items():
+        print(f"{mode:>10}{summary['median_ms']:>10.2f}ms{summary['p95_ms']:>10.2f}ms{summary['per_minute']:>12}")
+    print(f"\n{'clientes':>10}{'comp/min':>12}")
+    for clients, per_minute in concurrent.items():
+        print(f"{clients:>10}{per_minute:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark de inicialização: tempo de import a frio de parser, semantic_analyzer e main.
+
+Cada medição roda um processo Python novo, com e sem o cache de tabelas do PLY
+(ver table_cache.py).
+
+Uso:
+    python benchmarks/startup.py [--runs N] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ['parser', 'semantic_analyzer', 'main']
+
+
+def time_import(module, runs, table_cache):
+    env = dict(os.environ, LPMS_TABLE_CACHE='1' if table_cache else '0')
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', f'import {module}'], cwd=ROOT, env=env,
+                       check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def baseline(runs):
+    # Custo fixo do interpretador, descontado dos resultados
+    return statistics.median(time_import('sys', runs, True))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--runs', type=int, default=20)
+    arg_parser.add_argument('--json', action='store_true', help='emite os resultados em JSON')
+    args = arg_parser.parse_args()
+
+    # Garante que as tabelas em cache existam antes de medir
+    subprocess.run([sys.executable, 'table_cache.py'], cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+
+    interpreter = baseline(args.runs)
+    results = {'interpreter_ms': round(interpreter, 2), 'modules': {}}
+    for module in MODULES:
+        cached = statistics.median(time_import(module, args.runs, True)) - interpreter
+        uncached = statistics.median(time_import(module, args.runs, False)) - interpreter
+        results['modules'][module] = {'cached_ms': round(cached, 2), 'uncached_ms': round(uncached, 2)}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Interpretador (python -c 'import sys'): {interpreter:.1f} ms")
+    print(f"{'módulo':<20}{'com cache':>12}{'sem cache':>12}")
+    for module, timing in results['modules'].items():
+        print(f"{module:<20}{timing['cached_ms']:>10.1f}ms{timing['uncached_ms']:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
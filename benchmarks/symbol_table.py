@@ -0,0 +1,121 @@
+"""
+Benchmark da tabela de símbolos em programas com if/while profundamente aninhados.
+
+Gera programas com D níveis de while aninhados; cada nível declara uma variável
+e faz atribuições que leem variáveis dos níveis mais externos (o pior caso de
+uma busca que percorre os escopos de dentro para fora). Mede a análise
+semântica com a SymbolTable plana (dict de nome -> pilha de declarações) e com
+a tabela antiga de lista de escopos, reproduzida aqui como referência.
+
+Uso:
+    python benchmarks/symbol_table.py [--depths 25 50 100 200] [--runs N] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import parse_file  # noqa: E402
+from semantic_analyzer import SemanticAnalyzer, SemanticError, Symbol, SymbolTable  # noqa: E402
+
+STATEMENTS_PER_LEVEL = 20
+
+
+class ScopeListTable:
+    """Tabela anterior: lista de dicts, lookup percorre os escopos ao contrário"""
+    def __init__(self):
+        self.scopes = [{}]
+
+    def enter_scope(self):
+        self.scopes.append({})
+
+    def exit_scope(self):
+        if len(self.scopes) > 1:
+            self.scopes.pop()
+
+    def declare(self, name, type, is_const=False, value=None):
+        if name in self.scopes[-1]:
+            raise SemanticError(f"Váriavel '{name}' ja declarada.")
+        symbol = self.scopes[-1][name] = Symbol(name, type, is_const, value)
+        return symbol
+
+    def lookup(self, name):
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        raise SemanticError(f"Variável '{name}' não declarada.")
+
+
+def generate_program(depth):
+    lines = ["Program Aninhado {", "    int v0;", "    v0 = 1;"]
+    for level in range(1, depth + 1):
+        indent = "    " * level
+        lines.append(f"{indent}while (v0 < {level}) {{")
+        lines.append(f"{indent}    int v{level};")
+        for index in range(STATEMENTS_PER_LEVEL):
+            lines.append(f"{indent}    v{level} = v{index % level} + v0 * {index};")
+    for level in range(depth, 0, -1):
+        lines.append("    " * level + "}")
+    lines.append("}")
+    return '\n'.join(lines) + '\n'
+
+
+def parse(depth):
+    with tempfile.NamedTemporaryFile('w', suffix='.lps', delete=False) as f:
+        f.write(generate_program(depth))
+        filename = f.name
+    try:
+        return parse_file(filename)
+    finally:
+        os.unlink(filename)
+
+
+def measure(depth, table_class, runs):
+    samples = []
+    for _ in range(runs):
+        ast = parse(depth)  # A análise anota a AST: cada medição usa uma nova
+        analyzer = SemanticAnalyzer()
+        analyzer.symbol_table = table_class()
+        start = time.perf_counter()
+        ok, errors = analyzer.analyze(ast)
+        samples.append((time.perf_counter() - start) * 1000)
+        if not ok:
+            raise AssertionError(f"Análise falhou com profundidade {depth}: {errors}")
+    return statistics.median(samples)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--depths', type=int, nargs='+', default=[25, 50, 100, 200],
+                            help='níveis de while aninhados')
+    arg_parser.add_argument('--runs', type=int, default=5)
+    arg_parser.add_argument('--json', action='store_true', help='emite os resultados em JSON')
+    args = arg_parser.parse_args()
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10 * max(args.depths) + 1000))
+
+    results = []
+    for depth in args.depths:
+        flat = measure(depth, SymbolTable, args.runs)
+        scopes = measure(depth, ScopeListTable, args.runs)
+        results.append({'depth': depth, 'references': depth * STATEMENTS_PER_LEVEL * 2,
+                        'ms': {'plana': round(flat, 3), 'lista de escopos': round(scopes, 3)},
+                        'speedup': round(scopes / flat, 2)})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'níveis':>8}{'referências':>13}{'plana':>12}{'escopos':>12}{'ganho':>8}")
+    for result in results:
+        ms = result['ms']
+        print(f"{result['depth']:>8}{result['references']:>13}{ms['plana']:>9.2f} ms"
+              f"{ms['lista de escopos']:>9.2f} ms{result['speedup']:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
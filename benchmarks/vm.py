@@ -0,0 +1,140 @@
+"""
+Benchmark da VM de bytecode (vm.py).
+
+Executa os programas de benchmarks/programs, com a mesma entrada, em:
+    vm              bytecode com superinstruções
+    vm-simples      bytecode sem superinstruções
+    tac             interpretação direta das quádruplas (laço sobre os objetos Quad)
+    python          código Python estruturado (python_backend.py), compilado em processo
+e compara a mediana do tempo de execução (a compilação não entra na medida).
+As saídas de todos precisam ser iguais e, se o programa tiver ao lado um
+arquivo .out, iguais ao conteúdo dele (para os casos em que todos poderiam
+errar juntos, como variáveis de mesmo nome em blocos aninhados).
+
+Uso:
+    python benchmarks/vm.py [--input N] [--runs N] [--json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from constant_folding import _fold_binary, _fold_unary  # noqa: E402
+from main import generate_ast, generate_tac  # noqa: E402
+from python_backend import PythonGenerator  # noqa: E402
+from tac import Op, BINARY_OPCODES, UNARY_OPCODES  # noqa: E402
+from vm import BytecodeCompiler, execute  # noqa: E402
+
+PROGRAMS = os.path.join(ROOT, 'benchmarks', 'programs')
+
+
+def interpret_tac(instructions, stdin, stdout):
+    """Referência: percorre as quádruplas com o mesmo formato de E/S da VM"""
+    labels = {instr.result: index for index, instr in enumerate(instructions) if instr.op == Op.LABEL}
+    values = {}
+    pending = stdin.read().split()
+    pending.reverse()
+
+    def value(operand):
+        if operand.is_literal:
+            return operand.value.strip('"') if isinstance(operand.value, str) else operand.value
+        return values.get(operand, 0)
+
+    pc = 0
+    while pc < len(instructions):
+        instr = instructions[pc]
+        op = instr.op
+        pc += 1
+        if op == Op.COPY or (op == Op.DECLARE and instr.arg1 is not None):
+            values[instr.result] = value(instr.arg1)
+        elif op in BINARY_OPCODES:
+            values[instr.result] = _fold_binary(op, value(instr.arg1), value(instr.arg2))
+        elif op in UNARY_OPCODES:
+            values[instr.result] = _fold_unary(op, value(instr.arg1))
+        elif op == Op.INPUT:
+            values[instr.result] = int(pending.pop()) if pending else 0
+        elif op == Op.PRINT:
+            result = value(instr.arg1)
+            stdout.write(result if instr.arg1.is_string else f"{int(result) if isinstance(result, bool) else result}\n")
+        elif op == Op.GOTO:
+            pc = labels[instr.result]
+        elif op == Op.IF_FALSE:
+            if not value(instr.arg1):
+                pc = labels[instr.result]
+
+
+def measure(function, stdin_text, runs):
+    samples = []
+    output = None
+    for _ in range(runs):
+        stdin, stdout = io.StringIO(stdin_text), io.StringIO()
+        start = time.perf_counter()
+        function(stdin, stdout)
+        samples.append((time.perf_counter() - start) * 1000)
+        output = stdout.getvalue()
+    return statistics.median(samples), output
+
+
+def benchmark(filename, value, runs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        instructions = generate_tac(filename)
+        main = PythonGenerator().compile(generate_ast(filename))
+    stdin_text = f"{value}\n" * 16
+    fused = BytecodeCompiler().compile(instructions)
+    simple = BytecodeCompiler(superinstructions=False).compile(instructions)
+    engines = {
+        'vm': lambda stdin, stdout: execute(fused, stdin, stdout),
+        'vm-simples': lambda stdin, stdout: execute(simple, stdin, stdout),
+        'tac': lambda stdin, stdout: interpret_tac(instructions, stdin, stdout),
+        'python': main,
+    }
+    timings = {}
+    outputs = {}
+    for name, function in engines.items():
+        timings[name], outputs[name] = measure(function, stdin_text, runs)
+    reference = outputs['tac']
+    for name in ('vm', 'vm-simples', 'python'):
+        if outputs[name] != reference:
+            raise AssertionError(f"{filename}: saída de {name} diferente da interpretação do TAC")
+    expected = os.path.splitext(filename)[0] + '.out'
+    if os.path.exists(expected):
+        with open(expected) as f:
+            if reference != f.read():
+                raise AssertionError(f"{filename}: saída diferente de {os.path.basename(expected)}")
+    return {'ms': {name: round(value, 3) for name, value in timings.items()},
+            'instructions': {'tac': len(instructions), 'bytecode': len(fused.code)}}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--input', type=int, default=2000, help='valor lido por cada input() dos programas')
+    arg_parser.add_argument('--runs', type=int, default=5)
+    arg_parser.add_argument('--json', action='store_true', help='emite os resultados em JSON')
+    args = arg_parser.parse_args()
+
+    results = {}
+    for name in sorted(os.listdir(PROGRAMS)):
+        if name.endswith('.lps'):
+            results[name] = benchmark(os.path.join(PROGRAMS, name), args.input, args.runs)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    engines = ['vm', 'vm-simples', 'tac', 'python']
+    print(f"{'programa':<22}" + ''.join(f"{engine:>14}" for engine in engines) + f"{'vm x tac':>10}")
+    for name, result in results.items():
+        timings = result['ms']
+        columns = ''.join(f"{timings[engine]:>11.2f} ms" for engine in engines)
+        print(f"{name:<22}{columns}{timings['tac'] / timings['vm']:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
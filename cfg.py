@@ -0,0 +1,200 @@
+"""
+Grafo de fluxo de controle (CFG) sobre o TAC.
+
+O TAC é dividido em blocos básicos (um líder em cada label, no início do
+programa e após cada desvio), ligados por arestas de sucessor/predecessor.
+Os dominadores são calculados pelo algoritmo iterativo de Cooper, Harvey e
+Kennedy sobre a ordem pós-ordem reversa, que na prática é linear no tamanho
+do grafo. A árvore de dominadores é numerada em pré e pós-ordem uma vez, e
+'a domina b' vira duas comparações, sem subir a cadeia de idom.
+"""
+from tac import Op, JUMP_OPS
+
+
+class BasicBlock:
+    __slots__ = ('index', 'instructions', 'successors', 'predecessors')
+
+    def __init__(self, index):
+        self.index = index
+        self.instructions = []
+        self.successors = []
+        self.predecessors = []
+
+    @property
+    def label(self):
+        if self.instructions and self.instructions[0].op == Op.LABEL:
+            return self.instructions[0].result
+        return None
+
+    def __repr__(self):
+        return f"BasicBlock(B{self.index}, {len(self.instructions)} instruções)"
+
+
+class ControlFlowGraph:
+    def __init__(self, instructions):
+        self.blocks = []
+        self._build(instructions)
+        self.entry = self.blocks[0]
+        self._rpo = None
+        self._idom = None
+        self._numbers = None
+
+    def _build(self, instructions):
+        block = BasicBlock(0)
+        self.blocks.append(block)
+        for instr in instructions:
+            # Um label inicia um novo bloco (a menos que o atual ainda esteja vazio)
+            if instr.op == Op.LABEL and block.instructions:
+                block = self._new_block()
+            block.instructions.append(instr)
+            if instr.op in JUMP_OPS:
+                block = self._new_block()
+        if not block.instructions and len(self.blocks) > 1:
+            self.blocks.pop()
+
+        labels = {block.label: block for block in self.blocks if block.label is not None}
+        for index, block in enumerate(self.blocks):
+            last = block.instructions[-1] if block.instructions else None
+            following = self.blocks[index + 1] if index + 1 < len(self.blocks) else None
+            targets = []
+            if last is not None and last.op == Op.GOTO:
+                targets.append(labels[last.result])
+            else:
+                if following is not None:
+                    targets.append(following)
+                if last is not None and last.op == Op.IF_FALSE:
+                    target = labels[last.result]
+                    if target is not following:
+                        targets.append(target)
+            for target in targets:
+                block.successors.append(target)
+                target.predecessors.append(block)
+
+    def _new_block(self):
+        block = BasicBlock(len(self.blocks))
+        self.blocks.append(block)
+        return block
+
+    def instructions(self):
+        """As instruções de todos os blocos, na ordem original"""
+        return [instr for block in self.blocks for instr in block.instructions]
+
+    def reverse_postorder(self):
+        """Blocos alcançáveis a partir da entrada, em pós-ordem reversa"""
+        if self._rpo is None:
+            # Os sucessores são visitados do último para o primeiro: a saída de um
+            # laço (alvo do desvio) termina antes do corpo, que assim fica logo
+            # depois do cabeçalho na ordem, e não depois do resto do programa
+            visited = {self.entry.index}
+            postorder = []
+            stack = [(self.entry, reversed(self.entry.successors))]
+            while stack:
+                block, successors = stack[-1]
+                for successor in successors:
+                    if successor.index not in visited:
+                        visited.add(successor.index)
+                        stack.append((successor, reversed(successor.successors)))
+                        break
+                else:
+                    stack.pop()
+                    postorder.append(block)
+            self._rpo = postorder[::-1]
+        return self._rpo
+
+    def reachable(self):
+        return {block.index for block in self.reverse_postorder()}
+
+    def immediate_dominators(self):
+        """Lista idom[índice do bloco] (None para blocos inalcançáveis; a entrada domina a si mesma)"""
+        if self._idom is not None:
+            return self._idom
+        rpo = self.reverse_postorder()
+        order = {block.index: position for position, block in enumerate(rpo)}
+        idom = [None] * len(self.blocks)
+        idom[self.entry.index] = self.entry.index
+
+        def intersect(a, b):
+            while a != b:
+                while order[a] > order[b]:
+                    a = idom[a]
+                while order[b] > order[a]:
+                    b = idom[b]
+            return a
+
+        changed = True
+        while changed:
+            changed = False
+            for block in rpo[1:]:
+                new_idom = None
+                for pred in block.predecessors:
+                    if idom[pred.index] is None:
+                        continue
+                    new_idom = pred.index if new_idom is None else intersect(pred.index, new_idom)
+                if idom[block.index] != new_idom:
+                    idom[block.index] = new_idom
+                    changed = True
+        self._idom = idom
+        return idom
+
+    def dominates(self, a, b):
+        """O bloco a domina o bloco b"""
+        pre, post = self._dominator_numbers()
+        if pre[a.index] is None or pre[b.index] is None:
+            return False
+        # a é ancestral de b na árvore de dominadores
+        return pre[a.index] <= pre[b.index] and post[b.index] <= post[a.index]
+
+    def _dominator_numbers(self):
+        """Números de pré e pós-ordem de cada bloco na árvore de dominadores (None se inalcançável)"""
+        if self._numbers is None:
+            children = self.dominator_tree()
+            pre = [None] * len(self.blocks)
+            post = [None] * len(self.blocks)
+            counter = 0
+            stack = [(self.entry, iter(children[self.entry.index]))]
+            pre[self.entry.index] = counter
+            while stack:
+                block, pending = stack[-1]
+                child = next(pending, None)
+                if child is None:
+                    stack.pop()
+                    counter += 1
+                    post[block.index] = counter
+                else:
+                    counter += 1
+                    pre[child.index] = counter
+                    stack.append((child, iter(children[child.index])))
+            self._numbers = pre, post
+        return self._numbers
+
+    def dominator_tree(self):
+        """Filhos de cada bloco na árvore de dominadores"""
+        idom = self.immediate_dominators()
+        children = [[] for _ in self.blocks]
+        for block in self.reverse_postorder()[1:]:
+            children[idom[block.index]].append(block)
+        return children
+
+    def dominance_frontiers(self):
+        """Fronteira de dominância de cada bloco (conjuntos de índices)"""
+        idom = self.immediate_dominators()
+        frontiers = [set() for _ in self.blocks]
+        for block in self.reverse_postorder():
+            preds = [pred for pred in block.predecessors if idom[pred.index] is not None]
+            if len(preds) < 2:
+                continue
+            for pred in preds:
+                runner = pred.index
+                while runner != idom[block.index]:
+                    frontiers[runner].add(block.index)
+                    runner = idom[runner]
+        return frontiers
+
+    def back_edges(self):
+        """Arestas (origem, cabeçalho) em que o cabeçalho domina a origem"""
+        edges = []
+        for block in self.reverse_postorder():
+            for successor in block.successors:
+                if self.dominates(successor, block):
+                    edges.append((block, successor))
+        return edges
@@ -0,0 +1,130 @@
+"""
+Cliente do servidor de compilação (compile_server.py).
+
+Só usa a biblioteca padrão: não importa o PLY nem o compilador, então abrir o
+cliente custa a inicialização do Python e nada mais; a compilação acontece no
+servidor, que já está aquecido.
+
+    python compile_client.py programa.lps                    # assembly em stdout
+    python compile_client.py programa.lps --emit tac
+    python compile_client.py programa.lps --check            # só os diagnósticos
+    python compile_client.py programa.lps --emit executable --runtime freestanding -o programa
+    python compile_client.py --ping | --shutdown
+
+Como biblioteca: request({'action': 'compile', 'source': texto}) devolve a
+resposta do servidor (dicionário). Client mantém a conexão aberta para vários
+pedidos. O status de saída é 0 sem erros, 1 com erros no programa e 2 sem
+servidor.
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+
+DEFAULT_SOCKET = os.environ.get(
+    'LPMS_SERVER_SOCKET',
+    os.path.join(os.environ.get('XDG_RUNTIME_DIR') or '/tmp', f"lpms-{os.getuid()}.sock"),
+)
+
+EMIT = ('ast', 'tac', 'bytecode', 'asm', 'executable')
+
+
+class Client:
+    """Conexão com o servidor; os pedidos seguem em sequência na mesma conexão"""
+    def __init__(self, socket_path=DEFAULT_SOCKET):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(socket_path)
+        self.file = self.socket.makefile('rwb')
+        self.next_id = 0
+
+    def request(self, message):
+        self.next_id += 1
+        message = dict(message, id=self.next_id)
+        self.file.write(json.dumps(message).encode() + b'\n')
+        self.file.flush()
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError("O servidor fechou a conexão")
+        return json.loads(line)
+
+    def close(self):
+        self.file.close()
+        self.socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def request(message, socket_path=DEFAULT_SOCKET):
+    """Um pedido numa conexão nova"""
+    with Client(socket_path) as client:
+        return client.request(message)
+
+
+def print_response(response, emit):
+    """Mostra a resposta como o compilador de linha de comando. Retorna o status de saída."""
+    if 'error' in response:
+        print(f"Erro: {response['error']}", file=sys.stderr)
+        return 1
+    for diagnostic in response['diagnostics']:
+        print(diagnostic['message'], file=sys.stderr)
+    artifact = response['artifacts'].get(emit)
+    if isinstance(artifact, list):
+        print('\n'.join(artifact))
+    elif emit == 'executable' and artifact:
+        print(f"Executável gerado com sucesso: {artifact}")
+    elif artifact:
+        sys.stdout.write(artifact if artifact.endswith('\n') else artifact + '\n')
+    return 0 if response['ok'] else 1
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('source', nargs='?', help="arquivo .lps")
+    arg_parser.add_argument('--socket', default=DEFAULT_SOCKET, help="caminho do socket Unix do servidor")
+    arg_parser.add_argument('--emit', choices=EMIT, default='asm')
+    arg_parser.add_argument('--check', action='store_true', help="só parse e análise semântica")
+    arg_parser.add_argument('--no-optimize', action='store_true', help="desabilita as otimizações sobre o TAC")
+    arg_parser.add_argument('--target', default='x86', help="x86 ou x86-64")
+    arg_parser.add_argument('--runtime', default='libc', help="libc ou freestanding")
+    arg_parser.add_argument('--lexer', default='ply', help="ply ou dfa")
+    arg_parser.add_argument('-o', '--output', help="com --emit executable, onde gravar o executável")
+    arg_parser.add_argument('--ping', action='store_true', help="mostra o estado do servidor")
+    arg_parser.add_argument('--shutdown', action='store_true', help="encerra o servidor")
+    args = arg_parser.parse_args()
+
+    if args.ping or args.shutdown:
+        message = {'action': 'ping' if args.ping else 'shutdown'}
+    elif args.source:
+        try:
+            with open(args.source) as f:
+                source = f.read()
+        except OSError as e:
+            print(f"Erro: {str(e)}", file=sys.stderr)
+            sys.exit(1)
+        message = {'action': 'check' if args.check else 'compile', 'source': source,
+                   'options': {'emit': args.emit, 'optimize': not args.no_optimize, 'target': args.target,
+                               'runtime': args.runtime, 'lexer': args.lexer}}
+        if args.emit == 'executable':
+            # O servidor grava o arquivo: o caminho precisa valer no diretório dele
+            message['output'] = os.path.abspath(args.output or os.path.splitext(args.source)[0])
+    else:
+        arg_parser.error("informe o arquivo .lps, --ping ou --shutdown")
+
+    try:
+        response = request(message, args.socket)
+    except (ConnectionRefusedError, FileNotFoundError):
+        print(f"Erro: nenhum servidor em {args.socket} (inicie com python compile_server.py)", file=sys.stderr)
+        sys.exit(2)
+    if args.ping or args.shutdown:
+        print(json.dumps(response))
+        sys.exit(0)
+    sys.exit(print_response(response, 'ast' if args.check else args.emit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Servidor de compilação: um processo de longa duração que mantém o lexer, o
+parser (tabelas já carregadas) e os passes importados, e atende pedidos de
+compilação por um socket Unix local. Cada pedido custa só a compilação, sem a
+inicialização do Python e do PLY de um processo novo por arquivo.
+
+Protocolo: uma mensagem JSON por linha, nos dois sentidos. Pedido:
+    {"id": 1, "action": "compile", "source": "Program ...", "options": {"emit": "asm"}}
+    action   'compile' (padrão), 'check' (só parse e análise semântica),
+             'ping' ou 'shutdown'
+    options  as de compiler_api (emit, optimize, target, runtime, lexer)
+    output   com emit='executable', caminho onde gravar o executável
+Resposta: o CompileResult.as_dict() (ok, diagnostics, artifacts, reports) com
+o mesmo id; com output, artifacts['executable'] é o caminho gravado em vez dos
+bytes em hexadecimal. Um pedido inválido (JSON malformado, opção desconhecida)
+recebe {"id": ..., "ok": false, "error": mensagem}.
+
+Os pedidos de uma conexão podem ser enviados em sequência sem esperar as
+respostas, que voltam na ordem em que ficam prontas (use o id). O asyncio só
+lê e escreve nos sockets; as compilações rodam num pool de workers:
+processos (padrão, compilam em paralelo) ou threads (compile_source é
+reentrante, mas o GIL serializa as compilações).
+
+Uso:
+    python compile_server.py [--socket CAMINHO] [--workers N] [--pool process|thread]
+    python compile_client.py programa.lps --emit asm     (cliente, ver compile_client.py)
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from compile_client import DEFAULT_SOCKET
+from compiler_api import compile_source
+
+ACTIONS = ('compile', 'check', 'ping', 'shutdown')
+POOLS = ('process', 'thread')
+
+# Maior linha aceita (um pedido inteiro, com o fonte)
+MAX_MESSAGE = 64 * 1024 * 1024
+
+WARM_UP_SOURCE = "Program Aquecimento {\n    int a;\n    a = 1 + 2;\n    while (a < 3) { a = a + 1; }\n    print(a);\n}\n"
+
+
+def warm_up():
+    """Inicializador dos workers: a primeira compilação carrega o que ainda é preguiçoso"""
+    compile_source(WARM_UP_SOURCE, {'emit': 'asm'})
+
+
+def handle_request(request):
+    """Executa um pedido compile ou check (no worker). Retorna o dicionário da resposta."""
+    options = dict(request.get('options') or {})
+    if request.get('action') == 'check':
+        options['emit'] = 'ast'
+    try:
+        result = compile_source(request['source'], options)
+    except ValueError as e:  # Opções inválidas
+        return {'ok': False, 'error': str(e)}
+    response = result.as_dict()
+    output = request.get('output')
+    if output and 'executable' in result.artifacts:
+        with open(output, 'wb') as f:
+            f.write(result.artifacts['executable'])
+        os.chmod(output, 0o755)
+        response['artifacts']['executable'] = os.path.abspath(output)
+    return response
+
+
+class CompileServer:
+    def __init__(self, socket_path=DEFAULT_SOCKET, workers=None, pool='process'):
+        self.socket_path = socket_path
+        self.workers = workers or os.cpu_count() or 1
+        self.pool_kind = pool
+        self.pool = None
+        self.server = None
+        self.stopping = None
+        self.connections = {}  # Conexões abertas (writer -> tarefa), fechadas no stop
+        self.requests = 0
+
+    def start_pool(self):
+        executor_class = ProcessPoolExecutor if self.pool_kind == 'process' else ThreadPoolExecutor
+        self.pool = executor_class(max_workers=self.workers, initializer=warm_up)
+        # Cria todos os workers já aquecidos, antes do primeiro pedido
+        for future in [self.pool.submit(warm_up) for _ in range(self.workers)]:
+            future.result()
+
+    async def serve(self):
+        loop = asyncio.get_running_loop()
+        self.stopping = loop.create_future()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, self.stop)
+        self._remove_stale_socket()
+        old_umask = os.umask(0o077)  # Socket acessível só pelo usuário
+        try:
+            self.server = await asyncio.start_unix_server(self.handle_connection, self.socket_path,
+                                                          limit=MAX_MESSAGE)
+        finally:
+            os.umask(old_umask)
+        print(f"Servidor de compilação em {self.socket_path} ({self.workers} workers, {self.pool_kind})",
+              file=sys.stderr)
+        try:
+            await self.stopping
+        finally:
+            self.server.close()
+            tasks = list(self.connections.values())
+            for writer in list(self.connections):
+                writer.close()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.server.wait_closed()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def stop(self):
+        if not self.stopping.done():
+            self.stopping.set_result(None)
+
+    def _remove_stale_socket(self):
+        """Remove o socket de um servidor que não existe mais; recusa se houver um ativo"""
+        if not os.path.exists(self.socket_path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(self.socket_path)
+            return
+        finally:
+            probe.close()
+        raise RuntimeError(f"Já existe um servidor em {self.socket_path}")
+
+    async def handle_connection(self, reader, writer):
+        self.connections[writer] = asyncio.current_task()
+        pending = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # Linha maior que MAX_MESSAGE
+                    await self._send(writer, {'id': None, 'ok': False, 'error': "Pedido grande demais"})
+                    break
+                if not line:
+                    break
+                task = asyncio.create_task(self.handle_message(line, writer))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+        except ConnectionError:
+            pass
+        finally:
+            self.connections.pop(writer, None)
+            writer.close()
+
+    async def handle_message(self, line, writer):
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("o pedido deve ser um objeto JSON")
+        except ValueError as e:
+            await self._send(writer, {'id': None, 'ok': False, 'error': f"Pedido inválido: {str(e)}"})
+            return
+        request_id = request.get('id')
+        action = request.get('action', 'compile')
+        if action not in ACTIONS:
+            response = {'ok': False, 'error': f"action deve ser uma de {ACTIONS}"}
+        elif action == 'ping':
+            response = {'ok': True, 'workers': self.workers, 'pool': self.pool_kind, 'requests': self.requests}
+        elif action == 'shutdown':
+            await self._send(writer, {'id': request_id, 'ok': True})
+            self.stop()  # Depois de responder: o stop fecha as conexões
+            return
+        elif not isinstance(request.get('source'), str):
+            response = {'ok': False, 'error': "source (texto do programa) é obrigatório"}
+        else:
+            self.requests += 1
+            loop = asyncio.get_running_loop()
+            try:
+                response = await loop.run_in_executor(self.pool, handle_request, request)
+            except Exception as e:  # Falha do worker (ex.: processo encerrado)
+                response = {'ok': False, 'error': f"Erro interno: {str(e)}"}
+        response['id'] = request_id
+        await self._send(writer, response)
+
+    async def _send(self, writer, response):
+        writer.write(json.dumps(response).encode() + b'\n')
+        await writer.drain()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--socket', default=DEFAULT_SOCKET, help="caminho do socket Unix")
+    arg_parser.add_argument('--workers', type=int, default=None, help="workers do pool (padrão: número de CPUs)")
+    arg_parser.add_argument('--pool', choices=POOLS, default='process',
+                            help="process (compilações em paralelo) ou thread")
+    args = arg_parser.parse_args()
+
+    server = CompileServer(args.socket, args.workers, args.pool)
+    server.start_pool()
+    try:
+        asyncio.run(server.serve())
+    except RuntimeError as e:
+        print(f"Erro: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        server.pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+API de biblioteca do compilador: compila um texto em memória e devolve os
+diagnósticos e os artefatos como dados, sem imprimir nada nem tocar no disco.
+
+    result = compile_source(text, {'emit': 'asm', 'target': 'x86-64'})
+    if result.ok:
+        print(result.artifacts['asm'])
+    else:
+        for diagnostic in result.errors:
+            print(diagnostic.line, diagnostic.message)
+
+Reentrante: cada chamada tem o seu lexer (clone) e o seu parser (cópia que
+compartilha as tabelas LR), e os passes seguintes só usam objetos criados pela
+própria chamada. Pode ser usada de várias threads ao mesmo tempo (ex.: um
+ThreadPoolExecutor num serviço que recebe muitos programas).
+
+Opções (as ausentes ficam com o valor de DEFAULT_OPTIONS):
+    emit      até onde compilar: 'ast', 'tac', 'bytecode', 'asm' ou 'executable'
+    optimize  otimizações sobre o TAC
+    target    'x86' ou 'x86-64'
+    runtime   'libc' ou 'freestanding'
+    lexer     'ply' ou 'dfa' (scanner de dfa_lexer.py, mesmos tokens e erros)
+Com emit='executable' o ELF é montado em processo (x86_encoder/elf_writer), o
+que só existe para o alvo x86 com o runtime freestanding.
+
+Artefatos (result.artifacts), conforme emit: 'ast' (Node), 'tac' (lista de
+Quad), 'bytecode' (vm.Bytecode), 'asm' (texto NASM) e 'executable' (bytes).
+"""
+import os
+
+from diagnostics import Diagnostic
+from elf_writer import build_executable
+from nasm_generator import RUNTIMES
+from optimizer import optimize_tac
+from parser import LEXERS, TACGenerator, parse_source
+from peephole import PeepholeOptimizer
+from semantic_analyzer import SemanticAnalyzer
+from targets import ROOT, TARGETS
+from vm import BytecodeCompiler
+
+EMIT = ('ast', 'tac', 'bytecode', 'asm', 'executable')
+
+DEFAULT_OPTIONS = {
+    'emit': 'asm',
+    'optimize': True,
+    'target': 'x86',
+    'runtime': 'libc',
+    'lexer': 'ply',
+}
+
+
+class CompileResult:
+    def __init__(self, options):
+        self.options = options
+        self.stage = None      # Última fase iniciada (as fases de diagnostics.py)
+        self.diagnostics = []  # Diagnostic, na ordem em que foram encontrados
+        self.artifacts = {}
+        self.reports = []      # Relatórios dos passes de otimização, como no modo de linha de comando
+
+    @property
+    def errors(self):
+        return [diagnostic for diagnostic in self.diagnostics if diagnostic.is_error]
+
+    @property
+    def warnings(self):
+        return [diagnostic for diagnostic in self.diagnostics if not diagnostic.is_error]
+
+    @property
+    def ok(self):
+        return not any(diagnostic.is_error for diagnostic in self.diagnostics)
+
+    def as_dict(self):
+        """Resultado serializável (JSON): os artefatos de texto e bytes, sem a AST nem objetos do TAC"""
+        artifacts = {}
+        for name, value in self.artifacts.items():
+            if name == 'tac':
+                artifacts[name] = [str(instr) for instr in value]
+            elif name == 'bytecode':
+                artifacts[name] = value.disassemble()
+            elif name == 'executable':
+                artifacts[name] = value.hex()
+            elif name != 'ast':
+                artifacts[name] = value
+        return {'ok': self.ok, 'diagnostics': [diagnostic.as_dict() for diagnostic in self.diagnostics],
+                'artifacts': artifacts, 'reports': self.reports}
+
+
+def resolve_options(options=None):
+    """Opções completas a partir de DEFAULT_OPTIONS. Opções inválidas são erro de quem chama (ValueError)."""
+    resolved = dict(DEFAULT_OPTIONS)
+    if options:
+        unknown = set(options) - set(DEFAULT_OPTIONS)
+        if unknown:
+            raise ValueError(f"Opções desconhecidas: {', '.join(sorted(unknown))}")
+        resolved.update(options)
+    if resolved['emit'] not in EMIT:
+        raise ValueError(f"emit deve ser um de {EMIT}")
+    if resolved['target'] not in TARGETS:
+        raise ValueError(f"target deve ser um de {tuple(TARGETS)}")
+    if resolved['runtime'] not in RUNTIMES:
+        raise ValueError(f"runtime deve ser um de {RUNTIMES}")
+    if resolved['lexer'] not in LEXERS:
+        raise ValueError(f"lexer deve ser um de {LEXERS}")
+    if resolved['emit'] == 'executable' and (resolved['target'] != 'x86' or resolved['runtime'] != 'freestanding'):
+        raise ValueError("emit='executable' exige target='x86' e runtime='freestanding'")
+    return resolved
+
+
+def compile_source(text, options=None):
+    """Compila o programa em text até options['emit']. Retorna um CompileResult."""
+    options = resolve_options(options)
+    result = CompileResult(options)
+    try:
+        _compile(text, options, result)
+    except Exception as e:
+        # Falhas internas de um passe também voltam como diagnóstico: quem chama
+        # não precisa tratar exceções do compilador à parte dos erros no programa
+        result.diagnostics.append(Diagnostic(result.stage, f"Erro interno: {str(e)}"))
+    return result
+
+
+def _compile(text, options, result):
+    diagnostics = result.diagnostics
+    artifacts = result.artifacts
+    emit = options['emit']
+
+    result.stage = 'parser'
+    ast = parse_source(text, diagnostics, options['lexer'])
+    if not result.ok:
+        return
+    if ast is None:
+        diagnostics.append(Diagnostic('parser', "Programa vazio"))
+        return
+
+    result.stage = 'semantic'
+    success, errors = SemanticAnalyzer().analyze(ast)
+    diagnostics.extend(Diagnostic('semantic', error) for error in errors)
+    if not success:
+        return
+    artifacts['ast'] = ast
+    if emit == 'ast':
+        return
+
+    result.stage = 'tac'
+    generator = TACGenerator()
+    ast.generate_tac(generator)
+    instructions = generator.instructions
+    int_bits = TARGETS[options['target']]['generator'].int_bits
+    if options['optimize']:
+        result.stage = 'optimizer'
+        instructions, passes = optimize_tac(instructions, int_bits)
+        for optimization in passes:
+            result.reports.append(optimization.report())
+            diagnostics.extend(Diagnostic('optimizer', warning, severity='warning')
+                               for warning in getattr(optimization, 'warnings', ()))
+    artifacts['tac'] = instructions
+    if emit == 'tac':
+        return
+
+    result.stage = 'backend'
+    if emit == 'bytecode':
+        compiler = BytecodeCompiler(int_bits=int_bits)
+        artifacts['bytecode'] = compiler.compile(instructions)
+        result.reports.append(compiler.report())
+        return
+
+    target = options['target']
+    runtime = options['runtime']
+    nasm_code = TARGETS[target]['generator'](runtime=runtime).generate_nasm(instructions)
+    peephole = PeepholeOptimizer(target)
+    nasm_code = peephole.optimize(nasm_code)
+    result.reports.append(peephole.report())
+    artifacts['asm'] = nasm_code
+    if emit == 'asm':
+        return
+
+    artifacts['executable'] = build_executable([nasm_code], os.path.join(ROOT, TARGETS[target]['runtime']))
@@ -0,0 +1,175 @@
+"""
+Dobramento e propagação de constantes sobre o TAC.
+
+Operações com operandos literais são avaliadas em tempo de compilação,
+seguindo as regras de tipo do SemanticAnalyzer.get_operation_type: int com
+int resulta em int (a divisão trunca em direção a zero, como o idiv), e
+qualquer operando float resulta em float. Os int dão a volta em int_bits bits,
+a largura dos registradores do alvo, como no executável; um float fora do
+intervalo fica para a execução. O resultado é propagado para os usos seguintes:
+    - temporários têm uma única definição, então o valor vale no programa todo;
+    - constantes (DECLARE k = valor) nunca mudam, então também valem no programa
+      todo. São guardadas pelo símbolo, não pelo nome: uma variável que sombreia
+      a constante num escopo interno é outro símbolo e não recebe o valor;
+    - variáveis comuns só são propagadas dentro do bloco (até o próximo label).
+
+Desvios condicionais com condição constante viram goto ou são removidos, e
+temporários cujos usos foram todos substituídos deixam de ser calculados.
+"""
+from tac import Op, Quad, literal, wrap_int, ARITHMETIC_OPS, COMPARISON_OPS, BINARY_OPCODES, UNARY_OPCODES
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _fact_key(operand):
+    """Chave dos valores que valem no programa todo: temporários, e variáveis pelo id do símbolo"""
+    if operand.is_var and operand.symbol is not None:
+        return operand.symbol
+    return operand
+
+
+def _fold_binary(op, left, right, int_bits=32):
+    """Valor de 'left op right', ou None se não for possível avaliar"""
+    if op in ARITHMETIC_OPS:
+        if not (_is_number(left) and _is_number(right)):
+            return None
+        is_float = isinstance(left, float) or isinstance(right, float)
+        try:
+            if op == Op.ADD:
+                result = left + right
+            elif op == Op.SUB:
+                result = left - right
+            elif op == Op.MUL:
+                result = left * right
+            else:
+                if right == 0:
+                    return None  # Mantém a divisão por zero para a execução
+                if is_float:
+                    result = left / right
+                else:
+                    quotient = abs(left) // abs(right)
+                    result = quotient if (left < 0) == (right < 0) else -quotient
+            if is_float:
+                return float(result)
+        except OverflowError:
+            return None  # Float fora do intervalo: fica para a execução
+        return wrap_int(result, int_bits)
+
+    if op in COMPARISON_OPS:
+        if _is_number(left) and _is_number(right):
+            pass
+        elif isinstance(left, bool) and isinstance(right, bool) and op in (Op.EQ, Op.NE):
+            pass
+        else:
+            return None
+        return {
+            Op.GT: left > right, Op.LT: left < right,
+            Op.GE: left >= right, Op.LE: left <= right,
+            Op.EQ: left == right, Op.NE: left != right,
+        }[op]
+    return None
+
+
+def _fold_unary(op, value, int_bits=32):
+    if op == Op.NEG and _is_number(value):
+        return wrap_int(-value, int_bits)
+    if op == Op.NOT and isinstance(value, bool):
+        return not value
+    return None
+
+
+class ConstantFolder:
+    def __init__(self, int_bits=32):
+        self.int_bits = int_bits  # Largura dos int do alvo
+        self.folded = 0
+        self.propagated = 0
+        self.eliminated = 0
+
+    def run(self, instructions):
+        constants = {}  # Temporários e constantes declaradas: valor global
+        local = {}      # Variáveis comuns: valor conhecido no bloco atual
+        output = []
+
+        for instr in instructions:
+            op = instr.op
+
+            if op == Op.LABEL:
+                local.clear()
+                output.append(instr)
+                continue
+
+            if op == Op.DECLARE:
+                if instr.arg1 is not None:
+                    constants[_fact_key(instr.result)] = instr.arg1
+                else:
+                    local.pop(instr.result, None)
+                output.append(instr)
+                continue
+
+            arg1 = self._substitute(instr.arg1, constants, local)
+            arg2 = self._substitute(instr.arg2, constants, local)
+            result = instr.result
+
+            if op in BINARY_OPCODES and arg1.is_literal and arg2.is_literal:
+                value = _fold_binary(op, arg1.value, arg2.value, self.int_bits)
+                if value is not None:
+                    self.folded += 1
+                    op, arg1, arg2 = Op.COPY, literal(value), None
+            elif op in UNARY_OPCODES and arg1.is_literal:
+                value = _fold_unary(op, arg1.value, self.int_bits)
+                if value is not None:
+                    self.folded += 1
+                    op, arg1 = Op.COPY, literal(value)
+
+            if op == Op.IF_FALSE and arg1.is_literal and isinstance(arg1.value, bool):
+                self.eliminated += 1
+                if not arg1.value:
+                    output.append(Quad(Op.GOTO, result))
+                continue  # Condição sempre verdadeira: o desvio nunca acontece
+
+            defined = result if op in BINARY_OPCODES or op in UNARY_OPCODES or op in (Op.COPY, Op.INPUT) else None
+            if defined is not None:
+                if op == Op.COPY and arg1.is_literal:
+                    if defined.is_temp:
+                        constants[defined] = arg1
+                    else:
+                        local[defined] = arg1
+                elif not defined.is_temp:
+                    local.pop(defined, None)
+
+            output.append(Quad(op, result, arg1, arg2))
+
+        return self._remove_constant_temps(output, constants)
+
+    def _substitute(self, operand, constants, local):
+        if operand is None or operand.is_literal or operand.is_label:
+            return operand
+        value = constants.get(_fact_key(operand))
+        if value is None:
+            value = local.get(operand)
+        if value is None:
+            return operand
+        self.propagated += 1
+        return value
+
+    def _remove_constant_temps(self, instructions, constants):
+        # Temporários constantes cujos usos foram todos substituídos
+        used = set()
+        for instr in instructions:
+            for operand in instr.uses():
+                if operand.is_temp:
+                    used.add(operand)
+        output = []
+        for instr in instructions:
+            if (instr.op == Op.COPY and instr.result.is_temp and instr.result in constants
+                    and instr.result not in used):
+                self.eliminated += 1
+                continue
+            output.append(instr)
+        return output
+
+    def report(self):
+        return (f"Dobramento de constantes: {self.folded} operações avaliadas, "
+                f"{self.propagated} operandos propagados, {self.eliminated} instruções eliminadas")
@@ -0,0 +1,327 @@
+"""
+Resolvedor genérico de análises de fluxo de dados sobre o CFG.
+
+Cada análise descreve seus fatos (variáveis, definições, expressões) como
+bits de um inteiro Python e fornece gen/kill por bloco; a transferência
+padrão é out = gen | (in & ~kill). O custo de cada operação cresce com o
+número de fatos, então as análises só acompanham o que cruza blocos: os
+operandos lidos em algum bloco antes de serem definidos nele (os temporários
+usados só no próprio bloco ficam de fora). As definições que alcançam, que em
+cada ponto são poucas entre muitas, usam conjuntos esparsos em vez de bits.
+O resolvedor usa uma lista de trabalho
+priorizada pela pós-ordem reversa (análises para frente) ou pela pós-ordem
+(para trás): cada bloco é reprocessado só quando uma entrada muda, e sempre
+depois dos blocos que o precedem na direção da análise, o que faz a solução
+convergir em poucas passadas mesmo com laços aninhados.
+
+Análises incluídas:
+    Liveness              para trás, união          operandos vivos
+    ReachingDefinitions   para frente, união        definições que alcançam o ponto
+    AvailableExpressions  para frente, interseção   expressões já calculadas em todo caminho
+"""
+import heapq
+
+from tac import Op, BINARY_OPCODES, UNARY_OPCODES
+
+COMMUTATIVE_OPS = frozenset((Op.ADD, Op.MUL, Op.EQ, Op.NE))
+
+
+def exposed_operands(cfg):
+    """Operandos lidos em algum bloco antes de serem definidos nele: os únicos vivos entre blocos"""
+    exposed = set()
+    for block in cfg.blocks:
+        defined = set()
+        for instr in block.instructions:
+            for operand in instr.uses():
+                if not operand.is_literal and operand not in defined:
+                    exposed.add(operand)
+            result = instr.defines()
+            if result is not None:
+                defined.add(result)
+    return exposed
+
+
+class DataflowProblem:
+    forward = True
+    union = True  # Operador de junção: união (True) ou interseção (False)
+
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.facts = []     # Bit i -> fato
+        self.bits = {}      # Fato -> bit
+        self.gen = [0] * len(cfg.blocks)
+        self.kill = [0] * len(cfg.blocks)
+
+    def bit(self, fact):
+        index = self.bits.get(fact)
+        if index is None:
+            index = self.bits[fact] = len(self.facts)
+            self.facts.append(fact)
+        return 1 << index
+
+    def mask(self, fact):
+        """Bit de um fato já registrado, ou 0 (sem registrar um novo)"""
+        index = self.bits.get(fact)
+        return 0 if index is None else 1 << index
+
+    def transfer(self, index, value):
+        """Valor na saída do bloco (na direção da análise) a partir do valor na entrada"""
+        return self.gen[index] | (value & ~self.kill[index])
+
+    @property
+    def universe(self):
+        return (1 << len(self.facts)) - 1
+
+    def boundary(self):
+        """Valor na entrada do programa (para frente) ou na saída (para trás)"""
+        return 0
+
+    def initial(self):
+        """Valor inicial dos demais blocos"""
+        return 0 if self.union else self.universe
+
+    def decode(self, bits):
+        """Converte um conjunto de bits no conjunto de fatos"""
+        facts = set()
+        index = 0
+        while bits:
+            if bits & 1:
+                facts.add(self.facts[index])
+            bits >>= 1
+            index += 1
+        return facts
+
+
+class DataflowResult:
+    def __init__(self, problem, inputs, outputs):
+        self.problem = problem
+        self.inputs = inputs    # Bits na entrada de cada bloco
+        self.outputs = outputs  # Bits na saída de cada bloco
+
+    def facts_in(self, block):
+        return self.problem.decode(self.inputs[block.index])
+
+    def facts_out(self, block):
+        return self.problem.decode(self.outputs[block.index])
+
+
+def solve(problem):
+    cfg = problem.cfg
+    count = len(cfg.blocks)
+    transfer = problem.transfer
+    initial = problem.initial()
+    inputs = [initial] * count
+    outputs = [initial] * count
+    union = problem.union
+
+    order = cfg.reverse_postorder()
+    if not problem.forward:
+        order = order[::-1]
+    # Blocos inalcançáveis também recebem um valor
+    reachable = {block.index for block in order}
+    order = order + [block for block in cfg.blocks if block.index not in reachable]
+
+    # Lista de trabalho: posições na ordem, retiradas da menor para a maior
+    position = {block.index: number for number, block in enumerate(order)}
+    worklist = list(range(len(order)))
+    pending = set(worklist)
+    boundary = problem.boundary()
+
+    while worklist:
+        number = heapq.heappop(worklist)
+        pending.discard(number)
+        block = order[number]
+        index = block.index
+
+        if problem.forward:
+            sources, targets = block.predecessors, block.successors
+            values, results = outputs, inputs
+        else:
+            sources, targets = block.successors, block.predecessors
+            values, results = inputs, outputs
+
+        if not sources:
+            joined = boundary
+        else:
+            joined = values[sources[0].index]
+            for source in sources[1:]:
+                joined = joined | values[source.index] if union else joined & values[source.index]
+        if problem.forward and block is cfg.entry and sources:
+            # A entrada também recebe o valor de fronteira (além das arestas de retorno)
+            joined = joined | boundary if union else joined & boundary
+
+        results[index] = joined
+        transferred = transfer(index, joined)
+        if transferred != values[index]:
+            values[index] = transferred
+            for target in targets:
+                number = position[target.index]
+                if number not in pending:
+                    pending.add(number)
+                    heapq.heappush(worklist, number)
+
+    return DataflowResult(problem, inputs, outputs)
+
+
+class Liveness(DataflowProblem):
+    """
+    Operandos (temporários e variáveis) vivos: serão lidos antes de redefinidos.
+
+    Só têm bit os operandos lidos em algum bloco antes de uma definição nele; os
+    outros nunca estão vivos na fronteira de um bloco (mask devolve 0 para eles).
+    """
+    forward = False
+    union = True
+
+    def __init__(self, cfg):
+        super().__init__(cfg)
+        for operand in exposed_operands(cfg):
+            self.bit(operand)
+        for block in cfg.blocks:
+            gen = kill = 0
+            for instr in reversed(block.instructions):
+                defined = instr.defines()
+                if defined is not None:
+                    bit = self.mask(defined)
+                    kill |= bit
+                    gen &= ~bit
+                for operand in instr.uses():
+                    gen |= self.mask(operand)
+            self.gen[block.index] = gen
+            self.kill[block.index] = kill
+
+    def defines_live(self, block, live_out):
+        """
+        Para cada instrução do bloco, se o operando que ela define é lido depois
+        (True também para as que não definem nada), dado o conjunto vivo na saída
+        """
+        return self.scan(block, live_out)[0]
+
+    def reads(self, instr, defines_live):
+        """Se os operandos de instr ficam vivos antes dela, dado se o que ela define é lido depois"""
+        return True
+
+    def scan(self, block, live_out):
+        """Percorre o bloco de trás para frente: (defines_live, bits vivos na entrada do bloco)"""
+        result = [True] * len(block.instructions)
+        live = live_out
+        local = set()  # Operandos sem bit vivos neste ponto do bloco
+        for position in range(len(block.instructions) - 1, -1, -1):
+            instr = block.instructions[position]
+            defined = instr.defines()
+            if defined is not None:
+                bit = self.mask(defined)
+                if bit:
+                    result[position] = bool(live & bit)
+                    live &= ~bit
+                else:
+                    result[position] = defined in local
+                    local.discard(defined)
+            if not self.reads(instr, result[position]):
+                continue
+            for operand in instr.uses():
+                if not operand.is_literal:
+                    bit = self.mask(operand)
+                    if bit:
+                        live |= bit
+                    else:
+                        local.add(operand)
+        return result, live
+
+
+class ReachingDefinitions(DataflowProblem):
+    """
+    Definições (bloco, posição) que alcançam cada ponto sem serem sobrescritas,
+    dos operandos lidos fora do bloco em que são definidos (exposed_operands):
+    a definição de um temporário usado só no seu bloco não interessa a nenhum
+    outro e, como nunca é sobrescrita, alcançaria o resto do programa todo.
+
+    Os valores são conjuntos (frozenset) de números de definições, não bits: só
+    a última definição de cada operando num bloco sai dele, então num ponto
+    alcançam poucas definições, e um inteiro com um bit por definição do
+    programa custaria o tamanho do programa a cada operação. gen é o conjunto
+    das definições que saem do bloco e kill, o conjunto dos operandos que ele
+    define.
+    """
+    forward = True
+    union = True
+
+    def __init__(self, cfg):
+        super().__init__(cfg)
+        self.operand_of = []  # Número da definição -> operando definido
+        exposed = exposed_operands(cfg)
+        for block in cfg.blocks:
+            last = {}  # Operando -> última definição no bloco
+            for position, instr in enumerate(block.instructions):
+                defined = instr.defines()
+                if defined in exposed:
+                    self.facts.append((block.index, position))
+                    self.operand_of.append(defined)
+                    last[defined] = len(self.facts) - 1
+            self.gen[block.index] = frozenset(last.values())
+            self.kill[block.index] = frozenset(last)
+
+    def initial(self):
+        return frozenset()
+
+    def boundary(self):
+        return frozenset()
+
+    def transfer(self, index, value):
+        kill, operand_of = self.kill[index], self.operand_of
+        return self.gen[index] | frozenset(number for number in value if operand_of[number] not in kill)
+
+    def decode(self, numbers):
+        return {self.facts[number] for number in numbers}
+
+
+def _operand_order(operand):
+    return (operand.kind, type(operand.value).__name__, str(operand.value),
+            -1 if operand.symbol is None else operand.symbol)
+
+
+def expression_key(instr):
+    """Chave canônica da expressão calculada pela instrução (ou None)"""
+    if instr.op in BINARY_OPCODES:
+        left, right = instr.arg1, instr.arg2
+        if instr.op in COMMUTATIVE_OPS and _operand_order(right) < _operand_order(left):
+            left, right = right, left
+        return (instr.op, left, right)
+    if instr.op in UNARY_OPCODES:
+        return (instr.op, instr.arg1, None)
+    return None
+
+
+class AvailableExpressions(DataflowProblem):
+    """Expressões calculadas em todo caminho até o ponto e cujos operandos não mudaram"""
+    forward = True
+    union = False
+
+    def __init__(self, cfg):
+        super().__init__(cfg)
+        self.uses_of = {}  # Operando -> bits das expressões que o leem
+        keyed = []
+        for block in cfg.blocks:
+            entries = []
+            for instr in block.instructions:
+                key = expression_key(instr)
+                if key is not None and not all(op is None or op.is_literal for op in key[1:]):
+                    bit = self.bit(key)
+                    for operand in key[1:]:
+                        if operand is not None and not operand.is_literal:
+                            self.uses_of[operand] = self.uses_of.get(operand, 0) | bit
+                else:
+                    bit = 0
+                entries.append((bit, instr.defines()))
+            keyed.append(entries)
+
+        for block, entries in zip(cfg.blocks, keyed):
+            gen = kill = 0
+            for bit, defined in entries:
+                gen |= bit
+                if defined is not None:
+                    killed = self.uses_of.get(defined, 0)
+                    gen &= ~killed
+                    kill |= killed
+            self.gen[block.index] = gen
+            self.kill[block.index] = kill & ~gen
@@ -0,0 +1,101 @@
+"""
+Eliminação de código morto e de armazenamento morto sobre o TAC.
+
+    - instruções inalcançáveis (depois de um goto, até o próximo label alcançável);
+    - atribuições cujo valor nunca é lido (vivacidade sobre o CFG, ver dataflow.py);
+    - temporários calculados e nunca usados;
+    - cadeias e ciclos de atribuições que só alimentam outras atribuições mortas;
+    - declarações de variáveis que não aparecem em nenhuma instrução restante,
+      o que remove também o espaço delas na seção .data.
+
+Também emite avisos para as variáveis declaradas e nunca lidas.
+INPUT é mantido mesmo quando o valor lido não é usado, pois consome a entrada.
+
+A vivacidade usada é a forte (StrongLiveness): os operandos de uma operação
+pura cujo resultado não é lido não ficam vivos por ela. Com isso uma única
+análise e uma única passada removem também o que só ficaria morto depois de
+remover outras atribuições, sem reconstruir o CFG e refazer a vivacidade até
+nada mudar.
+"""
+from cfg import ControlFlowGraph
+from dataflow import Liveness, solve
+from tac import Op, BINARY_OPCODES, UNARY_OPCODES
+
+PURE_OPS = BINARY_OPCODES | UNARY_OPCODES | {Op.COPY}
+
+
+class StrongLiveness(Liveness):
+    """Vivacidade em que só as instruções que ficam no programa tornam seus operandos vivos"""
+
+    def reads(self, instr, defines_live):
+        return defines_live or instr.op not in PURE_OPS
+
+    def transfer(self, index, value):
+        return self.scan(self.cfg.blocks[index], value)[1]
+
+
+class DeadCodeEliminator:
+    def __init__(self):
+        self.unreachable = 0
+        self.dead_assignments = 0
+        self.dead_declarations = 0
+        self.warnings = []
+
+    def run(self, instructions):
+        cfg = ControlFlowGraph(self._remove_unreachable(instructions))
+        liveness = StrongLiveness(cfg)
+        result = solve(liveness)
+        kept = []
+        for block in cfg.blocks:
+            defines_live = liveness.defines_live(block, result.outputs[block.index])
+            for instr, live in zip(block.instructions, defines_live):
+                if instr.op in PURE_OPS and not live:
+                    self.dead_assignments += 1
+                    continue
+                kept.append(instr)
+        return self._remove_declarations(kept)
+
+    def check_unused(self, instructions):
+        """Avisos de variáveis nunca lidas. Deve receber o TAC antes das outras otimizações."""
+        declared = [instr.result for instr in instructions if instr.op == Op.DECLARE]
+        read = set()
+        for instr in instructions:
+            read.update(instr.uses())
+        for var in declared:
+            if var not in read:
+                self.warnings.append(f"Aviso: variável '{var}' declarada mas nunca usada")
+
+    def _remove_unreachable(self, instructions):
+        cfg = ControlFlowGraph(instructions)
+        reachable = cfg.reachable()
+        kept = []
+        for block in cfg.blocks:
+            for instr in block.instructions:
+                # Declarações são mantidas: a variável pode ser usada em código alcançável
+                if block.index in reachable or instr.op == Op.DECLARE:
+                    kept.append(instr)
+                else:
+                    self.unreachable += 1
+        return kept
+
+    def _remove_declarations(self, instructions):
+        referenced = set()
+        for instr in instructions:
+            if instr.op == Op.DECLARE:
+                continue
+            for operand in (instr.result, instr.arg1, instr.arg2):
+                if operand is not None and operand.is_var:
+                    referenced.add(operand)
+        kept = []
+        for instr in instructions:
+            if instr.op == Op.DECLARE and instr.result not in referenced:
+                self.dead_declarations += 1
+                continue
+            kept.append(instr)
+        return kept
+
+    def report(self):
+        lines = [f"Eliminação de código morto: {self.unreachable} instruções inalcançáveis, "
+                 f"{self.dead_assignments} atribuições mortas, {self.dead_declarations} declarações removidas"]
+        lines.extend(self.warnings)
+        return '\n'.join(lines)
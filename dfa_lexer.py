@@ -0,0 +1,236 @@
+"""
+Scanner alternativo ao lexer do PLY: um DFA escrito à mão sobre o texto.
+
+O estado inicial despacha pelo primeiro caractere (tabela CHAR_ACTIONS): um
+operador de um ou dois caracteres vira token direto, e os tokens de tamanho
+variável (identificadores, números, strings, comentários e sequências de
+quebras de linha) consomem o resto com um único match das expressões de
+lexer.py, executado em C. Não há LexToken nem callback por token: o resultado
+é um TokenArray com quatro arrays compactos (código do tipo, início, fim e
+linha), e o valor de cada token (int, float ou str internada) só é criado
+quando pedido.
+
+Compatível token a token com o lexer do PLY (mesmos tipos, valores, linhas e
+posições, inclusive as regras de precedência: // é comentário antes de ser
+divisão, == antes de =, float com ponto antes de inteiro) e com os mesmos
+erros de caractere ilegal. DFALexer adapta o TokenArray à interface
+input()/token() que o parser do PLY usa.
+
+Uso:
+    tokens = tokenize(text)
+    tokens.type_name(0), tokens.value(0), tokens.lines[0]
+    parser.parse(text, lexer=DFALexer(diagnostics))
+"""
+import re
+import sys
+from array import array
+from functools import partial
+
+from ply.lex import LexToken
+
+import lexer as ply_lexer
+from diagnostics import Diagnostic
+
+# Códigos dos tipos: posição em lexer.tokens
+TOKEN_NAMES = tuple(ply_lexer.tokens)
+TOKEN_CODES = {name: code for code, name in enumerate(TOKEN_NAMES)}
+ID = TOKEN_CODES['ID']
+INTEGER = TOKEN_CODES['INTEGER']
+FLOAT = TOKEN_CODES['FLOAT']
+STRING = TOKEN_CODES['STRING']
+DIVIDE = TOKEN_CODES['DIVIDE']
+KEYWORDS = {word: TOKEN_CODES[name] for word, name in ply_lexer.reserved.items()}
+
+# As mesmas expressões das regras de lexer.py (FLOAT e INTEGER num só match)
+ID_RE = re.compile(ply_lexer.t_ID.__doc__)
+NUMBER_RE = re.compile(r'\d+(\.\d+)?')
+STRING_RE = re.compile(ply_lexer.t_STRING.__doc__)
+NEWLINES_RE = re.compile(ply_lexer.t_newline.__doc__)
+BLANKS_RE = re.compile(f"[{ply_lexer.t_ignore}]+")
+
+
+def _operators():
+    # Regras de string de lexer.py (t_PLUS = r'\+', ...): texto -> código
+    operators = {}
+    for name, pattern in vars(ply_lexer).items():
+        if name.startswith('t_') and isinstance(pattern, str) and name != 't_ignore':
+            operators[re.sub(r'\\(.)', r'\1', pattern)] = TOKEN_CODES[name[2:]]
+    return operators
+
+
+OPERATORS = _operators()
+TWO_CHAR_OPERATORS = {text: code for text, code in OPERATORS.items() if len(text) == 2}
+
+# Ações do estado inicial
+BLANK, NEWLINE, LETTER, DIGIT, QUOTE, SLASH, OPERATOR = range(7)
+CHAR_ACTIONS = {}
+CHAR_ACTIONS.update((char, BLANK) for char in ply_lexer.t_ignore)
+CHAR_ACTIONS['\n'] = NEWLINE
+CHAR_ACTIONS.update((chr(code), LETTER) for code in (*range(ord('a'), ord('z') + 1), *range(ord('A'), ord('Z') + 1)))
+CHAR_ACTIONS.update((char, DIGIT) for char in '0123456789')
+CHAR_ACTIONS['"'] = QUOTE
+CHAR_ACTIONS['/'] = SLASH
+CHAR_ACTIONS.update((text[0], OPERATOR) for text in OPERATORS if text != '/')
+
+
+class TokenArray:
+    """Tokens de um texto em arrays paralelos; os valores são criados sob demanda"""
+    def __init__(self, source):
+        self.source = source
+        self.types = array('B')  # Código do tipo (TOKEN_NAMES[código])
+        self.starts = array('l')  # Posição do primeiro caractere (lexpos)
+        self.ends = array('l')    # Posição depois do último
+        self.lines = array('l')   # Linha (lineno)
+        self.errors = []          # (posição, caractere, linha) de cada caractere ilegal
+
+    def __len__(self):
+        return len(self.types)
+
+    def type_name(self, index):
+        return TOKEN_NAMES[self.types[index]]
+
+    def text(self, index):
+        return self.source[self.starts[index]:self.ends[index]]
+
+    def value(self, index):
+        """Valor do token como o lexer do PLY o entrega"""
+        code = self.types[index]
+        text = self.source[self.starts[index]:self.ends[index]]
+        if code == INTEGER:
+            return int(text)
+        if code == FLOAT and text != 'float':  # 'float' também é a palavra reservada
+            return float(text)
+        if code == ID or code in KEYWORD_CODES:
+            return sys.intern(text)
+        return text
+
+    def diagnostics(self):
+        return [Diagnostic('lexer', _illegal_message(char, line), line) for _, char, line in self.errors]
+
+
+KEYWORD_CODES = frozenset(KEYWORDS.values())
+
+
+def _illegal_message(char, line):
+    return f"Caractere ilegal '{char}' na linha {line}"
+
+
+def tokenize(source):
+    """Percorre source uma vez e devolve o TokenArray"""
+    tokens = TokenArray(source)
+    add_type = tokens.types.append
+    add_start = tokens.starts.append
+    add_end = tokens.ends.append
+    add_line = tokens.lines.append
+    errors = tokens.errors
+    actions = CHAR_ACTIONS
+    operators = OPERATORS
+    two_char = TWO_CHAR_OPERATORS
+    keywords = KEYWORDS
+    match_id = ID_RE.match
+    match_number = NUMBER_RE.match
+    match_string = STRING_RE.match
+    match_newlines = NEWLINES_RE.match
+    match_blanks = BLANKS_RE.match
+    find = source.find
+    length = len(source)
+    line = 1
+    pos = 0
+
+    while pos < length:
+        char = source[pos]
+        action = actions.get(char)
+        if action == BLANK:
+            pos = match_blanks(source, pos).end()
+            continue
+        if action == LETTER:
+            end = match_id(source, pos).end()
+            code = keywords.get(source[pos:end], ID)
+        elif action == OPERATOR:
+            code = two_char.get(source[pos:pos + 2])
+            if code is None:
+                code = operators[char]
+                end = pos + 1
+            else:
+                end = pos + 2
+        elif action == NEWLINE:
+            end = match_newlines(source, pos).end()
+            line += end - pos
+            pos = end
+            continue
+        elif action == DIGIT or (action is None and char.isdecimal()):  # \d também aceita dígitos Unicode
+            match = match_number(source, pos)
+            end = match.end()
+            code = INTEGER if match.lastindex is None else FLOAT
+        elif action == SLASH:
+            if source.startswith('/', pos + 1):  # Comentário até o fim da linha
+                end = find('\n', pos)
+                pos = length if end < 0 else end
+                continue
+            code = DIVIDE
+            end = pos + 1
+        else:
+            match = match_string(source, pos) if action == QUOTE else None
+            if match is None:  # Caractere ilegal (ou aspas sem fechamento): pula um caractere
+                errors.append((pos, char, line))
+                pos += 1
+                continue
+            code = STRING
+            end = match.end()
+        add_type(code)
+        add_start(pos)
+        add_end(end)
+        add_line(line)
+        pos = end
+    return tokens
+
+
+class DFALexer:
+    """
+    Interface de lexer do PLY (input/token) sobre tokenize, para o parser.
+    Os caracteres ilegais são reportados na mesma ordem do lexer do PLY,
+    intercalados com os erros sintáticos: cada um quando o parser pede o
+    primeiro token depois dele. Vão para diagnostics ou, sem lista, são
+    impressos.
+    """
+    def __init__(self, diagnostics=None):
+        self.diagnostics = diagnostics
+        self.tokens = None
+        self.lineno = 1
+
+    def input(self, data):
+        self.tokens = tokenize(data)
+        # token() é o next de um gerador: sem despacho de método nem estado em atributos por token
+        self.token = partial(next, self._lex_tokens(), None)
+
+    def token(self):
+        return None
+
+    def _lex_tokens(self):
+        tokens = self.tokens
+        types, starts, lines, value = tokens.types, tokens.starts, tokens.lines, tokens.value
+        errors = tokens.errors
+        next_error = errors[0][0] if errors else len(tokens.source)
+        error_index = 0
+        for index in range(len(tokens)):
+            position = starts[index]
+            while next_error < position:
+                self._report(*errors[error_index])
+                error_index += 1
+                next_error = errors[error_index][0] if error_index < len(errors) else len(tokens.source)
+            tok = LexToken()
+            tok.type = TOKEN_NAMES[types[index]]
+            tok.value = value(index)
+            tok.lineno = self.lineno = lines[index]
+            tok.lexpos = position
+            tok.lexer = self
+            yield tok
+        for error in errors[error_index:]:
+            self._report(*error)
+
+    def _report(self, position, char, line):
+        message = _illegal_message(char, line)
+        if self.diagnostics is None:
+            print(message)
+        else:
+            self.diagnostics.append(Diagnostic('lexer', message, line))
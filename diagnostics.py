@@ -0,0 +1,30 @@
+"""
+Diagnósticos do compilador como dados, para quem usa o compilador como
+biblioteca (compiler_api.compile_source) em vez de ler a saída impressa.
+
+Fases (stage): 'lexer', 'parser', 'semantic', 'tac', 'optimizer', 'backend'.
+Gravidade (severity): 'error' ou 'warning'.
+"""
+
+
+class Diagnostic:
+    __slots__ = ('stage', 'message', 'line', 'severity')
+
+    def __init__(self, stage, message, line=None, severity='error'):
+        self.stage = stage
+        self.message = message
+        self.line = line          # Linha do fonte, ou None quando a fase não a conhece
+        self.severity = severity
+
+    @property
+    def is_error(self):
+        return self.severity == 'error'
+
+    def as_dict(self):
+        return {'stage': self.stage, 'severity': self.severity, 'line': self.line, 'message': self.message}
+
+    def __str__(self):
+        return self.message
+
+    def __repr__(self):
+        return f"Diagnostic({self.stage!r}, {self.message!r}, line={self.line!r}, severity={self.severity!r})"
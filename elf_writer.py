@@ -0,0 +1,103 @@
+"""
+Escrita de executáveis ELF32 estáticos (i386, Linux) a partir do código montado
+por x86_encoder, sem nasm nem ld.
+
+Layout do arquivo:
+    cabeçalho ELF, 2 cabeçalhos de programa, .text   -> segmento R+X em BASE_ADDRESS
+    .data (e .bss, só na memória)                   -> segmento R+W na página seguinte
+
+O executável não tem tabela de seções nem de símbolos: o kernel só precisa dos
+cabeçalhos de programa para carregá-lo.
+
+O runtime é montado uma única vez por processo (por caminho e data de
+modificação) e cada compilação só monta o código gerado sobre uma cópia dele.
+O cache é protegido por um lock: build_executable pode ser chamada de várias
+threads ao mesmo tempo.
+"""
+import os
+import struct
+import threading
+
+from x86_encoder import Assembler
+
+BASE_ADDRESS = 0x08048000
+PAGE_SIZE = 0x1000
+
+ELF_HEADER_SIZE = 52
+PROGRAM_HEADER_SIZE = 32
+HEADERS_SIZE = ELF_HEADER_SIZE + 2 * PROGRAM_HEADER_SIZE
+
+ET_EXEC, EM_386, EV_CURRENT = 2, 3, 1
+PT_LOAD = 1
+PF_X, PF_W, PF_R = 1, 2, 4
+
+_runtimes = {}  # (caminho, mtime) -> Assembler com o runtime já montado
+_runtimes_lock = threading.Lock()
+
+
+def _align(value, alignment):
+    return value + -value % alignment
+
+
+def layout(text_size, data_size):
+    """Endereços de .text, .data e .bss e a posição de .data no arquivo"""
+    text_address = BASE_ADDRESS + HEADERS_SIZE
+    data_offset = _align(HEADERS_SIZE + text_size, 16)
+    # Página própria para os dados, com o mesmo deslocamento dentro da página que no arquivo
+    data_address = _align(BASE_ADDRESS + data_offset, PAGE_SIZE) + data_offset % PAGE_SIZE
+    bss_address = _align(data_address + data_size, 16)
+    return {'.text': text_address, '.data': data_address, '.bss': bss_address}, data_offset
+
+
+def _runtime_assembler(runtime):
+    key = (runtime, os.path.getmtime(runtime))
+    with _runtimes_lock:
+        assembler = _runtimes.get(key)
+        if assembler is None:
+            assembler = Assembler()
+            with open(runtime) as f:
+                assembler.assemble(f.read())
+            _runtimes.clear()
+            _runtimes[key] = assembler
+    return assembler.copy()
+
+
+def build_executable(sources, runtime=None, entry='_start'):
+    """Monta o runtime (um arquivo .asm, opcional) e as unidades em sources e devolve o conteúdo do executável"""
+    assembler = _runtime_assembler(runtime) if runtime else Assembler()
+    for source in sources:
+        assembler.assemble(source)
+
+    text_size = len(assembler.sections['.text'])
+    data_size = len(assembler.sections['.data'])
+    addresses, data_offset = layout(text_size, data_size)
+    entry_address = assembler.symbol_address(entry, addresses)
+    text, data = assembler.link(addresses)
+    memory_size = addresses['.bss'] + assembler.bss_size - addresses['.data']
+
+    header = struct.pack(
+        '<4sBBBB8xHHIIIIIHHHHHH',
+        b'\x7fELF', 1, 1, 1, 0,  # ELFCLASS32, little-endian, versão 1, System V
+        ET_EXEC, EM_386, EV_CURRENT, entry_address,
+        ELF_HEADER_SIZE, 0, 0,   # Cabeçalhos de programa logo após; sem seções
+        ELF_HEADER_SIZE, PROGRAM_HEADER_SIZE, 2, 0, 0, 0
+    )
+    text_segment = struct.pack(
+        '<IIIIIIII', PT_LOAD, 0, BASE_ADDRESS, BASE_ADDRESS,
+        HEADERS_SIZE + text_size, HEADERS_SIZE + text_size, PF_R | PF_X, PAGE_SIZE
+    )
+    data_segment = struct.pack(
+        '<IIIIIIII', PT_LOAD, data_offset, addresses['.data'], addresses['.data'],
+        data_size, memory_size, PF_R | PF_W, PAGE_SIZE
+    )
+    padding = b'\x00' * (data_offset - HEADERS_SIZE - text_size)
+    return header + text_segment + data_segment + text + padding + data
+
+
+def write_executable(path, sources, runtime=None, entry='_start'):
+    """Monta runtime e sources e grava o executável em path (com permissão de execução)"""
+    content = build_executable(sources, runtime, entry)
+    with open(path, 'wb') as f:
+        f.write(content)
+    os.chmod(path, 0o755)
+    return path
@@ -1,4 +1,8 @@
+import sys
+
 from ply import lex
+import table_cache
+from diagnostics import Diagnostic
 
 # Lista de tokens
 tokens = [
@@ -58,6 +62,8 @@ t_SEMICOLON = r';'
 # Regra para identificadores
 def t_ID(t):
     r'[a-zA-Z][a-zA-Z0-9_]*'
+    # Internado: as comparações e buscas em dict pelo nome viram comparação de ponteiro
+    t.value = sys.intern(t.value)
     t.type = reserved.get(t.value, 'ID')
     return t
 
@@ -86,9 +92,15 @@ def t_newline(t):
     r'\n+'
     t.lexer.lineno += len(t.value)
 
-# Tratamento de erros
+# Tratamento de erros: os clones criados por new_lexer guardam o erro na sua
+# lista de diagnósticos; o lexer do módulo imprime
 def t_error(t):
-    print(f"Caractere ilegal '{t.value[0]}' na linha {t.lineno}")
+    message = f"Caractere ilegal '{t.value[0]}' na linha {t.lineno}"
+    diagnostics = getattr(t.lexer, 'diagnostics', None)
+    if diagnostics is None:
+        print(message)
+    else:
+        diagnostics.append(Diagnostic('lexer', message, t.lineno))
     t.lexer.skip(1)
 
 # Comentários de uma linha
@@ -96,5 +108,13 @@ def t_COMMENT(t):
     r'//.*'
     pass
 
-# Criação do lexer
-lexer = lex.lex() 
\ No newline at end of file
+# Criação do lexer (tabela em cache, ver table_cache.py)
+lexer = lex.lex(**table_cache.lexer_options(globals())) 
+
+def new_lexer(diagnostics):
+    """Lexer próprio de uma compilação: clone do lexer do módulo (as tabelas são
+    compartilhadas; a posição, a linha e os diagnósticos não)"""
+    clone = lexer.clone()
+    clone.lineno = 1
+    clone.diagnostics = diagnostics
+    return clone
@@ -0,0 +1,325 @@
+"""
+Otimizações de laço sobre o TAC: movimentação de código invariante (LICM) e
+redução de força das variáveis de indução.
+
+Os laços naturais vêm das arestas de retorno do CFG (o goto para o label de
+início que TACGenerator.visit_While emite). Cada laço precisa de um
+pré-cabeçalho: um bloco que cai no cabeçalho e é a única entrada de fora do
+laço. Normalmente é o bloco anterior ao cabeçalho; quando esse bloco também
+desvia para outro lugar (um while que é o primeiro comando do corpo de um
+while ou de um if, logo depois do if not), um bloco novo é criado na aresta,
+e só se houver algo a pôr nele: um bloco vazio seria um goto a mais por entrada.
+Só ficam de fora os laços com mais de uma entrada de fora ou em que a entrada
+é um desvio para o cabeçalho, que o TACGenerator não gera.
+
+Invariantes: uma operação pura cujo resultado é um temporário (definido uma
+única vez) e cujos operandos são literais, não são definidos dentro do laço ou
+são temporários já movidos é levada para o pré-cabeçalho. Como o corpo de um
+while pode não executar, só são movidas operações que não podem falhar (uma
+divisão só com divisor literal diferente de 0 e -1).
+
+Variáveis de indução: uma variável int i com uma única definição no laço, na
+forma 'i = i + c' ou 'i = i - c' (c literal inteiro), é uma variável de indução
+básica. Cada 't = i * k' (k literal inteiro) no laço passa a ler uma nova
+variável s, iniciada com i * k no pré-cabeçalho e incrementada de c * k logo
+após cada atualização de i, trocando a multiplicação por uma soma. Um float
+fica de fora: somar c * k a cada volta não arredonda como calcular i * k, e a
+saída mudaria. A iniciação custa uma multiplicação por entrada no laço, então
+i precisa ser atualizada no próprio laço, fora de um laço interno (senão não
+avança uma vez por volta dele), e o laço precisa ser o mais externo (entra-se
+nele uma vez) ou i receber um valor no bloco de entrada, logo antes do laço:
+num laço interno cuja variável não é reiniciada, as voltas se repartem entre
+as entradas e a iniciação pode custar mais que as multiplicações que economiza.
+
+Os laços são processados do mais interno para o mais externo, então o que sai
+de um laço interno ainda pode sair do externo. As contagens de definições e
+usos de cada operando são atualizadas a cada instrução criada, trocada ou
+removida, para valerem também para o código que os laços internos geraram.
+A posição de cada bloco na ordem do programa é calculada uma vez: os blocos de
+um laço são ordenados por ela, sem percorrer o programa todo a cada laço.
+"""
+from cfg import BasicBlock, ControlFlowGraph
+from tac import Op, Quad, var, literal, BINARY_OPCODES, JUMP_OPS, UNARY_OPCODES
+
+PURE_OPS = BINARY_OPCODES | UNARY_OPCODES | {Op.COPY}
+
+
+class Loop:
+    def __init__(self, header):
+        self.header = header
+        self.blocks = {header.index}  # Índices dos blocos do laço
+        self.latches = []
+
+    def __repr__(self):
+        return f"Loop(B{self.header.index}, {len(self.blocks)} blocos)"
+
+
+def natural_loops(cfg):
+    """Laços naturais, um por cabeçalho, do mais interno para o mais externo"""
+    loops = {}
+    for source, header in cfg.back_edges():
+        loop = loops.get(header.index)
+        if loop is None:
+            loop = loops[header.index] = Loop(header)
+        loop.latches.append(source)
+        # Blocos que alcançam a origem da aresta sem passar pelo cabeçalho
+        stack = [source]
+        while stack:
+            block = stack.pop()
+            if block.index in loop.blocks:
+                continue
+            loop.blocks.add(block.index)
+            stack.extend(block.predecessors)
+    return sorted(loops.values(), key=lambda loop: len(loop.blocks))
+
+
+def _is_int_literal(operand):
+    return operand.is_literal and isinstance(operand.value, int) and not isinstance(operand.value, bool)
+
+
+class LoopOptimizer:
+    def __init__(self):
+        self.loops = 0
+        self.hoisted = 0
+        self.reduced = 0
+        self.induction_vars = 0
+
+    def run(self, instructions):
+        cfg = ControlFlowGraph(instructions)
+        self.declarations = []
+        # Quantas vezes cada operando é definido e lido no programa todo
+        self.definitions = {}
+        self.uses = {}
+        for instr in instructions:
+            self._count(instr, 1)
+
+        self.original_blocks = cfg.blocks[:]
+        self.created = {}  # Índice do cabeçalho -> pré-cabeçalho criado antes dele
+        # Posição na ordem do programa; um pré-cabeçalho criado fica logo antes do cabeçalho
+        self.position = {block.index: (position, 1) for position, block in enumerate(self.original_blocks)}
+        loops = natural_loops(cfg)
+        self.innermost = {}  # Índice do bloco -> cabeçalho do laço mais interno que o contém
+        for loop in loops:
+            for index in loop.blocks:
+                self.innermost.setdefault(index, loop.header)
+        for loop in loops:
+            entry = self._entry(loop)
+            if entry is None:
+                continue
+            self.loops += 1
+            blocks = self._loop_blocks(cfg, loop)
+            hoisted = self._hoist_invariants(blocks)
+            hoisted.extend(self._reduce_strength(loop, blocks, entry))
+            if hoisted:
+                preheader = entry if entry.successors == [loop.header] else self._create_preheader(cfg, loop, entry)
+                # O pré-cabeçalho cai no cabeçalho; um goto final, se houver, continua no fim
+                last = preheader.instructions[-1] if preheader.instructions else None
+                position = len(preheader.instructions) - (last is not None and last.op == Op.GOTO)
+                preheader.instructions[position:position] = hoisted
+
+        return self.declarations + [instr for block in self._program_order() for instr in block.instructions]
+
+    def _program_order(self):
+        """Blocos na ordem do programa, cada pré-cabeçalho criado antes do seu cabeçalho"""
+        for block in self.original_blocks:
+            created = self.created.get(block.index)
+            if created is not None:
+                yield created
+            yield block
+
+    def _loop_blocks(self, cfg, loop):
+        """Blocos do laço na ordem do programa, com os pré-cabeçalhos criados para laços internos"""
+        blocks = []
+        for index in loop.blocks:
+            blocks.append(cfg.blocks[index])
+            created = self.created.get(index)
+            # O pré-cabeçalho de um laço interno pertence ao laço se a aresta em que está pertence
+            if created is not None and created.predecessors[0].index in loop.blocks:
+                blocks.append(created)
+        blocks.sort(key=lambda block: self.position[block.index])
+        return blocks
+
+    def _count(self, instr, delta):
+        """Soma delta às contagens de definições e usos dos operandos de instr"""
+        defined = instr.defines()
+        if defined is not None:
+            self.definitions[defined] = self.definitions.get(defined, 0) + delta
+        for operand in instr.uses():
+            self.uses[operand] = self.uses.get(operand, 0) + delta
+
+    def _entry(self, loop):
+        """O único bloco de fora que cai no cabeçalho, ou None se o laço não pode ter pré-cabeçalho"""
+        header = loop.header
+        outside = [pred for pred in header.predecessors if pred.index not in loop.blocks]
+        if len(outside) != 1:
+            return None
+        entry = outside[0]
+        last = entry.instructions[-1] if entry.instructions else None
+        if last is not None and last.op in JUMP_OPS and last.result == header.label:
+            return None  # Entra por um desvio, não caindo no cabeçalho
+        return entry
+
+    def _create_preheader(self, cfg, loop, entry):
+        # O bloco de entrada termina num if not que cai no cabeçalho: um bloco
+        # vazio na aresta passa a ser o pré-cabeçalho, posto antes do cabeçalho
+        header = loop.header
+        preheader = BasicBlock(len(cfg.blocks))
+        cfg.blocks.append(preheader)
+        self.created[header.index] = preheader
+        self.position[preheader.index] = (self.position[header.index][0], 0)
+        entry.successors[entry.successors.index(header)] = preheader
+        header.predecessors[header.predecessors.index(entry)] = preheader
+        preheader.predecessors.append(entry)
+        preheader.successors.append(header)
+        return preheader
+
+    def _hoist_invariants(self, blocks):
+        defined_in_loop = set()
+        for block in blocks:
+            for instr in block.instructions:
+                defined = instr.defines()
+                if defined is not None:
+                    defined_in_loop.add(defined)
+
+        def invariant(operand):
+            return operand.is_literal or operand not in defined_in_loop
+
+        hoisted = []
+        changed = True
+        while changed:
+            changed = False
+            for block in blocks:
+                kept = []
+                for instr in block.instructions:
+                    if self._can_hoist(instr) and all(invariant(operand) for operand in instr.uses()):
+                        hoisted.append(instr)
+                        defined_in_loop.discard(instr.result)
+                        self.hoisted += 1
+                        changed = True
+                    else:
+                        kept.append(instr)
+                block.instructions = kept
+        return hoisted
+
+    def _can_hoist(self, instr):
+        if instr.op not in PURE_OPS or not instr.result.is_temp:
+            return False
+        if self.definitions.get(instr.result) != 1:
+            return False
+        if instr.op == Op.DIV:
+            # Executar uma divisão que o laço talvez não fizesse não pode gerar erro
+            return _is_int_literal(instr.arg2) and instr.arg2.value not in (0, -1)
+        return True
+
+    def _basic_induction_vars(self, blocks):
+        """Variável -> (passo com sinal, bloco e posição da atualização)"""
+        definitions = {}  # Operando -> lista de (bloco, posição)
+        producers = {}    # Temporário -> instrução que o define no laço
+        for block in blocks:
+            for position, instr in enumerate(block.instructions):
+                defined = instr.defines()
+                if defined is None:
+                    continue
+                definitions.setdefault(defined, []).append((block, position))
+                if defined.is_temp:
+                    producers[defined] = instr
+
+        induction = {}
+        for operand, places in definitions.items():
+            if not operand.is_var or operand.type != 'int' or len(places) != 1:
+                continue
+            block, position = places[0]
+            update = block.instructions[position]
+            if update.op != Op.COPY or update.arg1 not in producers:
+                continue
+            step = producers[update.arg1]
+            if step.op == Op.ADD and step.arg1 == operand and _is_int_literal(step.arg2):
+                induction[operand] = (step.arg2.value, block, position)
+            elif step.op == Op.ADD and step.arg2 == operand and _is_int_literal(step.arg1):
+                induction[operand] = (step.arg1.value, block, position)
+            elif step.op == Op.SUB and step.arg1 == operand and _is_int_literal(step.arg2):
+                induction[operand] = (-step.arg2.value, block, position)
+        return induction
+
+    def _reduce_strength(self, loop, blocks, entry):
+        # Só as variáveis atualizadas fora dos laços internos e, num laço interno,
+        # reiniciadas a cada entrada nele
+        outermost = entry.index not in self.innermost
+        reset = {instr.defines() for instr in entry.instructions}
+        induction = {base: update for base, update in self._basic_induction_vars(blocks).items()
+                     if self.innermost.get(update[1].index) is loop.header and (outermost or base in reset)}
+        if not induction:
+            return []
+
+        reduced = {}  # (variável de indução, fator) -> nova variável
+        for block in blocks:
+            for position, instr in enumerate(block.instructions):
+                # Só produtos em temporários: 's = i * k' numa variável é a iniciação
+                # de uma variável de indução derivada (posta no pré-cabeçalho por
+                # um laço interno), que não pode sumir
+                if instr.op != Op.MUL or not instr.result.is_temp:
+                    continue
+                if instr.arg1 in induction and _is_int_literal(instr.arg2):
+                    base, factor = instr.arg1, instr.arg2.value
+                elif instr.arg2 in induction and _is_int_literal(instr.arg1):
+                    base, factor = instr.arg2, instr.arg1.value
+                else:
+                    continue
+                key = (base, factor)
+                if key not in reduced:
+                    reduced[key] = var(f"_iv{len(self.declarations)}", instr.result.type)
+                    self.declarations.append(Quad(Op.DECLARE, reduced[key]))
+                    self.induction_vars += 1
+                step, update_block, update = induction[base]
+                end = update if update_block is block and update > position else len(block.instructions)
+                self._count(instr, -1)
+                if self._replace_uses(block, position + 1, end, instr.result, reduced[key]):
+                    block.instructions[position] = None  # Removida depois de inserir os incrementos
+                else:
+                    block.instructions[position] = Quad(Op.COPY, instr.result, reduced[key])
+                    self._count(block.instructions[position], 1)
+                self.reduced += 1
+
+        # Incrementos logo após a atualização de cada variável de indução,
+        # da última posição para a primeira para não deslocar as seguintes
+        updates = []
+        for (base, factor), derived in reduced.items():
+            step, block, position = induction[base]
+            delta = step * factor
+            op = Op.ADD if delta >= 0 else Op.SUB
+            updates.append((block.index, position, block, Quad(op, derived, derived, literal(abs(delta)))))
+        updates.sort(key=lambda update: (update[0], update[1]), reverse=True)
+        for _, position, block, increment in updates:
+            block.instructions.insert(position + 1, increment)
+            self._count(increment, 1)
+        for block in blocks:
+            block.instructions = [instr for instr in block.instructions if instr is not None]
+
+        initializations = [Quad(Op.MUL, derived, base, literal(factor)) for (base, factor), derived in reduced.items()]
+        for instr in initializations:
+            self._count(instr, 1)
+        return initializations
+
+    def _replace_uses(self, block, start, end, old, new):
+        """
+        Troca old por new nas instruções block.instructions[start:end], se todos
+        os usos de old no programa estiverem nesse trecho (antes da atualização
+        da variável de indução, então new ainda tem o mesmo valor)
+        """
+        region = block.instructions[start:end]
+        found = sum(instr.uses().count(old) for instr in region if instr is not None)
+        if found != self.uses.get(old, 0):
+            return False
+        for offset, instr in enumerate(region):
+            if instr is not None and old in instr.uses():
+                arg1 = new if instr.arg1 == old else instr.arg1
+                arg2 = new if instr.arg2 == old else instr.arg2
+                replacement = Quad(instr.op, instr.result, arg1, arg2)
+                self._count(instr, -1)
+                self._count(replacement, 1)
+                block.instructions[start + offset] = replacement
+        return True
+
+    def report(self):
+        return (f"Otimização de laços: {self.loops} laços, {self.hoisted} instruções invariantes movidas, "
+                f"{self.reduced} multiplicações reduzidas a somas ({self.induction_vars} variáveis de indução)")
@@ -1,8 +1,24 @@
+import argparse
+import contextlib
+import io
+import json
+import os
 import subprocess
-from nasm_generator import NASMGenerator
-from parser import CodeGenerator, TACGenerator, parse_file
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from artifact_cache import ArtifactCache, DEFAULT_CACHE_DIR
+from elf_writer import write_executable
+from nasm_generator import RUNTIMES
+from optimizer import optimize_tac
+from parser import CodeGenerator, TACGenerator, count_nodes, parse_file
+from pass_stats import PassStats, count_temps, merge_stats
+from peephole import PeepholeOptimizer
+from python_backend import PythonBackendError, PythonGenerator
 
 from semantic_analyzer import SemanticAnalyzer
+from targets import ROOT, TARGETS
+from vm import BytecodeCompiler, VMError, execute
 
 
 def analyze_file(filename):
@@ -27,65 +43,380 @@ def analyze_file(filename):
 
     except Exception as e:
         print(f"Erro ao processar arquivo: {str(e)}")
-        
-def compile_to_nasm(input_file, output_file):
+
+# nasm + gcc/ld, ou o montador e o escritor de ELF em processo (só x86 com o runtime freestanding)
+ASSEMBLERS = ('nasm', 'direct')
+
+# Execução em processo (--run): VM de bytecode sobre o TAC ou Python gerado a partir da AST
+RUN_ENGINES = ('vm', 'python')
+
+def _phase(stats, name):
+    """Fase medida em stats (--time-passes/--stats); sem stats, um bloco comum"""
+    return stats.phase(name) if stats is not None else contextlib.nullcontext()
+
+def _run(stats, args):
+    """Executa uma ferramenta externa (nasm, gcc, ld), registrando a duração em stats"""
+    if stats is not None:
+        return stats.run(args, check=True)
+    return subprocess.run(args, check=True)
+
+def build_runtime(output_dir, target='x86', stats=None):
+    """Monta o runtime do alvo em output_dir, se ainda não estiver atualizado. Retorna o caminho do objeto."""
+    source = os.path.join(ROOT, TARGETS[target]['runtime'])
+    obj_file = os.path.join(output_dir, os.path.splitext(TARGETS[target]['runtime'])[0] + '.o')
+    if (os.path.exists(obj_file)
+            and os.path.getmtime(obj_file) >= os.path.getmtime(source)):
+        return obj_file
+    # Monta num arquivo temporário e renomeia: no modo em lote vários processos podem montar ao mesmo tempo
+    tmp_file = f"{obj_file}.{os.getpid()}"
+    _run(stats, ['nasm', '-f', TARGETS[target]['format'], source, '-o', tmp_file])
+    os.replace(tmp_file, obj_file)
+    return obj_file
+
+def generate_ast(input_file, stats=None):
+    """Parse e análise semântica. Retorna a AST ou None."""
     # Parse o arquivo fonte
-    ast = parse_file(input_file)
-    
+    ast = parse_file(input_file, stats)
+    if ast is None:
+        return None
+    if stats is not None:
+        stats.count('ast_nodes', count_nodes(ast))
+
     # Análise semântica
     analyzer = SemanticAnalyzer()
-    success, errors = analyzer.analyze(ast)
-    
+    with _phase(stats, 'semantic'):
+        success, errors = analyzer.analyze(ast)
+
     if not success:
         print("Erros semânticos encontrados:")
         for error in errors:
             print(f"- {error}")
-        return
-        
+        return None
+    return ast
+
+def generate_tac(input_file, optimize=True, stats=None, int_bits=32):
+    """
+    Frontend: parse, análise semântica, TAC e otimizações. Retorna as instruções ou None.
+    int_bits é a largura dos int do alvo (as constantes são dobradas com ela).
+    """
+    ast = generate_ast(input_file, stats)
+    if ast is None:
+        return None
+
     # Gera TAC
     tac_gen = TACGenerator()
-    ast.generate_tac(tac_gen)
-    
+    with _phase(stats, 'tac'):
+        ast.generate_tac(tac_gen)
+    instructions = tac_gen.instructions
+    if stats is not None:
+        stats.count('tac_instructions', len(instructions))
+
+    if optimize:
+        # Otimizações sobre o TAC
+        with _phase(stats, 'optimizer'):
+            instructions, passes = optimize_tac(instructions, int_bits)
+        for optimization in passes:
+            print(optimization.report())
+        if stats is not None:
+            stats.count('tac_optimized', len(instructions))
+    if stats is not None:
+        stats.count('temps', count_temps(instructions))
+    return instructions
+
+def compile_to_nasm(input_file, output_file, output_dir='output', cache=None, optimize=True, runtime='libc',
+                    target='x86', assembler='nasm', stats=None):
+    """
+    Compila input_file até o executável output_dir/output_file. Retorna o caminho do executável ou None.
+    Com stats (pass_stats.PassStats) mede cada fase, conta tokens, nós, instruções e linhas do
+    assembly e registra a duração do nasm e do gcc/ld.
+    """
+    freestanding = runtime == 'freestanding'
+    direct = assembler == 'direct'
+    if direct and (target != 'x86' or not freestanding):
+        print("Erro: a emissão direta só suporta o alvo x86 com o runtime freestanding")
+        return None
+    options = TARGETS[target]
+    backend_options = {'target': target, 'format': options['format'],
+                       'link': options['ld'] if freestanding else options['link'], 'runtime': runtime,
+                       'assembler': assembler}
+    instructions = None
+    backend_key = None
+
+    if cache is not None:
+        try:
+            with open(input_file, 'rb') as f:
+                source = f.read()
+        except OSError:
+            source = None  # O erro é reportado pelo parse_file
+        if source is not None:
+            with _phase(stats, 'cache'):
+                frontend_key = cache.frontend_key(source, {'optimize': optimize,
+                                                           'int_bits': options['generator'].int_bits})
+                backend_key = cache.backend_key(frontend_key, backend_options)
+
+                # Programa inalterado: reaproveita o executável
+                exe_file = cache.fetch_executable(backend_key, output_dir, output_file)
+                if not exe_file:
+                    # Apenas o backend mudou: reaproveita o TAC
+                    instructions = cache.load_tac(frontend_key)
+            if exe_file:
+                print(f"Executável obtido do cache: {exe_file}")
+                return exe_file
+        else:
+            cache = None
+
+    if instructions is None:
+        instructions = generate_tac(input_file, optimize, stats, options['generator'].int_bits)
+        if instructions is None:
+            return None
+        if cache is not None:
+            cache.store_tac(frontend_key, instructions)
+
     # Gera código NASM
-    nasm_gen = NASMGenerator()
-    nasm_code = nasm_gen.generate_nasm(tac_gen.instructions)
-    
+    nasm_gen = options['generator'](runtime=runtime)
+    with _phase(stats, 'codegen'):
+        nasm_code = nasm_gen.generate_nasm(instructions)
+
+    # Otimização peephole sobre o assembly
+    peephole = PeepholeOptimizer(target)
+    with _phase(stats, 'peephole'):
+        nasm_code = peephole.optimize(nasm_code)
+    print(peephole.report())
+    if stats is not None:
+        stats.count('asm_lines', nasm_code.count('\n') + 1)
+
+    if direct:
+        with _phase(stats, 'assembler'):
+            return _emit_executable(nasm_code, output_file, output_dir, target, cache, backend_key)
+
     # Salva o código NASM
     asm_file = output_file + '.asm'
-    nasm_gen.save_to_file(asm_file, nasm_code)
-    asm_file = 'output/' + asm_file
-    
+    nasm_gen.save_to_file(asm_file, nasm_code, output_dir)
+    asm_file = os.path.join(output_dir, asm_file)
+
     # Compila o código NASM para um executável
-    obj_file = 'output/' + output_file + '.o'
-    exe_file = 'output/' + output_file
-    
+    obj_file = os.path.join(output_dir, output_file + '.o')
+    exe_file = os.path.join(output_dir, output_file)
+
     try:
-        # Compila o arquivo assembly para objeto
-        subprocess.run(['nasm', '-f', 'elf32', asm_file, '-o', obj_file], check=True)
-        
-        # Liga o arquivo objeto para criar o executável
-        # Modificado para incluir a libc e usar gcc como linker
-        subprocess.run([
-            'gcc',
-            '-m32',
-            obj_file,
-            '-o', 
-            exe_file,
-            '-no-pie'  # Desabilita PIE para compatibilidade
-        ], check=True)
-        
+        with _phase(stats, 'toolchain'):
+            # Compila o arquivo assembly para objeto
+            _run(stats, ['nasm', '-f', options['format'], asm_file, '-o', obj_file])
+
+            # Liga o arquivo objeto para criar o executável
+            if freestanding:
+                # _start e as rotinas de E/S vêm do runtime, sem libc
+                runtime_obj = build_runtime(output_dir, target, stats)
+                _run(stats, ['ld', *options['ld'], obj_file, runtime_obj, '-o', exe_file])
+            else:
+                # Modificado para incluir a libc e usar gcc como linker
+                _run(stats, ['gcc', *options['link'], obj_file, '-o', exe_file])
+
+        if cache is not None:
+            cache.store_executable(backend_key, asm_file, obj_file, exe_file)
+
         print(f"Executável gerado com sucesso: {exe_file}")
-        
+        return exe_file
+
     except subprocess.CalledProcessError as e:
         print(f"Erro ao compilar: {str(e)}")
     except Exception as e:
         print(f"Erro: {str(e)}")
+    return None
+
+def _emit_executable(nasm_code, output_file, output_dir, target, cache, backend_key):
+    """Monta o código e o runtime em memória e grava o executável, sem arquivos intermediários"""
+    exe_file = os.path.join(output_dir, output_file)
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        write_executable(exe_file, [nasm_code], os.path.join(ROOT, TARGETS[target]['runtime']))
+    except Exception as e:
+        print(f"Erro: {str(e)}")
+        return None
+
+    if cache is not None:
+        cache.store_executable(backend_key, None, None, exe_file)
+
+    print(f"Executável gerado com sucesso: {exe_file}")
+    return exe_file
+
+def run_program(input_file, optimize=True, engine='vm', stats=None, target='x86'):
+    """Executa input_file na VM de bytecode ou como Python, sem toolchain. Retorna o status de saída."""
+    # Relatórios e erros de compilação vão para stderr: stdout é a saída do programa
+    with contextlib.redirect_stdout(sys.stderr):
+        if engine == 'python':
+            ast = generate_ast(input_file, stats)
+            if ast is None:
+                return 1
+            try:
+                with _phase(stats, 'codegen'):
+                    main = PythonGenerator(TARGETS[target]['generator'].int_bits).compile(ast, input_file)
+            except PythonBackendError as e:
+                print(f"Erro: o backend Python não compila o programa: {str(e)}")
+                return 1
+        else:
+            # Os int da VM têm a largura dos do executável do alvo
+            int_bits = TARGETS[target]['generator'].int_bits
+            instructions = generate_tac(input_file, optimize, stats, int_bits)
+            if instructions is None:
+                return 1
+            compiler = BytecodeCompiler(int_bits=int_bits)
+            with _phase(stats, 'codegen'):
+                bytecode = compiler.compile(instructions)
+            print(compiler.report())
+    try:
+        with _phase(stats, 'execute'):
+            if engine == 'python':
+                main(sys.stdin, sys.stdout)
+            else:
+                execute(bytecode)
+    except ZeroDivisionError:
+        print("Erro de execução: divisão por zero", file=sys.stderr)
+        return 1
+    except VMError as e:
+        print(f"Erro de execução: {str(e)}", file=sys.stderr)
+        return 1
+    return 0
+
+def collect_sources(paths):
+    """Expande diretórios em arquivos .lps, mantendo a ordem dos argumentos"""
+    sources = []
+    for path in paths:
+        if os.path.isdir(path):
+            sources.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path) if name.endswith('.lps')
+            ))
+        else:
+            sources.append(path)
+    return sources
+
+def output_names(sources):
+    """Nome de saída único por arquivo (o nome base, com sufixo em caso de conflito)"""
+    names = []
+    used = set()
+    for source in sources:
+        base = os.path.splitext(os.path.basename(source))[0]
+        name = base
+        suffix = 1
+        while name in used:
+            name = f"{base}_{suffix}"
+            suffix += 1
+        used.add(name)
+        names.append(name)
+    return names
+
+def _compile_worker(input_file, output_file, output_dir, cache_dir, optimize, runtime, target, assembler,
+                    stats_mode=None):
+    # Cada processo do pool importa parser/lexer uma única vez e os reaproveita
+    log = io.StringIO()
+    stats = PassStats(memory=stats_mode == 'memory') if stats_mode else None
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(log):
+        try:
+            cache = ArtifactCache(cache_dir) if cache_dir else None
+            exe_file = compile_to_nasm(input_file, output_file, output_dir, cache, optimize, runtime, target,
+                                       assembler, stats)
+        except Exception as e:
+            print(f"Erro ao processar arquivo: {str(e)}")
+            exe_file = None
+    elapsed = time.perf_counter() - start
+    return input_file, exe_file, elapsed, log.getvalue(), stats.as_dict() if stats else None
+
+def compile_batch(sources, output_dir='output', jobs=None, cache_dir=None, optimize=True, runtime='libc',
+                  target='x86', assembler='nasm', stats_mode=None):
+    """
+    Compila vários arquivos em paralelo. Retorna a lista de (arquivo, executável, tempo, log, stats).
+    stats_mode 'time' ou 'memory' instrumenta cada compilação (stats é o PassStats.as_dict dela).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    names = output_names(sources)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [
+            pool.submit(_compile_worker, source, name, output_dir, cache_dir, optimize, runtime, target,
+                        assembler, stats_mode)
+            for source, name in zip(sources, names)
+        ]
+        return [future.result() for future in futures]
+
+def print_batch_summary(results, elapsed):
+    width = max((len(source) for source, *_ in results), default=0)
+    failed = 0
+    for source, exe_file, file_time, log, _ in results:
+        status = "OK" if exe_file else "ERRO"
+        if not exe_file:
+            failed += 1
+        print(f"{source:<{width}}  {status:<4}  {file_time * 1000:8.1f} ms  {exe_file or ''}")
+        if not exe_file:
+            for line in log.strip().splitlines():
+                print(f"    {line}")
+    print(f"\n{len(results) - failed}/{len(results)} compilados com sucesso em {elapsed:.2f} s")
 
 if __name__ == "__main__":
-    import sys
+    arg_parser = argparse.ArgumentParser(
+        description="Compilador LPMS. Com um único arquivo, mostra a análise e gera output/output; "
+                    "com vários arquivos ou um diretório, compila em lote."
+    )
+    arg_parser.add_argument('sources', nargs='+', help="arquivos .lps ou diretórios")
+    arg_parser.add_argument('-j', '--jobs', type=int, default=None,
+                            help="número de processos no modo em lote (padrão: número de CPUs)")
+    arg_parser.add_argument('-o', '--output-dir', default='output', help="diretório dos artefatos")
+    arg_parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help="diretório do cache de artefatos")
+    arg_parser.add_argument('--no-cache', action='store_true', help="desabilita o cache de artefatos")
+    arg_parser.add_argument('--no-optimize', action='store_true', help="desabilita as otimizações sobre o TAC")
+    arg_parser.add_argument('--runtime', choices=RUNTIMES, default='libc',
+                            help="libc (printf/scanf, ligado com gcc) ou freestanding "
+                                 "(runtime.asm com E/S em buffer, ligado com ld)")
+    arg_parser.add_argument('--target', choices=list(TARGETS), default='x86',
+                            help="x86 (elf32, precisa de gcc-multilib) ou x86-64 (elf64, System V)")
+    arg_parser.add_argument('--assembler', choices=ASSEMBLERS, default='nasm',
+                            help="nasm (nasm e gcc/ld) ou direct (código de máquina e ELF gerados em processo; "
+                                 "só com --target x86 --runtime freestanding)")
+    arg_parser.add_argument('--run', nargs='?', const='vm', choices=RUN_ENGINES,
+                            help="executa o programa sem gerar o executável: na VM de bytecode (padrão) "
+                                 "ou como Python estruturado")
+    arg_parser.add_argument('--time-passes', action='store_true',
+                            help="mede o tempo de cada fase e das ferramentas externas e mostra os contadores "
+                                 "(tokens, nós, instruções) em stderr")
+    arg_parser.add_argument('--stats', action='store_true',
+                            help="como --time-passes, com o pico de memória de cada fase (tracemalloc, mais lento)")
+    arg_parser.add_argument('--stats-json', metavar='ARQUIVO',
+                            help="grava as medições em JSON em vez da tabela ('-' para stdout); implica --time-passes")
+    args = arg_parser.parse_args()
+    if args.run and (len(args.sources) != 1 or os.path.isdir(args.sources[0])):
+        arg_parser.error("--run exige um único arquivo")
+    if args.assembler == 'direct' and (args.target != 'x86' or args.runtime != 'freestanding'):
+        arg_parser.error("--assembler direct exige --target x86 e --runtime freestanding")
+    cache_dir = None if args.no_cache else args.cache_dir
+    stats_mode = 'memory' if args.stats else 'time' if args.time_passes or args.stats_json else None
+    stats = PassStats(memory=stats_mode == 'memory') if stats_mode else None
 
-    if len(sys.argv) != 2:
-        print("Uso: python main.py arquivo.lps")
+    if args.run:
+        status = run_program(args.sources[0], not args.no_optimize, args.run, stats, args.target)
+    elif len(args.sources) == 1 and not os.path.isdir(args.sources[0]):
+        # Só a compilação é medida: analyze_file refaz o frontend para mostrar a árvore e o TAC
+        analyze_file(args.sources[0])
+        cache = ArtifactCache(cache_dir) if cache_dir else None
+        exe_file = compile_to_nasm(args.sources[0], "output", args.output_dir, cache, not args.no_optimize,
+                                   args.runtime, args.target, args.assembler, stats)
+        status = 0 if exe_file else 1
     else:
-        analyze_file(sys.argv[1])
-        compile_to_nasm(sys.argv[1], "output")
+        start = time.perf_counter()
+        results = compile_batch(collect_sources(args.sources), args.output_dir, args.jobs, cache_dir,
+                                not args.no_optimize, args.runtime, args.target, args.assembler, stats_mode)
+        if cache_dir:
+            ArtifactCache(cache_dir).evict()  # Os workers só removem entradas de tempos em tempos
+        print_batch_summary(results, time.perf_counter() - start)
+        if stats_mode:
+            stats = merge_stats(result[4] for result in results)
+        status = 0 if all(exe_file for _, exe_file, *_ in results) else 1
+
+    if stats is not None:
+        if args.stats_json:
+            with contextlib.ExitStack() as stack:
+                out = sys.stdout if args.stats_json == '-' else stack.enter_context(open(args.stats_json, 'w'))
+                json.dump(stats.as_dict(), out, indent=2)
+                out.write('\n')
+        else:
+            print(f"\nMedições ({'tempo e memória' if stats_mode == 'memory' else 'tempo'}):", file=sys.stderr)
+            print(stats.format_table(), file=sys.stderr)
+    sys.exit(status)
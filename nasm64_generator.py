@@ -0,0 +1,256 @@
+"""
+Backend x86-64: código e dados de 64 bits para nasm -f elf64.
+
+As chamadas à libc (printf/scanf) e ao runtime freestanding (runtime64.asm)
+seguem a convenção System V AMD64: argumentos em rdi e rsi, al com o número de
+registradores vetoriais nas funções variádicas e a pilha alinhada em 16 bytes
+no call. Os registradores alocados que o chamador precisa preservar são
+empilhados em volta de cada chamada.
+
+rax é o acumulador e r11 é o registrador auxiliar para imediatos que não cabem
+em 32 bits e para divisores literais; os outros 12 registradores de uso geral
+ficam para a alocação.
+"""
+from nasm_generator import NASMGenerator, RUNTIME_ROUTINES, SETCC, ARITHMETIC_MNEMONICS
+from tac import Op, ARITHMETIC_OPS, COMPARISON_OPS
+
+# Os preservados pelo chamado primeiro: não precisam ser salvos em volta das
+# chamadas. rdx por último: idiv usa rdx:rax e exige salvá-lo
+REGISTERS_64 = ['rbx', 'r12', 'r13', 'r14', 'r15', 'rcx', 'rsi', 'rdi', 'r8', 'r9', 'r10', 'rdx']
+CALLEE_SAVED_64 = ['rbx', 'r12', 'r13', 'r14', 'r15']
+CALLER_SAVED_64 = ['rcx', 'rdx', 'rsi', 'rdi', 'r8', 'r9', 'r10']
+
+INT32_MIN, INT32_MAX = -2 ** 31, 2 ** 31 - 1
+
+
+class NASM64Generator(NASMGenerator):
+    allocatable_registers = REGISTERS_64
+    word_directive = 'dq'
+    int_bits = 64
+    formats = [
+        "    fmt_str db '%s', 0",
+        "    fmt_in db '%ld', 0",
+        "    fmt_out db '%ld', 10, 0"  # 10 é o \n
+    ]
+
+    def __init__(self, register_allocation=True, runtime='libc'):
+        super().__init__(register_allocation, runtime)
+        self.bss = [
+            "section .bss",
+            "    align 8"
+        ]
+
+    def _generate_data_section(self):
+        super()._generate_data_section()
+        self.data[:0] = [
+            "bits 64",
+            "default rel",  # Endereços relativos a rip (compatível com PIE)
+            "section .note.GNU-stack noalloc noexec nowrite progbits",  # Pilha não executável
+        ]
+
+    def _saved_registers(self):
+        # Registradores que a System V exige que main preserve
+        if self.freestanding:
+            return []
+        used = set(self.registers.values())
+        return [register for register in CALLEE_SAVED_64 if register in used]
+
+    def _generate_code_section(self):
+        if self.freestanding:
+            self.code = [
+                "section .text",
+                "    global _start",
+                f"    extern {', '.join(RUNTIME_ROUTINES)}",
+                "",
+                "_start:",
+                "    xor ebp, ebp",  # Marca o quadro mais externo; a pilha já está alinhada em 16
+            ]
+        else:
+            saved = self._saved_registers()
+            self.code = [
+                "section .text",
+                "    global main",
+                "    extern printf",
+                "    extern scanf",
+                "",
+                "main:",
+                "    push rbp",
+                "    mov rbp, rsp",
+            ]
+            self.code.extend(f"    push {register}" for register in saved)
+            if len(saved) % 2:
+                self.code.append("    sub rsp, 8")  # Realinha a pilha em 16 bytes
+
+        # Variáveis em registrador começam com o valor da memória
+        for operand, register in self.registers.items():
+            if operand.is_var:
+                self.code.append(f"    mov {register}, [{self._name(operand)}]")
+
+    def _operand(self, operand):
+        if operand.is_literal and isinstance(operand.value, float):
+            return f"__float64__({operand.value})"
+        return super()._operand(operand)
+
+    def _source(self, operand):
+        """Operando para a segunda posição de uma instrução (imediatos de até 32 bits)"""
+        value = operand.value
+        if operand.is_literal and (isinstance(value, float) or (
+                isinstance(value, int) and not isinstance(value, bool) and not INT32_MIN <= value <= INT32_MAX)):
+            self.code.append(f"    mov r11, {self._operand(operand)}")
+            return 'r11'
+        return self._operand(operand)
+
+    def _call(self, function, arguments):
+        """Chamada System V; arguments são as instruções que preparam os argumentos"""
+        used = set(self.registers.values())
+        saved = [register for register in CALLER_SAVED_64 if register in used]
+        self.code.extend(f"    push {register}" for register in saved)
+        if len(saved) % 2:
+            self.code.append("    sub rsp, 8")
+        self.code.extend(arguments)
+        if not function.startswith('rt_'):
+            self.code.append("    xor eax, eax")  # Nenhum argumento vetorial (printf/scanf são variádicas)
+        self.code.append(f"    call {function}")
+        if len(saved) % 2:
+            self.code.append("    add rsp, 8")
+        self.code.extend(f"    pop {register}" for register in reversed(saved))
+
+    def _process_instruction(self, instr):
+        op = instr.op
+
+        if op == Op.DECLARE:
+            pass  # Já tratado na seção .data
+
+        elif op == Op.INPUT:
+            var = self._name(instr.result)
+            if self.freestanding:
+                self._call("rt_read_int", [])
+                self.code.append(f"    mov {self._location(instr.result)}, rax")
+            else:
+                self._call("scanf wrt ..plt", [
+                    f"    lea rsi, [{var}]",
+                    "    lea rdi, [fmt_in]",
+                ])
+                if instr.result in self.registers:
+                    # scanf escreve na memória; atualiza o registrador da variável
+                    self.code.append(f"    mov {self.registers[instr.result]}, [{var}]")
+
+        elif op == Op.PRINT:
+            value = instr.arg1
+            if value.type == 'str':
+                # Endereço do literal, ou o valor da variável str (um endereço)
+                if value.is_string:
+                    address = f"    lea {{}}, [{self.string_literals[value.value]}]"
+                else:
+                    address = f"    mov {{}}, {self._operand(value)}"
+                if self.freestanding:
+                    self._call("rt_print_str", [address.format('rdi')])
+                else:
+                    self._call("printf wrt ..plt", [
+                        address.format('rsi'),
+                        "    lea rdi, [fmt_str]",
+                    ])
+            elif self.freestanding:
+                self._call("rt_print_int", [f"    mov rdi, {self._operand(value)}"])
+            else:
+                # rsi antes de rdi: o valor pode estar em rdi
+                self._call("printf wrt ..plt", [
+                    f"    mov rsi, {self._operand(value)}",
+                    "    lea rdi, [fmt_out]",
+                ])
+
+        elif op == Op.IF_FALSE:
+            self.code.extend([
+                f"    mov rax, {self._operand(instr.arg1)}",
+                "    test rax, rax",
+                f"    jz {instr.result}"
+            ])
+
+        elif op == Op.GOTO:
+            self.code.append(f"    jmp {instr.result}")
+
+        elif op == Op.COPY:
+            if instr.arg1.is_string:
+                source = f"    lea rax, [{self.string_literals[instr.arg1.value]}]"  # Relativo a rip
+            else:
+                source = f"    mov rax, {self._operand(instr.arg1)}"
+            self.code.extend([
+                source,
+                f"    mov {self._location(instr.result)}, rax"
+            ])
+
+        elif op == Op.DIV:
+            # idiv usa rdx:rax, então rdx é preservado na pilha
+            self.code.append("    push rdx")
+            if instr.arg2.is_literal:
+                self.code.append(f"    mov r11, {self._operand(instr.arg2)}")
+                divisor = 'r11'
+            else:
+                divisor = self._operand(instr.arg2)
+                if divisor == 'rdx':
+                    divisor = 'qword [rsp]'  # Valor salvo de rdx
+                elif divisor.startswith('['):
+                    divisor = f"qword {divisor}"
+            self.code.extend([
+                f"    mov rax, {self._operand(instr.arg1)}",
+                "    cqo",
+                f"    idiv {divisor}",
+                "    pop rdx",
+                f"    mov {self._location(instr.result)}, rax"
+            ])
+
+        elif op in ARITHMETIC_OPS:
+            mnemonic = ARITHMETIC_MNEMONICS[op]
+            self.code.append(f"    mov rax, {self._operand(instr.arg1)}")
+            source = self._source(instr.arg2)
+            self.code.extend([
+                f"    {mnemonic} rax, {source}",
+                f"    mov {self._location(instr.result)}, rax"
+            ])
+
+        elif op in COMPARISON_OPS:
+            self.code.append(f"    mov rax, {self._operand(instr.arg1)}")
+            source = self._source(instr.arg2)
+            self.code.extend([
+                f"    cmp rax, {source}",
+                f"    {SETCC[op]} al",
+                "    movzx eax, al",
+                f"    mov {self._location(instr.result)}, rax"
+            ])
+
+        elif op == Op.NEG:
+            self.code.extend([
+                f"    mov rax, {self._operand(instr.arg1)}",
+                "    neg rax",
+                f"    mov {self._location(instr.result)}, rax"
+            ])
+
+        elif op == Op.NOT:
+            self.code.extend([
+                f"    mov rax, {self._operand(instr.arg1)}",
+                "    test rax, rax",
+                "    sete al",
+                "    movzx eax, al",
+                f"    mov {self._location(instr.result)}, rax"
+            ])
+
+    def _get_full_code(self):
+        if self.freestanding:
+            # rt_exit descarrega o buffer de saída e termina o processo
+            return '\n'.join(self.data + self.bss + self.code + ["    call rt_exit"])
+        saved = self._saved_registers()
+        if saved:
+            epilogue = [f"    lea rsp, [rbp - {8 * len(saved)}]"]  # Topo dos registradores salvos
+            epilogue.extend(f"    pop {register}" for register in reversed(saved))
+        else:
+            epilogue = ["    mov rsp, rbp"]
+        return '\n'.join(
+            self.data +
+            self.bss +
+            self.code +
+            epilogue + [
+                "    pop rbp",
+                "    xor eax, eax",  # Retorna 0
+                "    ret"
+            ]
+        )
@@ -1,103 +1,224 @@
+import os
+
+from register_allocator import allocate_registers, CALLEE_SAVED, REGISTERS
+from tac import Op, ARITHMETIC_OPS, COMPARISON_OPS, literal
+
+# Instrução setcc correspondente a cada operador relacional
+SETCC = {
+    Op.GT: 'setg', Op.LT: 'setl', Op.GE: 'setge',
+    Op.LE: 'setle', Op.EQ: 'sete', Op.NE: 'setne',
+}
+
+ARITHMETIC_MNEMONICS = {Op.ADD: 'add', Op.SUB: 'sub', Op.MUL: 'imul'}
+
+# 'libc': main, printf e scanf, ligado com gcc
+# 'freestanding': _start e as rotinas de runtime.asm (E/S com buffer), ligado com ld
+RUNTIMES = ('libc', 'freestanding')
+RUNTIME_ROUTINES = ['rt_print_str', 'rt_print_int', 'rt_read_int', 'rt_exit']
+
+
 class NASMGenerator:
-    def __init__(self):
+    # Registradores disponíveis para a alocação (eax fica como acumulador)
+    allocatable_registers = REGISTERS
+    # Diretiva das variáveis e temporários na seção .data
+    word_directive = 'dd'
+    # Largura dos int (as operações dão a volta nela)
+    int_bits = 32
+    # Formatos usados com printf/scanf no runtime libc
+    formats = [
+        "    fmt_str db '%s', 0",
+        "    fmt_int db '%d', 0",
+        "    fmt_in db '%d', 0",
+        "    fmt_out db '%d', 10, 0"  # 10 é o \n
+    ]
+
+    def __init__(self, register_allocation=True, runtime='libc'):
+        if runtime not in RUNTIMES:
+            raise ValueError(f"Runtime desconhecido: {runtime}")
+        self.register_allocation = register_allocation
+        self.freestanding = runtime == 'freestanding'
+        self.registers = {}  # Operando -> registrador
         self.code = []
         self.data = []
         self.vars = set()
+        self.storage = {}  # Variável -> nome na seção .data
         self.temp_vars = set()
+        self.initial_values = {}  # Valores das constantes declaradas
         self.string_literals = {}
         self.string_counter = 0
         self.bss = [
         "section .bss",
         "    align 4"  # Garantir alinhamento de 4 bytes
     ]
-        
+
     def generate_nasm(self, tac_instructions):
         # Primeiro passo: análise das instruções para identificar variáveis e literais
         self._analyze_tac(tac_instructions)
-        
+
+        # Temporários e variáveis mais usadas ficam em registradores
+        if self.register_allocation:
+            self.registers = allocate_registers(tac_instructions, self.allocatable_registers)
+
         # Gera seção de dados
         self._generate_data_section()
-        
+
         # Gera seção de código
         self._generate_code_section()
-        
+
         # Processa cada instrução TAC
         for instr in tac_instructions:
-            if instr.endswith(':'):  # É um label
-                self.code.append(instr)
+            if instr.op == Op.LABEL:  # É um label
+                self.code.append(f"{instr.result}:")
                 continue
             self._process_instruction(instr)
-            
+
         return self._get_full_code()
-        
+
     def _analyze_tac(self, instructions):
         for instr in instructions:
-            parts = instr.split()
-            if not parts:
-                continue
-                
-            if parts[0] == 'DECLARE':
-                self.vars.add(parts[1])
-            elif parts[0] == 'PRINT' and parts[1].startswith('"'):
-                value = ' '.join(parts[1:])
-                if value not in self.string_literals:
+            operands = (instr.result, instr.arg1, instr.arg2)
+            if instr.op == Op.DECLARE:
+                name = instr.result.value
+                if name in self.vars and instr.result not in self.storage:
+                    # Sombreia uma variável de mesmo nome: o id do símbolo separa as duas
+                    # ('.' não aparece nos nomes da linguagem)
+                    name = f"{name}.{instr.result.symbol}"
+                self.storage[instr.result] = name
+                self.vars.add(name)
+                initial = instr.arg1
+                if initial is None and instr.result.type == 'str':
+                    # Uma str nunca atribuída aponta para "" (como na VM), e não para o endereço 0
+                    initial = literal('""')
+                if initial is None:
+                    continue
+                self.initial_values[name] = initial
+                operands = (initial,)
+
+            for operand in operands:
+                if operand is None:
+                    continue
+                if operand.is_temp:
+                    # Captura variáveis temporárias (t0, t1, etc)
+                    self.temp_vars.add(operand)
+                elif operand.is_string and operand.value not in self.string_literals:
                     label = f"str_{self.string_counter}"
-                    self.string_literals[value] = label
+                    self.string_literals[operand.value] = label
                     self.string_counter += 1
-            elif 't' in instr and '=' in instr:
-                # Captura variáveis temporárias (t0, t1, etc)
-                temp = instr.split('=')[0].strip()
-                if temp.startswith('t'):
-                    self.temp_vars.add(temp)
-                        
+
     def _generate_data_section(self):
-        self.data = [
-            "section .data",
-            "    fmt_str db '%s', 0",
-            "    fmt_int db '%d', 0",
-            "    fmt_in db '%d', 0",
-            "    fmt_out db '%d', 10, 0"  # 10 é o \n
-        ]
-        
+        self.data = ["section .data"]
+        if not self.freestanding:
+            self.data.extend(self.formats)
+
         # Strings literais
         for string, label in self.string_literals.items():
             clean_string = string.strip('"')
             self.data.append(f"    {label} db '{clean_string}', 0")
-            
+
         # Variáveis e temporários
-        for var in self.vars:
-            self.data.append(f"    {var} dd 0")
-        for temp in self.temp_vars:
-            self.data.append(f"    {temp} dd 0")
-            
+        # Em ordem: o conjunto itera na ordem do hash, que muda a cada processo
+        for var in sorted(self.vars):
+            initial = self.initial_values.get(var)
+            value = self._operand(initial) if initial is not None else 0
+            self.data.append(f"    {var} {self.word_directive} {value}")
+        # Apenas os temporários sem registrador precisam de memória
+        for temp in sorted(self.temp_vars, key=lambda t: int(t.value[1:])):
+            if temp not in self.registers:
+                self.data.append(f"    {temp} {self.word_directive} 0")
+
         self.data.append("")  # Linha em branco para separação
-        
+
+    def _saved_registers(self):
+        # Registradores que a convenção cdecl exige que main preserve
+        # (_start não retorna, então não há o que preservar)
+        if self.freestanding:
+            return []
+        used = set(self.registers.values())
+        return [register for register in CALLEE_SAVED if register in used]
+
     def _generate_code_section(self):
-        self.code = [
-            "section .text",
-            "    global main",
-            "    extern printf",
-            "    extern scanf",
-            "",
-            "main:",
+        if self.freestanding:
+            self.code = [
+                "section .text",
+                "    global _start",
+                f"    extern {', '.join(RUNTIME_ROUTINES)}",
+                "",
+                "_start:",
+            ]
+        else:
+            self.code = [
+                "section .text",
+                "    global main",
+                "    extern printf",
+                "    extern scanf",
+                "",
+                "main:",
+            ]
+        self.code.extend([
             "    push ebp",          # Preservar frame pointer
             "    mov ebp, esp",      # Setup novo frame
-            "    sub esp, 8"         # Reservar espaço para variáveis locais
-        ]
-        
+        ])
+        self.code.extend(f"    push {register}" for register in self._saved_registers())
+        self.code.append("    sub esp, 8")  # Reservar espaço para variáveis locais
+
+        # Variáveis em registrador começam com o valor da memória (0)
+        for operand, register in self.registers.items():
+            if operand.is_var:
+                self.code.append(f"    mov {register}, [{self._name(operand)}]")
+
+    def _operand(self, operand):
+        """Converte um operando do TAC em um operando NASM (imediato ou memória)"""
+        if operand.is_literal:
+            value = operand.value
+            if isinstance(value, bool):
+                return '1' if value else '0'
+            if isinstance(value, float):
+                return f"__float32__({value})"
+            if isinstance(value, str):
+                return self.string_literals[value]
+            return str(value)
+        return self._location(operand)
+
+    def _location(self, operand):
+        """Registrador ou endereço de memória onde o operando é armazenado"""
+        register = self.registers.get(operand)
+        if register:
+            return register
+        return f"[{self._name(operand)}]"
+
+    def _name(self, operand):
+        """Nome do operando na seção .data"""
+        return self.storage.get(operand, operand.value)
+
     def _process_instruction(self, instr):
-        parts = instr.split()
-        
-        if not parts:
-            return
-            
-        command = parts[0]
-        
-        if command == 'DECLARE':
+        op = instr.op
+
+        if op == Op.DECLARE:
             pass  # Já tratado na seção .data
-            
-        elif command == 'INPUT':
-            var = parts[1]
+
+        elif op == Op.INPUT and self.freestanding:
+            # As rotinas do runtime preservam tudo menos eax
+            self.code.extend([
+                "    call rt_read_int",
+                f"    mov {self._location(instr.result)}, eax"
+            ])
+
+        elif op == Op.PRINT and self.freestanding:
+            value = instr.arg1
+            if value.type == 'str':
+                # Literal (label) ou variável str (endereço da string)
+                self.code.extend([
+                    f"    mov eax, {self._operand(value)}",
+                    "    call rt_print_str"
+                ])
+            else:
+                self.code.extend([
+                    f"    mov eax, {self._operand(value)}",
+                    "    call rt_print_int"
+                ])
+
+        elif op == Op.INPUT:
+            var = self._name(instr.result)
             self.code.extend([
                 "    push ebx",                # Preserva registradores
                 "    push ecx",
@@ -110,16 +231,21 @@ class NASMGenerator:
                 "    pop ecx",
                 "    pop ebx"
             ])
-            
-        elif command == 'PRINT':
-            if parts[1].startswith('"'):
-                value = ' '.join(parts[1:])
-                label = self.string_literals[value]
+            if instr.result in self.registers:
+                # scanf escreve na memória; atualiza o registrador da variável
+                self.code.append(f"    mov {self.registers[instr.result]}, [{var}]")
+
+        elif op == Op.PRINT:
+            value = instr.arg1
+            if value.type == 'str':
+                address = self._operand(value)
+                if address.startswith('['):
+                    address = f"dword {address}"  # Variável str na memória
                 self.code.extend([
                     "    push ebx",
                     "    push ecx",
                     "    push edx",
-                    f"    push {label}",
+                    f"    push {address}",
                     "    push fmt_str",
                     "    call printf",
                     "    add esp, 8",
@@ -128,12 +254,11 @@ class NASMGenerator:
                     "    pop ebx"
                 ])
             else:
-                value = parts[1]
                 self.code.extend([
                     "    push ebx",
                     "    push ecx",
                     "    push edx",
-                    f"    mov eax, [{value}]",
+                    f"    mov eax, {self._operand(value)}",
                     "    push eax",
                     "    push fmt_out",
                     "    call printf",
@@ -142,39 +267,79 @@ class NASMGenerator:
                     "    pop ecx",
                     "    pop ebx"
                 ])
-                
-        elif command == 'if' and parts[1] == 'not':
-            condition = parts[2]
-            label = parts[4]
+
+        elif op == Op.IF_FALSE:
             self.code.extend([
-                f"    mov eax, [{condition}]",
+                f"    mov eax, {self._operand(instr.arg1)}",
                 "    cmp eax, 0",
-                f"    je {label}"
+                f"    je {instr.result}"
+            ])
+
+        elif op == Op.GOTO:
+            self.code.append(f"    jmp {instr.result}")
+
+        elif op == Op.COPY:
+            self.code.extend([
+                f"    mov eax, {self._operand(instr.arg1)}",
+                f"    mov {self._location(instr.result)}, eax"
             ])
-            
-        elif command == 'goto':
-            label = parts[1]
-            self.code.append(f"    jmp {label}")
-            
-        elif '=' in instr:
-            dest = parts[0]
-            if '>' in instr:  # Comparação específica para x > 0
-                left = parts[2]
-                right = parts[4]
-                # Adicionar verificação de valor válido
-                if not right.isdigit() and not right.startswith('['):
-                    right = f"[{right}]"
-                
-                self.code.extend([
-                    "    push eax",  # Preservar eax
-                    f"    mov eax, [{left}]",
-                    f"    cmp eax, {right}",
-                    "    setg al",
-                    "    movzx eax, al",
-                    f"    mov [{dest}], eax",
-                    "    pop eax"    # Restaurar eax
-                ])
-            
+
+        elif op == Op.DIV:
+            # idiv usa edx:eax, então edx é preservado na pilha
+            divisor = self._operand(instr.arg2)
+            self.code.extend([
+                "    push edx",
+                f"    mov eax, {self._operand(instr.arg1)}",
+            ])
+            if instr.arg2.is_literal:
+                self.code.append(f"    push {divisor}")
+                self.code.extend(["    cdq", "    idiv dword [esp]", "    add esp, 4"])
+            elif divisor == 'edx':
+                self.code.extend(["    cdq", "    idiv dword [esp]"])  # Valor salvo de edx
+            elif divisor.startswith('['):
+                self.code.extend(["    cdq", f"    idiv dword {divisor}"])
+            else:
+                self.code.extend(["    cdq", f"    idiv {divisor}"])
+            self.code.extend([
+                "    pop edx",
+                f"    mov {self._location(instr.result)}, eax"
+            ])
+
+        elif op in ARITHMETIC_OPS:
+            mnemonic = ARITHMETIC_MNEMONICS[op]
+            self.code.extend([
+                f"    mov eax, {self._operand(instr.arg1)}",
+                f"    {mnemonic} eax, {self._operand(instr.arg2)}",
+                f"    mov {self._location(instr.result)}, eax"
+            ])
+
+        elif op in COMPARISON_OPS:
+            self.code.extend([
+                "    push eax",  # Preservar eax
+                f"    mov eax, {self._operand(instr.arg1)}",
+                f"    cmp eax, {self._operand(instr.arg2)}",
+                f"    {SETCC[op]} al",
+                "    movzx eax, al",
+                f"    mov {self._location(instr.result)}, eax",
+                "    pop eax"    # Restaurar eax
+            ])
+
+        elif op == Op.NEG:
+            self.code.extend([
+                f"    mov eax, {self._operand(instr.arg1)}",
+                "    neg eax",
+                f"    mov {self._location(instr.result)}, eax"
+            ])
+
+        elif op == Op.NOT:
+            self.code.extend([
+                f"    mov eax, {self._operand(instr.arg1)}",
+                "    cmp eax, 0",
+                "    sete al",
+                "    movzx eax, al",
+                f"    mov {self._location(instr.result)}, eax"
+            ])
+
 
     def _add_exit_code(self):
         self.code.extend([
@@ -186,19 +351,28 @@ class NASMGenerator:
             "    xor eax, eax",  # Return 0
             "    ret"           # Retornar do procedimento
         ])
-    
+
     def _get_full_code(self):
+        if self.freestanding:
+            # rt_exit descarrega o buffer de saída e termina o processo
+            return '\n'.join(self.data + self.bss + self.code + ["    call rt_exit"])
+        saved = self._saved_registers()
+        if saved:
+            epilogue = [f"    lea esp, [ebp - {4 * len(saved)}]"]  # Topo dos registradores salvos
+            epilogue.extend(f"    pop {register}" for register in reversed(saved))
+        else:
+            epilogue = ["    mov esp, ebp"]  # Restaurar stack
         return '\n'.join(
             self.data +
             self.bss +              # Adicionar seção BSS
-            self.code + [
-                "    mov esp, ebp",  # Restaurar stack
+            self.code +
+            epilogue + [
                 "    pop ebp",       # Restaurar frame pointer
                 "    ret"           # Retorno limpo
             ]
         )
 
-    def save_to_file(self, filename, code):
-        filename = 'output/' + filename
+    def save_to_file(self, filename, code, directory='output'):
+        filename = os.path.join(directory, filename)
         with open(filename, 'w') as f:
-            f.write(code)
\ No newline at end of file
+            f.write(code)
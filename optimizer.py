@@ -0,0 +1,21 @@
+"""
+Pipeline de otimizações sobre o TAC, executado entre a geração do TAC e os backends.
+"""
+from constant_folding import ConstantFolder
+from dead_code import DeadCodeEliminator
+from loops import LoopOptimizer
+from value_numbering import GlobalValueNumbering
+
+
+def optimize_tac(instructions, int_bits=32):
+    """
+    Executa as otimizações em sequência. Retorna as instruções otimizadas e os passes (para os relatórios).
+    int_bits é a largura dos int do alvo, com a qual as constantes são dobradas.
+    """
+    dead_code = DeadCodeEliminator()
+    dead_code.check_unused(instructions)  # Avisos sobre o programa como foi escrito
+
+    passes = [ConstantFolder(int_bits), GlobalValueNumbering(), LoopOptimizer(), dead_code]
+    for optimization in passes:
+        instructions = optimization.run(instructions)
+    return instructions, passes
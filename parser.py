@@ -1,6 +1,13 @@
+import copy
 from ply import yacc
-from lexer import tokens, lexer
+from lexer import tokens, new_lexer
+from dfa_lexer import DFALexer
+import table_cache
+from diagnostics import Diagnostic
+import tac
+from tac import Op, Quad, BINARY_OPS, UNARY_OPS, BINARY_OPCODES, OP_SYMBOLS
 import sys
+from types import GeneratorType
 
 precedence = (
     ('right', 'UMINUS'),
@@ -28,8 +35,8 @@ class CodeGenerator:
         # Processa cada instrução TAC
         for instr in tac_instructions:
             self.current_line += 1
-            if instr.endswith(':'):  # É um label
-                self.label_map[instr[:-1]] = len(self.code)
+            if instr.op == Op.LABEL:  # É um label
+                self.label_map[instr.result.value] = len(self.code)
                 continue
                 
             self._process_instruction(instr)
@@ -39,10 +46,9 @@ class CodeGenerator:
     def _analyze_tac(self, instructions):
         for instr in instructions:
             # Identifica variáveis temporárias (t0, t1, etc)
-            parts = instr.split()
-            for part in parts:
-                if part.startswith('t') and part[1:].isdigit():
-                    self.temp_vars.add(part)
+            for operand in (instr.result, instr.arg1, instr.arg2):
+                if operand is not None and operand.is_temp:
+                    self.temp_vars.add(operand.value)
                     
     def _add_header(self):
         # Adiciona imports necessários
@@ -52,40 +58,50 @@ class CodeGenerator:
         if self.temp_vars:
             temp_declarations = ", ".join(sorted(self.temp_vars))
             self.code.append(f"    {temp_declarations} = {', '.join(['None'] * len(self.temp_vars))}")
+
+    def _operand(self, operand):
+        if operand.is_literal and isinstance(operand.value, bool):
+            return 'True' if operand.value else 'False'
+        return str(operand)
             
     def _process_instruction(self, instr):
-        parts = instr.split()
+        op = instr.op
         
-        if instr.startswith('DECLARE'):
-            # Declaração de variável
-            var_name = parts[1]
-            self.code.append(f"    {var_name} = None")
+        if op == Op.DECLARE:
+            # Declaração de variável (ou constante, com valor)
+            value = self._operand(instr.arg1) if instr.arg1 is not None else None
+            self.code.append(f"    {instr.result} = {value}")
             
-        elif instr.startswith('INPUT'):
+        elif op == Op.INPUT:
             # Entrada de dados
-            var_name = parts[1]
-            self.code.append(f"    {var_name} = int(input())")
+            self.code.append(f"    {instr.result} = int(input())")
             
-        elif instr.startswith('PRINT'):
+        elif op == Op.PRINT:
             # Saída de dados
-            value = ' '.join(parts[1:])
-            self.code.append(f"    print({value})")
+            self.code.append(f"    print({self._operand(instr.arg1)})")
             
-        elif instr.startswith('if not'):
+        elif op == Op.IF_FALSE:
             # Instrução de desvio condicional
-            condition = parts[2]
-            label = parts[4]
-            self.code.append(f"    if not {condition}:")
-            self.code.append(f"        goto .{label}")
+            self.code.append(f"    if not {self._operand(instr.arg1)}:")
+            self.code.append(f"        goto .{instr.result}")
             
-        elif instr.startswith('goto'):
+        elif op == Op.GOTO:
             # Desvio incondicional
-            label = parts[1]
-            self.code.append(f"    goto .{label}")
+            self.code.append(f"    goto .{instr.result}")
             
-        elif '=' in instr:
-            # Atribuição ou operação
-            self.code.append(f"    {instr}")
+        elif op == Op.COPY:
+            self.code.append(f"    {instr.result} = {self._operand(instr.arg1)}")
+
+        elif op in BINARY_OPCODES:
+            left = self._operand(instr.arg1)
+            right = self._operand(instr.arg2)
+            self.code.append(f"    {instr.result} = {left} {OP_SYMBOLS[op]} {right}")
+
+        elif op == Op.NEG:
+            self.code.append(f"    {instr.result} = -{self._operand(instr.arg1)}")
+
+        elif op == Op.NOT:
+            self.code.append(f"    {instr.result} = not {self._operand(instr.arg1)}")
             
     def save_to_file(self, filename, code):
         with open(filename, 'w') as f:
@@ -110,144 +126,250 @@ class CodeGenerator:
             optimized.append(line)
         return '\n'.join(optimized)
 
-class TACGenerator:
+class NodeVisitor:
+    """
+    Base dos passes sobre a AST. Cada subclasse define visit_<Tipo>(node); os
+    métodos são resolvidos uma única vez, na criação da classe, numa tabela de
+    despacho por tipo de nó (os tipos sem método caem em generic_visit).
+
+    O percurso é iterativo: um método que visita filhos é um gerador que faz
+    `valor = yield filho`, e visit guarda os geradores suspensos numa pilha
+    explícita em vez da pilha do Python, então a profundidade da árvore não
+    esbarra no limite de recursão. Métodos que não visitam filhos são funções
+    comuns e devolvem o valor direto.
+    """
+    dispatch = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.dispatch = {name[6:]: getattr(cls, name) for name in dir(cls) if name.startswith('visit_')}
+
+    def visit(self, node):
+        """Visita node e devolve o valor do seu método"""
+        if node is None:
+            return None
+        get = self.dispatch.get
+        generic = type(self).generic_visit
+        value = get(node.type, generic)(self, node)
+        if type(value) is not GeneratorType:
+            return value
+        # O gerador em execução fica em generator; os que esperam o valor de
+        # um filho ficam na pilha
+        stack = []
+        generator = value
+        value = None
+        while True:
+            try:
+                child = generator.send(value)
+            except StopIteration as stop:
+                value = stop.value
+                if not stack:
+                    return value
+                generator = stack.pop()
+                continue
+            if child is None:
+                value = None
+                continue
+            value = get(child.type, generic)(self, child)
+            if type(value) is GeneratorType:
+                stack.append(generator)
+                generator = value
+                value = None
+
+    def generic_visit(self, node):
+        # Visita os filhos em ordem; o valor é o do último
+        value = None
+        for child in node.children:
+            if isinstance(child, Node):
+                value = yield child
+        return value
+
+class TACGenerator(NodeVisitor):
     def __init__(self):
         self.instructions = []
         self.temp_counter = 0
         self.label_counter = 0
+        self.loop_ends = []  # Label de fim de cada while aberto, o do mais interno no topo (break)
         
-    def new_temp(self):
-        temp = f"t{self.temp_counter}"
+    def new_temp(self, type=None):
+        temp = tac.temp(f"t{self.temp_counter}", type)
         self.temp_counter += 1
         return temp
         
     def new_label(self):
-        label = f"L{self.label_counter}"
+        label = tac.label(f"L{self.label_counter}")
         self.label_counter += 1
         return label
         
     def add_instruction(self, instruction):
         self.instructions.append(instruction)
+
+    def emit(self, op, result=None, arg1=None, arg2=None):
+        self.instructions.append(Quad(op, result, arg1, arg2))
         
     def print_instructions(self):
         for i, instr in enumerate(self.instructions):
             print(f"{i}: {instr}")
 
-class Node:
-    def __init__(self, type, children=None, leaf=None):
-        self.type = type
-        self.children = children if children else []
-        self.leaf = leaf
-
-    def generate_tac(self, generator):
-        method_name = f'generate_tac_{self.type}'
-        if hasattr(self, method_name):
-            return getattr(self, method_name)(generator)
-        return self.generic_generate_tac(generator)
-        
-    def generic_generate_tac(self, generator):
-        results = []
-        for child in self.children:
-            if isinstance(child, Node):
-                results.append(child.generate_tac(generator))
-        return results[-1] if results else None
+    # ---- Geração do TAC: cada método devolve o operando com o valor do nó ----
 
-    def generate_tac_Program(self, generator):
-        return self.children[1].generate_tac(generator)  # Generate TAC for statements
+    def visit_Program(self, node):
+        return (yield node.children[1])  # Generate TAC for statements
 
-    def generate_tac_Declaration(self, generator):
+    def visit_Declaration(self, node):
         # For declarations, we'll just generate a DECLARE instruction
-        for id_node in self.children[1:]:
-            var_name = id_node.leaf
-            generator.add_instruction(f"DECLARE {var_name}")
+        for id_node in node.children[1:]:
+            self.emit(Op.DECLARE, id_node.variable())
         return None
 
-    def generate_tac_Assignment(self, generator):
-        target = self.children[0].leaf
-        value = self.children[1].generate_tac(generator)
-        generator.add_instruction(f"{target} = {value}")
+    def visit_ConstDecl(self, node):
+        # Constantes são declaradas já com o valor, que nunca muda
+        var_type = node.children[0].leaf
+        value = yield node.children[1]
+        if var_type == 'float' and isinstance(value.value, int) and not isinstance(value.value, bool):
+            value = tac.literal(float(value.value))
+        symbol = node.symbol.id if node.symbol is not None else None
+        self.emit(Op.DECLARE, tac.var(node.leaf, var_type, symbol), value)
+        return None
+
+    def visit_Assignment(self, node):
+        target = node.children[0].variable()
+        value = yield node.children[1]
+        self.emit(Op.COPY, target, value)
         return target
 
-    def generate_tac_If(self, generator):
-        condition = self.children[0].generate_tac(generator)
+    def visit_If(self, node):
+        condition = yield node.children[0]
         
         # Gera labels para os blocos
-        else_label = generator.new_label()
-        end_label = generator.new_label()
+        else_label = self.new_label()
+        end_label = self.new_label()
         
         # Adiciona o desvio condicional
-        generator.add_instruction(f"if not {condition} goto {else_label}")
+        self.emit(Op.IF_FALSE, else_label, condition)
         
         # Gera código para o bloco if
-        self.children[1].generate_tac(generator)
+        yield node.children[1]
         
         # Pula o bloco else
-        generator.add_instruction(f"goto {end_label}")
+        self.emit(Op.GOTO, end_label)
         
         # Label para o bloco else
-        generator.add_instruction(f"{else_label}:")
+        self.emit(Op.LABEL, else_label)
         
         # Se houver um bloco else, gera seu código
-        if len(self.children) > 2:
-            self.children[2].generate_tac(generator)
+        if len(node.children) > 2:
+            yield node.children[2]
         
         # Label para o fim do if-else
-        generator.add_instruction(f"{end_label}:")
+        self.emit(Op.LABEL, end_label)
         
         return None
 
-    def generate_tac_BinOp(self, generator):
-        left = self.children[0].generate_tac(generator)
-        right = self.children[1].generate_tac(generator)
-        result = generator.new_temp()
-        generator.add_instruction(f"{result} = {left} {self.leaf} {right}")
+    def visit_BinOp(self, node):
+        left = yield node.children[0]
+        right = yield node.children[1]
+        result = self.new_temp(node.expr_type)
+        self.emit(BINARY_OPS[node.leaf], result, left, right)
         return result
 
-    def generate_tac_RelationalOp(self, generator):
-        left = self.children[0].generate_tac(generator)
-        right = self.children[1].generate_tac(generator)
-        result = generator.new_temp()
-        generator.add_instruction(f"{result} = {left} {self.leaf} {right}")
+    visit_RelationalOp = visit_BinOp
+    visit_LogicalOp = visit_BinOp
+
+    def visit_UnaryOp(self, node):
+        operand = yield node.children[0]
+        result = self.new_temp(node.expr_type)
+        self.emit(UNARY_OPS[node.leaf], result, operand)
         return result
 
-    def generate_tac_While(self, generator):
-        start_label = generator.new_label()
-        end_label = generator.new_label()
+    def visit_While(self, node):
+        start_label = self.new_label()
+        end_label = self.new_label()
         
         # Label for loop start
-        generator.add_instruction(f"{start_label}:")
+        self.emit(Op.LABEL, start_label)
         
         # Generate condition code
-        condition = self.children[0].generate_tac(generator)
-        generator.add_instruction(f"if not {condition} goto {end_label}")
+        condition = yield node.children[0]
+        self.emit(Op.IF_FALSE, end_label, condition)
         
         # Generate loop body
-        self.children[1].generate_tac(generator)
+        self.loop_ends.append(end_label)
+        yield node.children[1]
+        self.loop_ends.pop()
         
         # Jump back to start
-        generator.add_instruction(f"goto {start_label}")
+        self.emit(Op.GOTO, start_label)
         
         # End label
-        generator.add_instruction(f"{end_label}:")
+        self.emit(Op.LABEL, end_label)
         return None
 
-    def generate_tac_Print(self, generator):
-        for expr in self.children:
-            value = expr.generate_tac(generator)
-            generator.add_instruction(f"PRINT {value}")
+    def visit_Break(self, node):
+        # Sai do while mais interno (a análise semântica garante que há um)
+        self.emit(Op.GOTO, self.loop_ends[-1])
         return None
 
-    def generate_tac_Input(self, generator):
-        for id_node in self.children:
-            var_name = id_node.leaf
-            generator.add_instruction(f"INPUT {var_name}")
+    def visit_Print(self, node):
+        for expr in node.children:
+            value = yield expr
+            self.emit(Op.PRINT, arg1=value)
         return None
 
-    def generate_tac_ID(self, generator):
-        return self.leaf
+    def visit_Input(self, node):
+        for id_node in node.children:
+            self.emit(Op.INPUT, id_node.variable())
+        return None
 
-    def generate_tac_Literal(self, generator):
-        return str(self.leaf)
+    def visit_ID(self, node):
+        return node.variable()
+
+    def visit_Literal(self, node):
+        value = node.leaf
+        if isinstance(value, Node):  # Literal booleano
+            value = value.leaf == 'true'
+        return tac.literal(value)
+
+class TreePrinter(NodeVisitor):
+    """Imprime a árvore de derivação, um nó por linha, indentada pelo nível"""
+    def __init__(self, level=0):
+        self.level = level
+
+    def generic_visit(self, node):
+        indent = "  " * self.level
+        if node.leaf is not None:
+            print(f"{indent}({node.type} {node.leaf})")
+            return
+        print(f"{indent}({node.type}")
+        self.level += 1
+        for child in node.children:
+            if not isinstance(child, Node):
+                print(f"{indent}  {child}")
+            elif child.leaf is not None:  # Folhas sem passar pelo visit
+                print(f"{indent}  ({child.type} {child.leaf})")
+            else:
+                yield child
+        self.level -= 1
+        print(f"{indent})")
+
+class Node:
+    def __init__(self, type, children=None, leaf=None):
+        self.type = type
+        self.children = children if children else []
+        self.leaf = leaf
+        # Preenchidos pela análise semântica: tipo da expressão ('int', 'float',
+        # 'str' ou 'bool') e símbolo de IDs e declarações
+        self.expr_type = None
+        self.symbol = None
+
+    def generate_tac(self, generator):
+        return generator.visit(self)
+
+    def variable(self):
+        """Operando do TAC para um nó ID, com o tipo e o id do símbolo (se já analisado)"""
+        if self.symbol is None:
+            return tac.var(self.leaf)
+        return tac.var(self.leaf, self.symbol.type, self.symbol.id)
 
     def __str__(self):
         if self.leaf is not None:
@@ -256,17 +378,17 @@ class Node:
         return f"({self.type} {children_str})"
 
     def print_tree(self, level=0):
-        indent = "  " * level
-        if self.leaf is not None:
-            print(f"{indent}({self.type} {self.leaf})")
-        else:
-            print(f"{indent}({self.type}")
-            for child in self.children:
-                if isinstance(child, Node):
-                    child.print_tree(level + 1)
-                else:
-                    print(f"{indent}  {child}")
-            print(f"{indent})")
+        TreePrinter(level).visit(self)
+
+def count_nodes(ast):
+    """Número de nós da AST (percurso iterativo, como os visitors)"""
+    count = 0
+    stack = [ast]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(child for child in node.children if isinstance(child, Node))
+    return count
 
 # Regras de produção
 def p_program(p):
@@ -288,19 +410,25 @@ def p_type(p):
             | BOOL_TYPE'''
     p[0] = Node('Type', leaf=p[1])
 
+# As listas são recursivas à esquerda: cada redução acrescenta um elemento à
+# lista já construída (O(1) amortizado) e a pilha do parser não cresce com o
+# tamanho da lista
+
 def p_ID_list(p):
-    '''ID_list : ID COMMA ID_list
+    '''ID_list : ID_list COMMA ID
                | ID'''
     if len(p) > 2:
-        p[0] = [Node('ID', leaf=p[1])] + p[3]
+        p[1].append(Node('ID', leaf=p[3]))
+        p[0] = p[1]
     else:
         p[0] = [Node('ID', leaf=p[1])]
 
 def p_statements(p):
-    '''statements : statement statements
+    '''statements : statements statement
                  | statement'''
     if len(p) > 2:
-        p[0] = Node('Statements', [p[1]] + p[2].children)
+        p[1].children.append(p[2])
+        p[0] = p[1]
     else:
         p[0] = Node('Statements', [p[1]])
 
@@ -340,9 +468,10 @@ def p_print_statement(p):
 
 def p_print_args(p):
     '''print_args : expression
-                 | expression COMMA print_args'''
+                 | print_args COMMA expression'''
     if len(p) > 2:
-        p[0] = [p[1]] + p[3]
+        p[1].append(p[3])
+        p[0] = p[1]
     else:
         p[0] = [p[1]]
 
@@ -352,9 +481,10 @@ def p_input_statement(p):
 
 def p_input_args(p):
     '''input_args : ID
-                  | ID COMMA input_args'''
+                  | input_args COMMA ID'''
     if len(p) > 2:
-        p[0] = [Node('ID', leaf=p[1])] + p[3]
+        p[1].append(Node('ID', leaf=p[3]))
+        p[0] = p[1]
     else:
         p[0] = [Node('ID', leaf=p[1])]
 
@@ -438,21 +568,55 @@ def p_boolean(p):
                | FALSE'''
     p[0] = Node('Boolean', leaf=p[1])
 
-def p_error(p):
+def syntax_error(p):
+    """Mensagem e linha de um erro sintático (p é None no fim do arquivo)"""
     if p:
-        print(f"Erro sintático na linha {p.lineno} próximo a '{p.value}'")
-    else:
-        print("Erro sintático no final do arquivo")
-
-# Criação do parser
-parser = yacc.yacc()
+        return f"Erro sintático na linha {p.lineno} próximo a '{p.value}'", p.lineno
+    return "Erro sintático no final do arquivo", None
 
-def parse_file(filename):
+def p_error(p):
+    print(syntax_error(p)[0])
+
+# Criação do parser (tabelas em cache, ver table_cache.py)
+parser = yacc.yacc(**table_cache.parser_options(globals()))
+
+LEXERS = ('ply', 'dfa')
+
+def parse_source(data, diagnostics, lexer='ply', stats=None):
+    """
+    Parse de um texto. Reentrante: cada chamada usa um clone do lexer e uma
+    cópia do parser (as tabelas LR são compartilhadas, as pilhas e a posição
+    não), então pode rodar em várias threads ao mesmo tempo. Os erros léxicos e
+    sintáticos vão para a lista diagnostics (Diagnostic). Retorna a AST ou None.
+    lexer='dfa' troca o lexer do PLY pelo scanner de dfa_lexer.py (mesmos tokens).
+    Com stats (pass_stats.PassStats) registra a fase 'parser', com a 'lexer'
+    dentro dela, e conta os tokens.
+    """
+    call_parser = copy.copy(parser)
+    call_parser.errorfunc = lambda p: diagnostics.append(Diagnostic('parser', *syntax_error(p)))
+    call_lexer = DFALexer(diagnostics) if lexer == 'dfa' else new_lexer(diagnostics)
+    if stats is None:
+        return call_parser.parse(data, lexer=call_lexer)
+    # Só aqui: pass_stats importa subprocess e tracemalloc, que o parse sem
+    # estatísticas (a VM, o servidor, os benchmarks) não precisa carregar
+    from pass_stats import TimedLexer
+    timed_lexer = TimedLexer(call_lexer)
+    with stats.phase('parser') as phase:
+        ast = call_parser.parse(data, lexer=timed_lexer)
+    stats.add_phase('lexer', timed_lexer.seconds, phase)
+    stats.count('tokens', timed_lexer.tokens)
+    return ast
+
+def parse_file(filename, stats=None):
     try:
         with open(filename, 'r') as file:
             data = file.read()
-        result = parser.parse(data, lexer=lexer)
-        return result
+        diagnostics = []
+        try:
+            return parse_source(data, diagnostics, stats=stats)
+        finally:
+            for diagnostic in diagnostics:
+                print(diagnostic)
     except FileNotFoundError:
         print(f"Erro: Arquivo '{filename}' não encontrado.")
     except Exception as e:
@@ -462,4 +626,4 @@ if __name__ == "__main__":
     if len(sys.argv) != 2:
         print("Uso: python parser.py arquivo.lps")
     else:
-        parse_file(sys.argv[1])
\ No newline at end of file
+        parse_file(sys.argv[1])
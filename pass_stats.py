@@ -0,0 +1,169 @@
+"""
+Instrumentação das fases do compilador (--time-passes e --stats de main.py).
+
+PassStats registra, para cada fase, o tempo de relógio e (com memory=True) o
+pico de memória alocada pelo Python durante a fase, medido com tracemalloc;
+contadores (tokens, nós da AST, instruções do TAC, temporários, linhas do
+assembly...) e a duração de cada subprocesso (nasm, gcc, ld). As fases podem
+ser aninhadas: o pico da fase interna também conta no da externa.
+
+    stats = PassStats(memory=True)
+    with stats.phase('semantic'):
+        analyzer.analyze(ast)
+    stats.count('ast_nodes', count_nodes(ast))
+    stats.run(['nasm', '-f', 'elf32', asm_file, '-o', obj_file], check=True)
+    print(stats.format_table())     # ou json.dumps(stats.as_dict())
+
+O lexer do PLY é chamado pelo parser token a token, então as duas fases se
+intercalam: TimedLexer mede o tempo dentro de token() e conta os tokens, e a
+fase 'lexer' aparece dentro da fase 'parser' com esse tempo.
+
+tracemalloc torna a execução algumas vezes mais lenta; sem memory os tempos
+são os do compilador sem instrumentação (a menos de um perf_counter por fase).
+"""
+import subprocess
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class PassStats:
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.phases = []    # {'name', 'depth', 'seconds', 'peak_bytes'} na ordem em que começaram
+        self.counters = {}
+        self.commands = []  # {'command', 'seconds', 'returncode'}; returncode None: o comando não executou
+        self._open = []     # Pilha das fases abertas: [pico da fase até agora, memória no início]
+
+    @contextmanager
+    def phase(self, name):
+        """Mede o bloco como a fase name; devolve a entrada da fase (para fases filhas medidas por fora)"""
+        entry = {'name': name, 'depth': len(self._open), 'seconds': 0.0, 'peak_bytes': None}
+        self.phases.append(entry)  # Na ordem de início: a fase externa antes das internas
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            current, peak = tracemalloc.get_traced_memory()
+            if self._open:  # O pico da fase externa até aqui se perderia com o reset
+                self._open[-1][0] = max(self._open[-1][0], peak - self._open[-1][1])
+            tracemalloc.reset_peak()
+            self._open.append([0, current])
+        else:
+            self._open.append(None)
+        start = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry['seconds'] = time.perf_counter() - start
+            self._close(entry)
+
+    def _close(self, entry):
+        state = self._open.pop()
+        if state is None:
+            return
+        peak = max(state[0], tracemalloc.get_traced_memory()[1] - state[1])
+        entry['peak_bytes'] = peak
+        if self._open:
+            self._open[-1][0] = max(self._open[-1][0], peak + state[1] - self._open[-1][1])
+        else:
+            tracemalloc.stop()
+
+    def add_phase(self, name, seconds, parent):
+        """Fase filha de parent medida por fora (ex.: o tempo acumulado do lexer dentro do parser)"""
+        self.phases.append({'name': name, 'depth': parent['depth'] + 1, 'seconds': seconds, 'peak_bytes': None})
+
+    def count(self, name, value):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def run(self, args, **kwargs):
+        """subprocess.run registrando a duração do comando"""
+        start = time.perf_counter()
+        returncode = None
+        try:
+            completed = subprocess.run(args, **kwargs)
+            returncode = completed.returncode
+            return completed
+        except subprocess.CalledProcessError as e:
+            returncode = e.returncode
+            raise
+        finally:
+            self.commands.append({'command': args[0], 'seconds': time.perf_counter() - start,
+                                  'returncode': returncode})
+
+    def as_dict(self):
+        return {'phases': self.phases, 'counters': self.counters, 'commands': self.commands}
+
+    def format_table(self):
+        lines = [f"{'fase':<22}{'tempo (ms)':>12}{'pico (KiB)':>12}"]
+        for entry in self.phases:
+            name = '  ' * entry['depth'] + entry['name']
+            peak = '-' if entry['peak_bytes'] is None else f"{entry['peak_bytes'] / 1024:.1f}"
+            lines.append(f"{name:<22}{entry['seconds'] * 1000:>12.2f}{peak:>12}")
+        for entry in self.commands:
+            returncode = entry['returncode']
+            status = '' if returncode == 0 else '  (não executou)' if returncode is None else f"  (saída {returncode})"
+            lines.append(f"{'$ ' + entry['command']:<22}{entry['seconds'] * 1000:>12.2f}{'-':>12}{status}")
+        top = [entry for entry in self.phases if entry['depth'] == 0]
+        lines.append(f"{'total':<22}{sum(entry['seconds'] for entry in top) * 1000:>12.2f}")
+        if self.counters:
+            lines.append("")
+            lines.extend(f"{name:<22}{value:>12}" for name, value in self.counters.items())
+        return '\n'.join(lines)
+
+
+def merge_stats(results):
+    """Soma os as_dict de várias compilações (modo em lote): fases por nome, contadores e comandos"""
+    phases = {}
+    counters = {}
+    commands = {}
+    for result in results:
+        for entry in result['phases']:
+            key = (entry['depth'], entry['name'])
+            merged = phases.setdefault(key, {'name': entry['name'], 'depth': entry['depth'],
+                                             'seconds': 0.0, 'peak_bytes': None})
+            merged['seconds'] += entry['seconds']
+            if entry['peak_bytes'] is not None:  # O pico do lote é o maior pico de uma compilação
+                merged['peak_bytes'] = max(merged['peak_bytes'] or 0, entry['peak_bytes'])
+        for name, value in result['counters'].items():
+            counters[name] = counters.get(name, 0) + value
+        for entry in result['commands']:
+            merged = commands.setdefault(entry['command'], {'command': entry['command'], 'seconds': 0.0,
+                                                            'returncode': 0})
+            merged['seconds'] += entry['seconds']
+            if entry['returncode'] != 0:
+                merged['returncode'] = entry['returncode']
+    stats = PassStats()
+    stats.phases = list(phases.values())
+    stats.counters = counters
+    stats.commands = list(commands.values())
+    return stats
+
+
+class TimedLexer:
+    """Lexer (PLY ou DFALexer) que conta os tokens e acumula o tempo gasto em token()"""
+    def __init__(self, lexer):
+        self.lexer = lexer
+        self.tokens = 0
+        self.seconds = 0.0
+
+    def input(self, data):
+        start = time.perf_counter()
+        self.lexer.input(data)
+        self.seconds += time.perf_counter() - start
+
+    def token(self):
+        start = time.perf_counter()
+        tok = self.lexer.token()
+        self.seconds += time.perf_counter() - start
+        if tok is not None:
+            self.tokens += 1
+        return tok
+
+    def __getattr__(self, name):
+        return getattr(self.lexer, name)
+
+
+def count_temps(instructions):
+    """Temporários distintos definidos no TAC"""
+    return len({result for result in (instr.defines() for instr in instructions)
+                if result is not None and result.is_temp})
@@ -0,0 +1,318 @@
+"""
+Otimizador peephole sobre o código NASM gerado.
+
+Percorre a seção .text com uma janela de instruções e aplica as regras até
+não haver mais mudanças:
+    push/pop redundantes     push R ... pop R quando R não muda na janela,
+                             não é usado no programa ou está morto após o pop
+    store seguido de load    mov X, eax / mov eax, X
+    salto para a próxima     jmp L / L:
+    mov morto                mov R, R, ou mov R, ... cujo valor nunca é lido
+
+Os registradores e a convenção de chamada vêm do alvo (x86 ou x86-64), ver Target.
+"""
+import re
+
+RULES = ['push/pop redundantes', 'store seguido de load', 'salto para a próxima', 'mov morto']
+
+# Instruções cujo primeiro operando é só escrito (o valor anterior é descartado)
+PURE_WRITES = {'mov', 'movzx', 'lea'}
+# Instruções que leem e escrevem o primeiro operando
+READ_WRITES = {'add', 'sub', 'imul', 'neg', 'xor', 'and', 'or', 'inc', 'dec'}
+CONDITIONAL_JUMPS = {'je', 'jne', 'jg', 'jl', 'jge', 'jle', 'jz', 'jnz'}
+# Rotinas do runtime freestanding (runtime.asm, runtime64.asm)
+RUNTIME_PREFIX = 'rt_'
+
+REGISTER_RE = re.compile(r'\b(r[abcd]x|r[sd]i|r(?:8|9|1[0-5])[dwb]?|e[abcd]x|e[sd]i|[sd]il|[abcd][lh]|ax)\b')
+
+
+class Target:
+    """Registradores e convenção de chamada de uma arquitetura"""
+
+    def __init__(self, registers, aliases, overwriting, accumulator, stack_pointer, word_size,
+                 call_reads, call_writes, runtime_call_reads, runtime_call_writes, aligned_calls=False):
+        self.registers = registers      # Nomes canônicos dos registradores de uso geral
+        self.aliases = aliases          # Sub-registrador -> nome canônico
+        self.overwriting = overwriting  # Nomes cuja escrita descarta todo o valor anterior
+        self.accumulator = accumulator
+        self.stack_pointer = stack_pointer
+        self.word_size = word_size
+        self.call_reads = call_reads
+        self.call_writes = call_writes
+        self.runtime_call_reads = runtime_call_reads
+        self.runtime_call_writes = runtime_call_writes
+        self.aligned_calls = aligned_calls  # As chamadas dependem do alinhamento da pilha
+
+    def canonical(self, name):
+        return self.aliases.get(name, name)
+
+
+# i386/cdecl: chamadas à libc alteram eax, ecx e edx; as rotinas do runtime
+# recebem o argumento em eax e só alteram eax
+X86 = Target(
+    registers=['eax', 'ebx', 'ecx', 'edx', 'esi', 'edi'],
+    aliases={'al': 'eax', 'ah': 'eax', 'ax': 'eax', 'bl': 'ebx', 'cl': 'ecx', 'dl': 'edx'},
+    overwriting={'eax', 'ebx', 'ecx', 'edx', 'esi', 'edi'},
+    accumulator='eax', stack_pointer='esp', word_size=4,
+    call_reads=set(), call_writes={'eax', 'ecx', 'edx'},
+    runtime_call_reads={'eax'}, runtime_call_writes={'eax'},
+)
+
+# x86-64/System V: argumentos em rdi, rsi, rdx, rcx, r8 e r9 (al com o número
+# de registradores vetoriais nas funções variádicas), e toda chamada, inclusive
+# ao runtime, pode alterar os registradores que o chamador preserva; a pilha
+# precisa estar alinhada em 16 bytes no call
+_SYSV_ARGUMENTS = {'rax', 'rdi', 'rsi', 'rdx', 'rcx', 'r8', 'r9'}
+_SYSV_CALLER_SAVED = {'rax', 'rcx', 'rdx', 'rsi', 'rdi', 'r8', 'r9', 'r10', 'r11'}
+_X86_64_ALIASES = {'eax': 'rax', 'ax': 'rax', 'al': 'rax', 'ah': 'rax', 'ebx': 'rbx', 'bl': 'rbx',
+                   'ecx': 'rcx', 'cl': 'rcx', 'edx': 'rdx', 'dl': 'rdx',
+                   'esi': 'rsi', 'sil': 'rsi', 'edi': 'rdi', 'dil': 'rdi'}
+_X86_64_ALIASES.update({f'r{n}{suffix}': f'r{n}' for n in range(8, 16) for suffix in 'dwb'})
+_X86_64_REGISTERS = ['rax', 'rbx', 'rcx', 'rdx', 'rsi', 'rdi'] + [f'r{n}' for n in range(8, 16)]
+X86_64 = Target(
+    registers=_X86_64_REGISTERS,
+    aliases=_X86_64_ALIASES,
+    # Escritas nos registradores de 32 bits zeram a parte alta
+    overwriting=set(_X86_64_REGISTERS) | {'eax', 'ebx', 'ecx', 'edx', 'esi', 'edi'}
+                | {f'r{n}d' for n in range(8, 16)},
+    accumulator='rax', stack_pointer='rsp', word_size=8,
+    call_reads=_SYSV_ARGUMENTS, call_writes=_SYSV_CALLER_SAVED,
+    runtime_call_reads=_SYSV_ARGUMENTS, runtime_call_writes=_SYSV_CALLER_SAVED,
+    aligned_calls=True,
+)
+
+TARGETS = {'x86': X86, 'x86-64': X86_64}
+
+
+class Line:
+    __slots__ = ('text', 'label', 'mnemonic', 'operands', 'target')
+
+    def __init__(self, text, target=X86):
+        self.text = text
+        self.target = target
+        stripped = text.strip()
+        self.label = None
+        self.mnemonic = None
+        self.operands = []
+        if not stripped:
+            return
+        if stripped.endswith(':') and not text.startswith(' '):
+            self.label = stripped[:-1]
+            return
+        mnemonic, _, rest = stripped.partition(' ')
+        self.mnemonic = mnemonic
+        self.operands = [operand.strip() for operand in rest.split(',')] if rest else []
+
+    @property
+    def is_instruction(self):
+        return self.mnemonic is not None
+
+    def registers(self):
+        """Registradores mencionados explicitamente nos operandos"""
+        found = set()
+        for operand in self.operands:
+            found |= self._mentioned(operand)
+        return found
+
+    @property
+    def is_runtime_call(self):
+        return self.mnemonic == 'call' and self.operands[0].startswith(RUNTIME_PREFIX)
+
+    def implicit_writes(self):
+        """Registradores escritos implicitamente"""
+        target = self.target
+        if self.mnemonic == 'call':
+            return target.runtime_call_writes if self.is_runtime_call else target.call_writes
+        if self.mnemonic in ('cdq', 'cqo'):
+            return {target.canonical('edx')}
+        if self.mnemonic == 'idiv':
+            return {target.accumulator, target.canonical('edx')}
+        return set()
+
+    def writes(self):
+        written = set(self.implicit_writes())
+        if self.operands and (self.mnemonic in PURE_WRITES or self.mnemonic in READ_WRITES
+                              or self.mnemonic == 'pop' or self.mnemonic.startswith('set')):
+            register = self.target.canonical(self.operands[0])
+            if register in self.target.registers:
+                written.add(register)
+        return written
+
+    def reads(self, register):
+        target = self.target
+        if self.mnemonic in ('ret', 'cdq', 'cqo') and register == target.accumulator:
+            return True  # Valor de retorno / origem do cdq
+        if self.mnemonic == 'idiv' and register in (target.accumulator, target.canonical('edx')):
+            return True
+        if self.mnemonic == 'call':
+            return register in (target.runtime_call_reads if self.is_runtime_call else target.call_reads)
+        if not self.operands:
+            return False
+        first, rest = self.operands[0], self.operands[1:]
+        in_rest = any(register in self._mentioned(operand) for operand in rest)
+        if self.mnemonic in PURE_WRITES and target.canonical(first) == register:
+            return in_rest
+        if self.mnemonic == 'xor' and len(self.operands) == 2 and first == rest[0]:
+            return False  # xor R, R zera o registrador
+        return in_rest or register in self._mentioned(first)
+
+    def kills(self, register):
+        """A instrução sobrescreve o registrador inteiro sem ler o valor anterior"""
+        if self.reads(register):
+            return False
+        if self.mnemonic in ('call', 'cdq', 'cqo'):
+            return register in self.implicit_writes()
+        if not self.operands:
+            return False
+        first = self.operands[0]
+        overwrites = first in self.target.overwriting and self.target.canonical(first) == register
+        if self.mnemonic in PURE_WRITES or self.mnemonic == 'pop':
+            return overwrites
+        if self.mnemonic == 'xor' and len(self.operands) == 2 and self.operands[1] == first:
+            return overwrites
+        return False
+
+    def _mentioned(self, operand):
+        return {self.target.canonical(r) for r in REGISTER_RE.findall(operand)}
+
+
+class PeepholeOptimizer:
+    def __init__(self, target='x86'):
+        self.target = TARGETS[target]
+        self.stats = {rule: 0 for rule in RULES}
+
+    def optimize(self, code):
+        lines = code.split('\n')
+        try:
+            text_start = lines.index('section .text')
+        except ValueError:
+            return code
+        head, body = lines[:text_start], [Line(text, self.target) for text in lines[text_start:]]
+
+        changed = True
+        while changed:
+            changed = False
+            for rule in (self._redundant_push_pop, self._store_load, self._jump_to_next, self._dead_move):
+                body, removed = rule(body)
+                changed = changed or removed
+
+        return '\n'.join(head + [line.text for line in body])
+
+    def report(self):
+        total = sum(self.stats.values())
+        lines = [f"Otimizador peephole: {total} instruções removidas"]
+        lines.extend(f"  {rule}: {count}" for rule, count in self.stats.items())
+        return '\n'.join(lines)
+
+    def _remove(self, body, indexes, rule):
+        self.stats[rule] += len(indexes)
+        return [line for i, line in enumerate(body) if i not in indexes], bool(indexes)
+
+    def _dead_after(self, body, index, register):
+        """O valor do registrador após body[index] nunca é lido (análise local até o próximo desvio)"""
+        for line in body[index + 1:]:
+            if line.label is not None:
+                return False
+            if not line.is_instruction:
+                continue
+            if line.reads(register):
+                return False
+            if line.kills(register):
+                return True
+            if line.mnemonic == 'jmp' or line.mnemonic in CONDITIONAL_JUMPS or line.mnemonic == 'ret':
+                return False
+        return False
+
+    def _matching_pop(self, body, index):
+        """Índice do pop que desfaz o push em body[index], ou None"""
+        stack_pointer = self.target.stack_pointer
+        depth = 0
+        for j in range(index + 1, len(body)):
+            line = body[j]
+            if line.label is not None:
+                return None
+            if not line.is_instruction:
+                continue
+            if line.mnemonic == 'push':
+                depth += 1
+            elif line.mnemonic == 'pop':
+                if depth == 0:
+                    return j
+                depth -= 1
+            elif line.mnemonic == 'call' and self.target.aligned_calls:
+                return None  # Remover o par desalinharia a pilha no call
+            elif line.mnemonic == 'add' and line.operands[0] == stack_pointer:
+                try:
+                    depth -= int(line.operands[1]) // self.target.word_size
+                except ValueError:
+                    return None
+                if depth < 0:
+                    return None
+            elif stack_pointer in line.text or line.mnemonic in ('jmp', 'ret') or line.mnemonic in CONDITIONAL_JUMPS:
+                if line.mnemonic == 'idiv' and depth > 0:
+                    continue  # idiv dword [esp] lê um valor empilhado dentro da janela
+                return None
+        return None
+
+    # Cada regra percorre o código uma vez e remove todas as ocorrências
+    # encontradas; optimize() repete as regras até não haver mudanças.
+
+    def _redundant_push_pop(self, body):
+        rule = RULES[0]
+        used = set()
+        for line in body:
+            if line.is_instruction and line.mnemonic not in ('push', 'pop'):
+                used |= line.registers()
+
+        removed = set()
+        for i, line in enumerate(body):
+            if i in removed or line.mnemonic != 'push' or line.operands[0] not in self.target.registers:
+                continue
+            register = line.operands[0]
+            j = self._matching_pop(body, i)
+            if j is None or j in removed or body[j].operands[0] != register:
+                continue
+            window = body[i + 1:j]
+            unchanged = not any(register in inner.writes() for inner in window if inner.is_instruction)
+            if register not in used or unchanged or self._dead_after(body, j, register):
+                removed.update((i, j))
+        return self._remove(body, removed, rule)
+
+    def _store_load(self, body):
+        rule = RULES[1]
+        accumulator = self.target.accumulator
+        removed = set()
+        for i in range(len(body) - 1):
+            store, load = body[i], body[i + 1]
+            if (i not in removed and store.mnemonic == 'mov' and load.mnemonic == 'mov'
+                    and store.operands[1] == accumulator and load.operands[0] == accumulator
+                    and load.operands[1] == store.operands[0]):
+                removed.add(i + 1)
+        return self._remove(body, removed, rule)
+
+    def _jump_to_next(self, body):
+        rule = RULES[2]
+        removed = set()
+        for i, line in enumerate(body):
+            if line.mnemonic != 'jmp' and line.mnemonic not in CONDITIONAL_JUMPS:
+                continue
+            for following in body[i + 1:]:
+                if following.label is None:
+                    break
+                if following.label == line.operands[0]:
+                    removed.add(i)
+                    break
+        return self._remove(body, removed, rule)
+
+    def _dead_move(self, body):
+        rule = RULES[3]
+        removed = set()
+        for i, line in enumerate(body):
+            if line.mnemonic != 'mov' or len(line.operands) != 2:
+                continue
+            dest, source = line.operands
+            if dest not in self.target.registers:
+                continue
+            if dest == source or self._dead_after(body, i, dest):
+                removed.add(i)
+        return self._remove(body, removed, rule)
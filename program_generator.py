@@ -0,0 +1,213 @@
+"""
+Gerador de programas LPMS sintéticos e válidos, para medir como as fases do
+compilador escalam com o tamanho da entrada (benchmarks/scaling.py).
+
+O programa é determinístico para uma semente e tem o tamanho controlado por:
+    statements    número aproximado de comandos (contando os aninhados)
+    nesting       profundidade máxima de if/while aninhados
+    expr_depth    profundidade máxima das expressões aritméticas
+    variables     variáveis de cada tipo (int, float, bool e str)
+    string_ratio  fração dos comandos simples que trabalham com strings
+                  (atribuições de str e print de literais) em vez de aritmética
+    with_input    inclui comandos input (o programa passa a ler da entrada)
+
+Todo programa gerado passa pela análise semântica: as variáveis são
+declaradas e inicializadas no início (e passam por um laço, para não serem
+constantes conhecidas pelo otimizador), as expressões respeitam os tipos e as
+condições são booleanas. Cada while conta até um limite pequeno com um
+contador próprio, que o corpo não altera, e as divisões são por literais
+diferentes de zero. Os valores, porém, não são limitados: os programas servem
+para medir o compilador, e executados podem dar overflow (os int do
+executável dão a volta; na VM, int grandes demais não convertem para float).
+
+Uso:
+    python program_generator.py [--statements N] [--seed N] [--nesting N] [--expr-depth N]
+                                [--variables N] [--string-ratio R] [--with-input] [-o arquivo.lps]
+"""
+import argparse
+import random
+import sys
+
+ARITHMETIC_OPERATORS = ('+', '-', '*', '/')
+COMPARISON_OPERATORS = ('<', '>', '<=', '>=')
+WORDS = ('total', 'valor', 'linha', 'soma', 'contagem', 'resultado', 'fim', 'media')
+
+# Limite de repetições de cada while: com while aninhados o número de
+# iterações é o produto dos limites
+LOOP_LIMIT = 3
+
+
+class ProgramGenerator:
+    def __init__(self, seed=0, nesting=3, expr_depth=3, variables=8, string_ratio=0.2, with_input=False):
+        if nesting < 0 or expr_depth < 1 or variables < 1 or not 0 <= string_ratio <= 1:
+            raise ValueError("nesting >= 0, expr_depth >= 1, variables >= 1 e 0 <= string_ratio <= 1")
+        self.rng = random.Random(seed)
+        self.nesting = nesting
+        self.expr_depth = expr_depth
+        self.string_ratio = string_ratio
+        self.with_input = with_input
+        self.ints = [f"i{index}" for index in range(variables)]
+        self.floats = [f"f{index}" for index in range(variables)]
+        self.bools = [f"b{index}" for index in range(variables)]
+        self.strings = [f"s{index}" for index in range(variables)]
+        self.int_operands = self.ints + ['LIMITE']  # A constante só é lida
+        self.counters = 0  # Contadores dos while: nomes novos, nunca alterados pelo corpo
+
+    def generate(self, statements, name='Sintetico'):
+        """Texto de um programa com cerca de statements comandos"""
+        lines = [f"Program {name} {{"]
+        for type_name, names in (('int', self.ints), ('float', self.floats), ('bool', self.bools),
+                                 ('str', self.strings)):
+            lines.append(f"    {type_name} {', '.join(names)};")
+        lines.append("    const int LIMITE = 100;")
+        lines.extend(f"    {name} = {index + 1};" for index, name in enumerate(self.ints))
+        lines.extend(f"    {name} = {index}.5;" for index, name in enumerate(self.floats))
+        lines.extend(f"    {name} = {'true' if index % 2 else 'false'};" for index, name in enumerate(self.bools))
+        lines.extend(f"    {name} = \"{self.rng.choice(WORDS)}\";" for name in self.strings)
+        # Os valores iniciais passam por um laço: depois dele as variáveis não são
+        # constantes, e o dobramento de constantes não avalia o programa inteiro
+        # em tempo de compilação (números que só crescem, sem o overflow da máquina)
+        lines.extend(["    int inicio;", "    inicio = 0;", "    while (inicio < 1) {"])
+        lines.extend(f"        {name} = {name} + inicio;" for name in self.ints + self.floats)
+        lines.extend(f"        {name} = inicio < {index % 2};" for index, name in enumerate(self.bools))
+        lines.extend(["        inicio = inicio + 1;", "    }"])
+        generated = len(lines) - 2
+        self._block(lines, max(statements - generated, 1), 1, in_loop=False)
+        lines.append("}")
+        return '\n'.join(lines) + '\n'
+
+    def _block(self, lines, statements, depth, in_loop):
+        """Acrescenta a lines um bloco de statements comandos, com a indentação de depth"""
+        rng = self.rng
+        indent = "    " * depth
+        remaining = statements
+        while remaining > 0:
+            if depth <= self.nesting and remaining > 2 and rng.random() < 0.15:
+                # Corpo pequeno: os blocos aninhados se repetem ao longo do programa
+                # em vez de um único bloco gigante no nível mais profundo
+                body = min(remaining - 1, rng.randint(1, 8))
+                remaining -= self._compound(lines, body, depth, indent, in_loop)
+            else:
+                lines.append(indent + self._simple(in_loop))
+                remaining -= 1
+
+    def _compound(self, lines, body, depth, indent, in_loop):
+        """if, if/else ou while com body comandos no corpo; retorna os comandos gerados"""
+        rng = self.rng
+        choice = rng.random()
+        if choice < 0.4:
+            counter = f"w{self.counters}"
+            self.counters += 1
+            lines.append(f"{indent}int {counter};")
+            lines.append(f"{indent}{counter} = 0;")
+            lines.append(f"{indent}while ({counter} < {LOOP_LIMIT}) {{")
+            self._block(lines, max(body - 1, 1), depth + 1, in_loop=True)
+            lines.append(f"{indent}    {counter} = {counter} + 1;")
+            lines.append(f"{indent}}}")
+            return body + 3
+        lines.append(f"{indent}if ({self._condition()}) {{")
+        if choice < 0.7:
+            self._block(lines, body, depth + 1, in_loop)
+            lines.append(f"{indent}}}")
+            return body + 1
+        then_size = max(body // 2, 1)
+        self._block(lines, then_size, depth + 1, in_loop)
+        lines.append(f"{indent}}} else {{")
+        self._block(lines, max(body - then_size, 1), depth + 1, in_loop)
+        lines.append(f"{indent}}}")
+        return body + 1
+
+    def _simple(self, in_loop):
+        rng = self.rng
+        if rng.random() < self.string_ratio:
+            if rng.random() < 0.5:
+                return f"{rng.choice(self.strings)} = \"{rng.choice(WORDS)} {rng.randrange(1000)}\";"
+            return (f"print(\"{rng.choice(WORDS)}: \", {rng.choice(self.strings)}, "
+                    f"\" \", {rng.choice(self.ints)});")
+        choice = rng.random()
+        if choice < 0.45:
+            return f"{rng.choice(self.ints)} = {self._int_expression(self.expr_depth)};"
+        if choice < 0.65:
+            return f"{rng.choice(self.floats)} = {self._float_expression(self.expr_depth)};"
+        if choice < 0.8:
+            return f"{rng.choice(self.bools)} = {self._condition()};"
+        others = []
+        if self.with_input:
+            others.append(f"input({rng.choice(self.ints)}, {rng.choice(self.floats)});")
+        if in_loop:
+            others.append("break;")
+        if choice < 0.9 or not others:
+            return f"print({self._int_expression(2)}, \" \", {rng.choice(self.floats)});"
+        return rng.choice(others)
+
+    def _int_expression(self, depth):
+        rng = self.rng
+        if depth <= 1 or rng.random() < 0.3:
+            return rng.choice(self.int_operands) if rng.random() < 0.6 else str(rng.randrange(1, 100))
+        operator = rng.choice(ARITHMETIC_OPERATORS)
+        left = self._int_expression(depth - 1)
+        # Divisão só por literal diferente de zero
+        right = str(rng.randrange(1, 10)) if operator == '/' else self._int_expression(depth - 1)
+        return f"({left} {operator} {right})"
+
+    def _float_expression(self, depth):
+        rng = self.rng
+        if depth <= 1 or rng.random() < 0.3:
+            roll = rng.random()
+            if roll < 0.5:
+                return rng.choice(self.floats)
+            if roll < 0.7:
+                return rng.choice(self.ints)
+            return f"{rng.randrange(100)}.{rng.randrange(10)}"
+        operator = rng.choice(ARITHMETIC_OPERATORS)
+        left = self._float_expression(depth - 1)
+        right = f"{rng.randrange(1, 10)}.5" if operator == '/' else self._float_expression(depth - 1)
+        return f"({left} {operator} {right})"
+
+    def _condition(self):
+        rng = self.rng
+        roll = rng.random()
+        comparison = (f"{self._int_expression(2)} {rng.choice(COMPARISON_OPERATORS)} "
+                      f"{self._int_expression(2)}")
+        if roll < 0.5:
+            return comparison
+        if roll < 0.7:
+            return f"!{comparison}"
+        if roll < 0.85:
+            return rng.choice(self.bools)
+        return f"{comparison} {rng.choice(('==', '!='))} {rng.choice(self.bools)}"
+
+
+def generate_program(statements, seed=0, **options):
+    """Atalho: texto de um programa com cerca de statements comandos (opções de ProgramGenerator)"""
+    return ProgramGenerator(seed, **options).generate(statements)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--statements', type=int, default=1000)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--nesting', type=int, default=3, help='profundidade máxima de if/while')
+    arg_parser.add_argument('--expr-depth', type=int, default=3, help='profundidade máxima das expressões')
+    arg_parser.add_argument('--variables', type=int, default=8, help='variáveis de cada tipo')
+    arg_parser.add_argument('--string-ratio', type=float, default=0.2,
+                            help='fração dos comandos simples com strings (0 = só aritmética)')
+    arg_parser.add_argument('--with-input', action='store_true', help='gera também comandos input')
+    arg_parser.add_argument('-o', '--output', help='arquivo de saída (padrão: stdout)')
+    args = arg_parser.parse_args()
+
+    try:
+        text = generate_program(args.statements, args.seed, nesting=args.nesting, expr_depth=args.expr_depth,
+                                variables=args.variables, string_ratio=args.string_ratio,
+                                with_input=args.with_input)
+    except ValueError as e:
+        arg_parser.error(str(e))
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+
+
+if __name__ == "__main__":
+    main()
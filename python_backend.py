@@ -0,0 +1,282 @@
+"""
+Backend Python estruturado: traduz a AST para uma função Python com while,
+if/else e break (sem goto) e a compila com compile() para execução em processo.
+
+As variáveis viram variáveis locais de main (prefixo v_, para não colidir com
+palavras reservadas e nomes do Python; s<id>_ para uma declarada num bloco
+interno com o nome de outra), as expressões viram expressões Python
+sem temporários, a entrada é lida de uma vez e consumida token a token e a
+saída vai direto para stdout.write. A E/S segue o runtime dos executáveis e a
+VM: print de string sem quebra de linha, de número seguido de '\\n' (booleanos
+como 0/1) e input lendo números separados por espaço (0 no fim da entrada).
+
+Os int também: têm int_bits bits e dão a volta como na VM. Como a volta
+comuta com +, - e *, uma expressão int é calculada com os int do Python e só
+reduzida a int_bits bits quando o valor sai da aritmética inteira (atribuição,
+print, comparação, divisão ou mistura com float), uma vez por uso e não a cada
+operação.
+
+Uso:
+    main = PythonGenerator(int_bits=32).compile(ast)
+    main(sys.stdin, sys.stdout)
+"""
+from parser import Node, NodeVisitor
+from tac import wrap_int
+
+# Operadores da linguagem que mudam na tradução
+PYTHON_OPERATORS = {'!': 'not '}
+
+PRELUDE = '''\
+def _div(left, right):
+    # Divisão inteira truncada em direção a zero, como idiv
+    if type(left) is int and type(right) is int:
+        quotient = abs(left) // abs(right)
+        return quotient if (left < 0) == (right < 0) else -quotient
+    return left / right
+
+
+def _show(value):
+    if value is True or value is False:
+        return '1\\n' if value else '0\\n'
+    return f"{value}\\n"
+
+
+def _read(tokens, bits):
+    if not tokens:
+        return 0
+    token = tokens.pop()
+    try:
+        value = int(token) & ((1 << bits) - 1)
+        return value - (1 << bits) if value >> (bits - 1) else value
+    except ValueError:
+        try:
+            return float(token)
+        except ValueError:
+            return 0
+'''
+
+
+# Limites do compilador do CPython: while aninhados (blocos estáticos) e blocos
+# aninhados (100 níveis de indentação, com main e o def ocupando dois)
+MAX_NESTED_LOOPS = 20
+MAX_NESTED_BLOCKS = 97
+# Expressões mais profundas que isso são quebradas em temporários (_t0, _t1, ...):
+# o CPython recusa mais de 200 parênteses aninhados
+MAX_EXPRESSION_DEPTH = 50
+
+
+class PythonBackendError(Exception):
+    """Programa válido que o Python não consegue compilar (aninhamento demais)"""
+
+
+class PythonGenerator(NodeVisitor):
+    """
+    Percorre a AST com o NodeVisitor iterativo. Os comandos emitem linhas; as
+    expressões devolvem (código, profundidade, largo), e uma subexpressão que
+    chega a MAX_EXPRESSION_DEPTH vai para um temporário calculado antes do
+    comando. largo indica um int que ainda pode estar fora de int_bits bits.
+    """
+    def __init__(self, int_bits=32):
+        self.int_bits = int_bits
+        self.lines = []
+        self.variables = {}  # Nome Python -> tipo declarado (str começa com '', os outros com 0)
+        self.names = {}      # Id do símbolo -> nome Python da variável
+        self.indent = 1
+        self.loop_depth = 0
+        self.temps = 0
+        self.reads_input = False
+
+    def generate(self, ast):
+        """Código-fonte do módulo com a função main(stdin, stdout)"""
+        self.lines = []
+        self.variables = {}
+        self.names = {}
+        self.indent = 1
+        self.loop_depth = 0
+        self.temps = 0
+        self.reads_input = False
+        self.visit(ast.children[1])
+
+        header = ["def main(stdin, stdout, _div=_div, _show=_show, _read=_read):",
+                  "    write = stdout.write"]
+        if self.reads_input:
+            # Sem input o programa não espera pelo fim da entrada
+            header[1:1] = ["    tokens = stdin.read().split()", "    tokens.reverse()"]
+        for name, var_type in self.variables.items():
+            header.append(f"    {name} = {repr('') if var_type == 'str' else 0}")
+        if not self.lines:
+            self.lines.append("    pass")
+        return PRELUDE + '\n\n' + '\n'.join(header + self.lines) + '\n'
+
+    def compile(self, ast, filename='<lpms>'):
+        """Compila o código gerado e devolve a função main"""
+        namespace = {}
+        exec(compile(self.generate(ast), filename, 'exec'), namespace)
+        return namespace['main']
+
+    def _emit(self, line):
+        self.lines.append('    ' * self.indent + line)
+
+    # ---- Comandos ----
+
+    def _block(self, node):
+        """Gerador (yield from) que emite node indentado um nível"""
+        if self.indent > MAX_NESTED_BLOCKS:  # O corpo de main tem indent 1
+            raise PythonBackendError(f"mais de {MAX_NESTED_BLOCKS} blocos if/while aninhados")
+        start = len(self.lines)
+        self.indent += 1
+        yield node
+        if len(self.lines) == start:
+            self._emit("pass")
+        self.indent -= 1
+
+    def _declare(self, node, var_type):
+        """
+        Registra a variável declarada em node. Uma que sombreia outra de mesmo
+        nome fica com o id do símbolo no nome (s3_x), que não colide com os v_...
+        """
+        name = f"v_{node.leaf}"
+        if node.symbol is not None:
+            if name in self.variables:
+                name = f"s{node.symbol.id}_{node.leaf}"
+            self.names[node.symbol.id] = name
+        self.variables.setdefault(name, var_type)
+        return name
+
+    def _name(self, node):
+        """Nome Python da variável de um nó ID"""
+        if node.symbol is not None and node.symbol.id in self.names:
+            return self.names[node.symbol.id]
+        return f"v_{node.leaf}"
+
+    def visit_Declaration(self, node):
+        var_type = node.children[0].leaf
+        for id_node in node.children[1:]:
+            self._declare(id_node, var_type)
+
+    def visit_ConstDecl(self, node):
+        var_type = node.children[0].leaf
+        name = self._declare(node, var_type)
+        value = self._literal_value(node.children[1])
+        if var_type == 'float' and isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+        self._emit(f"{name} = {value!r}")
+
+    def visit_Assignment(self, node):
+        value = yield node.children[1]
+        self._emit(f"{self._name(node.children[0])} = {self._narrow(value)}")
+
+    def visit_If(self, node):
+        condition, _, _ = yield node.children[0]
+        self._emit(f"if {condition}:")
+        yield from self._block(node.children[1])
+        if len(node.children) > 2:
+            self._emit("else:")
+            yield from self._block(node.children[2])
+
+    def visit_While(self, node):
+        if self.loop_depth >= MAX_NESTED_LOOPS:
+            raise PythonBackendError(f"mais de {MAX_NESTED_LOOPS} laços while aninhados")
+        start = len(self.lines)
+        condition, _, _ = yield node.children[0]
+        if len(self.lines) == start:
+            self._emit(f"while {condition}:")
+        else:
+            # A condição usa temporários: eles são recalculados no início de cada volta
+            temporaries = self.lines[start:]
+            del self.lines[start:]
+            self._emit("while True:")
+            self.lines.extend('    ' + line for line in temporaries)
+            self.indent += 1
+            self._emit(f"if not {condition}: break")
+            self.indent -= 1
+        self.loop_depth += 1
+        yield from self._block(node.children[1])
+        self.loop_depth -= 1
+
+    def visit_Break(self, node):
+        self._emit("break")
+
+    def visit_Print(self, node):
+        for expr in node.children:
+            if expr.type == 'Literal':
+                value = self._literal_value(expr)
+                text = value if isinstance(value, str) else _show_constant(value)
+                self._emit(f"write({text!r})")
+                continue
+            value = self._narrow((yield expr))
+            if expr.expr_type == 'bool':
+                self._emit(f"write('1\\n' if {value} else '0\\n')")
+            elif expr.expr_type == 'str':
+                self._emit(f"write({value})")
+            elif expr.expr_type in ('int', 'float'):
+                self._emit(f"write(f\"{{{value}}}\\n\")")
+            else:  # AST sem análise semântica
+                self._emit(f"write(_show({value}))")
+
+    def visit_Input(self, node):
+        self.reads_input = True
+        for id_node in node.children:
+            self._emit(f"{self._name(id_node)} = _read(tokens, {self.int_bits})")
+
+    # ---- Expressões ----
+
+    def visit_ID(self, node):
+        return self._name(node), 0, False  # As variáveis já estão reduzidas
+
+    def visit_Literal(self, node):
+        return repr(self._literal_value(node)), 0, False
+
+    def visit_UnaryOp(self, node):
+        operand, depth, wide = yield node.children[0]
+        operator = PYTHON_OPERATORS.get(node.leaf, node.leaf)
+        return self._nested(f"({operator}{operand})", depth + 1, node.expr_type == 'int')
+
+    def visit_BinOp(self, node):
+        left = yield node.children[0]
+        right = yield node.children[1]
+        depth = max(left[1], right[1]) + 1
+        if node.leaf in ('+', '-', '*') and node.expr_type == 'int':
+            return self._nested(f"({left[0]} {node.leaf} {right[0]})", depth, True)
+        left, right = self._narrow(left), self._narrow(right)
+        if node.leaf == '/':
+            if node.expr_type == 'float':
+                return self._nested(f"({left} / {right})", depth, False)
+            # Inteira (ou AST sem tipos); só mínimo / -1 sai da faixa
+            return self._nested(f"_div({left}, {right})", depth, node.expr_type == 'int')
+        return self._nested(f"({left} {node.leaf} {right})", depth, False)
+
+    visit_RelationalOp = visit_BinOp
+    visit_LogicalOp = visit_BinOp
+
+    def _nested(self, code, depth, wide):
+        if depth < MAX_EXPRESSION_DEPTH:
+            return code, depth, wide
+        name = f"_t{self.temps}"
+        self.temps += 1
+        self._emit(f"{name} = {code}")
+        return name, 0, wide
+
+    def _narrow(self, value):
+        """Código de value reduzido a int_bits bits (no complemento de dois), se largo"""
+        code, _, wide = value
+        if not wide:
+            return code
+        half = 1 << (self.int_bits - 1)
+        # Quase sempre o valor já está na faixa: a comparação sai mais barata que a máscara
+        return (f"(_w if {-half} <= (_w := {code}) <= {half - 1} "
+                f"else ((_w + {half}) & {2 * half - 1}) - {half})")
+
+    def _literal_value(self, node):
+        value = node.leaf
+        if isinstance(value, Node):  # Literal booleano
+            return value.leaf == 'true'
+        if isinstance(value, str):
+            return value.strip('"')
+        return wrap_int(value, self.int_bits)
+
+
+def _show_constant(value):
+    if isinstance(value, bool):
+        return '1\n' if value else '0\n'
+    return f"{value}\n"
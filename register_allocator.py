@@ -0,0 +1,194 @@
+"""
+Alocação de registradores por varredura linear (linear scan) sobre o TAC.
+
+Os temporários recebem registradores de acordo com seus intervalos de vida;
+quando faltam registradores, o intervalo que termina mais tarde é derramado
+(spill) para a memória. Os registradores que sobram são dados às variáveis
+mais usadas (com peso maior dentro de laços), que ficam em registrador
+durante todo o programa.
+
+As regiões dos laços não são percorridas por instrução nem por intervalo: a
+profundidade de laço de cada instrução sai de uma soma de prefixos (+1 no
+cabeçalho, -1 depois do salto de volta), e a extensão de um intervalo pelos
+laços que o alcançam, de buscas binárias sobre os laços ordenados.
+"""
+from bisect import bisect_left, bisect_right
+
+from tac import Op, JUMP_OPS
+
+# eax fica reservado como acumulador pelo gerador de código
+REGISTERS = ['ebx', 'ecx', 'esi', 'edi', 'edx']
+CALLEE_SAVED = ['ebx', 'esi', 'edi']
+
+LOOP_WEIGHT = 10
+
+
+class LiveInterval:
+    __slots__ = ('operand', 'start', 'end', 'register')
+
+    def __init__(self, operand, start):
+        self.operand = operand
+        self.start = start
+        self.end = start
+        self.register = None
+
+    def __repr__(self):
+        return f"LiveInterval({self.operand}, {self.start}, {self.end}, {self.register})"
+
+
+def find_loops(instructions):
+    """Regiões [cabeçalho, salto] de cada aresta de retorno (salto para um label anterior)"""
+    labels = {}
+    loops = []
+    for index, instr in enumerate(instructions):
+        if instr.op == Op.LABEL:
+            labels[instr.result] = index
+        elif instr.op in JUMP_OPS and instr.result in labels:
+            loops.append((labels[instr.result], index))
+    return loops
+
+
+class _RangeMax:
+    """Máximo de values[first:last] em tempo constante (tabela esparsa)"""
+
+    def __init__(self, values):
+        self.table = [values]
+        width = 1
+        while 2 * width <= len(values):
+            row = self.table[-1]
+            self.table.append([max(row[i], row[i + width]) for i in range(len(row) - width)])
+            width *= 2
+
+    def query(self, first, last):
+        if first >= last:
+            return -1
+        level = (last - first).bit_length() - 1
+        row = self.table[level]
+        return max(row[first], row[last - (1 << level)])
+
+
+def build_intervals(instructions, loops):
+    intervals = {}
+    first_is_use = set()
+    for index, instr in enumerate(instructions):
+        for operand in instr.uses():
+            if operand.is_temp:
+                if operand not in intervals:
+                    intervals[operand] = LiveInterval(operand, index)
+                    first_is_use.add(operand)
+                intervals[operand].end = index
+        result = instr.defines()
+        if result is not None and result.is_temp:
+            if result not in intervals:
+                intervals[result] = LiveInterval(result, index)
+            intervals[result].end = max(intervals[result].end, index)
+
+    # Um valor vivo na entrada de um laço precisa do registrador no laço inteiro
+    if loops:
+        _extend_over_loops(intervals.values(), loops, first_is_use)
+    return sorted(intervals.values(), key=lambda interval: interval.start)
+
+
+def _extend_over_loops(intervals, loops, first_is_use):
+    """
+    Estende cada intervalo aos laços em que o valor está vivo na entrada, até
+    não mudar mais. Um valor lido antes de ser definido está vivo na entrada de
+    todo laço que o intervalo toca; os outros, só nos laços cujo cabeçalho vem
+    depois do início do intervalo (o início deles então nunca muda).
+    """
+    by_header = sorted(loops)
+    headers = [header for header, _ in by_header]
+    back_edges = _RangeMax([back_edge for _, back_edge in by_header])
+    # Laços ordenados pelo salto de volta, com o menor cabeçalho de cada sufixo
+    by_back_edge = sorted(loops, key=lambda loop: loop[1])
+    ends = [back_edge for _, back_edge in by_back_edge]
+    lowest = [header for header, _ in by_back_edge] + [None]
+    for position in range(len(by_back_edge) - 2, -1, -1):
+        lowest[position] = min(lowest[position], lowest[position + 1])
+
+    for interval in intervals:
+        read_first = interval.operand in first_is_use
+        while True:
+            last = bisect_right(headers, interval.end)
+            if read_first:
+                end = back_edges.query(0, last)
+                reaching = lowest[bisect_left(ends, interval.start)]
+                start = interval.start if reaching is None else min(interval.start, reaching)
+            else:
+                end = back_edges.query(bisect_right(headers, interval.start), last)
+                start = interval.start
+            end = max(interval.end, end)
+            if (start, end) == (interval.start, interval.end):
+                break
+            interval.start, interval.end = start, end
+
+
+def linear_scan(intervals, registers):
+    """Atribui registradores aos intervalos. Retorna os intervalos derramados."""
+    # Pilha de registradores livres: os liberados por último são reusados
+    # primeiro, deixando o maior número possível de registradores para as variáveis
+    free = list(reversed(registers))
+    active = []
+    spilled = []
+    for interval in intervals:
+        # Libera os registradores dos intervalos que já terminaram. Um intervalo
+        # que termina onde outro começa pode ceder o registrador, pois os
+        # operandos são lidos antes do destino ser escrito.
+        for expired in [a for a in active if a.end <= interval.start]:
+            active.remove(expired)
+            free.append(expired.register)
+
+        if free:
+            interval.register = free.pop()
+            active.append(interval)
+        else:
+            victim = max(active, key=lambda a: a.end)
+            if victim.end > interval.end:
+                interval.register = victim.register
+                victim.register = None
+                active.remove(victim)
+                active.append(interval)
+                spilled.append(victim)
+            else:
+                spilled.append(interval)
+    return spilled
+
+
+def variable_weights(instructions, loops):
+    weights = {}
+    # Profundidade de laço por soma de prefixos: +1 no cabeçalho, -1 depois do salto de volta
+    depth_change = [0] * (len(instructions) + 1)
+    for header, back_edge in loops:
+        depth_change[header] += 1
+        depth_change[back_edge + 1] -= 1
+    depth = 0
+    for index, instr in enumerate(instructions):
+        depth += depth_change[index]
+        operands = list(instr.uses())
+        if instr.defines() is not None:
+            operands.append(instr.defines())
+        for operand in operands:
+            if operand.is_var:
+                weights[operand] = weights.get(operand, 0) + LOOP_WEIGHT ** depth
+    return weights
+
+
+def allocate_registers(instructions, registers=REGISTERS):
+    """
+    Retorna um dicionário operando -> registrador para temporários e variáveis.
+    Operandos ausentes do dicionário ficam na memória.
+    """
+    loops = find_loops(instructions)
+    intervals = build_intervals(instructions, loops)
+    linear_scan(intervals, registers)
+
+    allocation = {interval.operand: interval.register for interval in intervals if interval.register}
+
+    # Registradores não usados por temporários ficam com as variáveis mais quentes
+    used = set(allocation.values())
+    remaining = [register for register in registers if register not in used]
+    weights = variable_weights(instructions, loops)
+    hot = sorted(weights, key=lambda operand: (-weights[operand], operand.value))
+    for operand, register in zip(hot, remaining):
+        allocation[operand] = register
+    return allocation
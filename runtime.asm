@@ -0,0 +1,215 @@
+; Runtime freestanding dos executáveis LPMS (Linux i386, sem libc).
+;
+; Usado com NASMGenerator(runtime='freestanding'): o programa gerado define
+; _start e chama as rotinas abaixo, e tudo é ligado com ld.
+;
+; Convenção: o argumento vai em eax, o resultado volta em eax e todos os
+; outros registradores são preservados (os registradores alocados pelo
+; gerador continuam válidos depois da chamada).
+;
+;     rt_print_str   imprime a string terminada em 0 apontada por eax
+;     rt_print_int   imprime eax em decimal seguido de '\n'
+;     rt_read_int    lê um inteiro decimal da entrada para eax (0 no fim da entrada)
+;     rt_exit        descarrega a saída e termina o processo com status 0
+;
+; A saída fica num buffer e só é escrita (uma chamada write por buffer) quando
+; enche ou no rt_exit. A entrada é lida em blocos do mesmo tamanho.
+
+RT_BUF_SIZE equ 4096
+
+SYS_EXIT  equ 1
+SYS_READ  equ 3
+SYS_WRITE equ 4
+
+section .bss
+    rt_out_buf resb RT_BUF_SIZE
+    rt_in_buf  resb RT_BUF_SIZE
+    align 4
+    rt_out_len resd 1
+    rt_in_pos  resd 1
+    rt_in_end  resd 1
+
+section .text
+    global rt_print_str
+    global rt_print_int
+    global rt_read_int
+    global rt_exit
+
+; Escreve o buffer de saída (repete o write se a escrita for parcial)
+rt_flush:
+    pushad
+    mov ecx, rt_out_buf
+    mov edx, [rt_out_len]
+.write:
+    test edx, edx
+    jz .done
+    mov eax, SYS_WRITE
+    mov ebx, 1
+    int 0x80
+    test eax, eax
+    jle .done                   ; Erro de escrita: descarta o resto
+    add ecx, eax
+    sub edx, eax
+    jmp .write
+.done:
+    mov dword [rt_out_len], 0
+    popad
+    ret
+
+rt_print_str:
+    pushad
+    mov esi, eax
+    mov edi, [rt_out_len]
+.next:
+    mov al, [esi]
+    test al, al
+    jz .done
+    cmp edi, RT_BUF_SIZE
+    jb .store
+    mov [rt_out_len], edi
+    call rt_flush
+    xor edi, edi
+.store:
+    mov [rt_out_buf + edi], al
+    inc edi
+    inc esi
+    jmp .next
+.done:
+    mov [rt_out_len], edi
+    popad
+    ret
+
+rt_print_int:
+    pushad
+    mov edi, [rt_out_len]
+    cmp edi, RT_BUF_SIZE - 12   ; Sinal, até 10 dígitos e '\n'
+    jbe .room
+    call rt_flush
+    xor edi, edi
+.room:
+    sub esp, 12                 ; Rascunho: os dígitos são gerados do fim para o início
+    lea esi, [esp + 12]
+    mov ebx, eax                ; Guarda o sinal
+    test eax, eax
+    jns .digit
+    neg eax                     ; Sem sinal, -2147483648 também funciona
+.digit:
+    ; Divisão por 10 com multiplicação pelo inverso: q = (n * 0xCCCCCCCD) >> 35
+    mov ecx, eax
+    mov edx, 0xCCCCCCCD
+    mul edx
+    shr edx, 3
+    lea eax, [edx + edx * 4]
+    add eax, eax
+    sub ecx, eax                ; Resto = n - q * 10
+    add cl, '0'
+    dec esi
+    mov [esi], cl
+    mov eax, edx
+    test eax, eax
+    jnz .digit
+    test ebx, ebx
+    jns .copy
+    dec esi
+    mov byte [esi], '-'
+.copy:
+    lea ecx, [esp + 12]
+.copy_next:
+    mov al, [esi]
+    mov [rt_out_buf + edi], al
+    inc edi
+    inc esi
+    cmp esi, ecx
+    jb .copy_next
+    mov byte [rt_out_buf + edi], 10
+    inc edi
+    mov [rt_out_len], edi
+    add esp, 12
+    popad
+    ret
+
+; Próximo byte da entrada em eax, ou -1 no fim da entrada. Altera ebx, ecx e edx
+rt_getc:
+    mov ecx, [rt_in_pos]
+    cmp ecx, [rt_in_end]
+    jb .byte
+    mov eax, SYS_READ
+    xor ebx, ebx
+    mov ecx, rt_in_buf
+    mov edx, RT_BUF_SIZE
+    int 0x80
+    test eax, eax
+    jle .eof
+    mov [rt_in_end], eax
+    xor ecx, ecx
+.byte:
+    movzx eax, byte [rt_in_buf + ecx]
+    inc ecx
+    mov [rt_in_pos], ecx
+    ret
+.eof:
+    mov dword [rt_in_pos], 0
+    mov dword [rt_in_end], 0
+    mov eax, -1
+    ret
+
+rt_read_int:
+    push ebx
+    push ecx
+    push edx
+    push esi
+    push edi
+.skip:                          ; Pula espaços, tabulações e quebras de linha
+    call rt_getc
+    cmp eax, -1
+    je .eof
+    cmp eax, ' '
+    je .skip
+    lea ecx, [eax - 9]
+    cmp ecx, 4
+    jbe .skip
+    xor esi, esi                ; 1 se o número é negativo
+    cmp eax, '-'
+    jne .plus
+    inc esi
+    jmp .sign
+.plus:
+    cmp eax, '+'
+    jne .digits
+.sign:
+    call rt_getc
+.digits:
+    xor edi, edi
+.digit:
+    sub eax, '0'
+    cmp eax, 9
+    ja .end                     ; Não é dígito (o fim da entrada também cai aqui)
+    imul edi, edi, 10
+    add edi, eax
+    call rt_getc
+    jmp .digit
+.end:
+    cmp eax, -1 - '0'
+    je .value
+    dec dword [rt_in_pos]       ; Devolve o caractere que encerrou o número
+.value:
+    mov eax, edi
+    test esi, esi
+    jz .return
+    neg eax
+.return:
+    pop edi
+    pop esi
+    pop edx
+    pop ecx
+    pop ebx
+    ret
+.eof:
+    xor eax, eax
+    jmp .return
+
+rt_exit:
+    call rt_flush
+    mov eax, SYS_EXIT
+    xor ebx, ebx
+    int 0x80
@@ -0,0 +1,208 @@
+; Runtime freestanding dos executáveis LPMS para x86-64 (Linux, sem libc).
+;
+; Versão de 64 bits de runtime.asm, usada com NASM64Generator(runtime='freestanding').
+; As rotinas seguem a convenção System V AMD64: o argumento vai em rdi, o
+; resultado volta em rax e rcx, rdx, rsi, rdi e r8-r11 podem ser alterados.
+;
+;     rt_print_str   imprime a string terminada em 0 apontada por rdi
+;     rt_print_int   imprime rdi em decimal seguido de '\n'
+;     rt_read_int    lê um inteiro decimal da entrada para rax (0 no fim da entrada)
+;     rt_exit        descarrega a saída e termina o processo com status 0
+;
+; A saída fica num buffer e só é escrita (uma chamada write por buffer) quando
+; enche ou no rt_exit. A entrada é lida em blocos do mesmo tamanho.
+
+bits 64
+default rel
+
+RT_BUF_SIZE equ 4096
+
+SYS_READ  equ 0
+SYS_WRITE equ 1
+SYS_EXIT  equ 60
+
+section .note.GNU-stack noalloc noexec nowrite progbits
+
+section .bss
+    rt_out_buf resb RT_BUF_SIZE
+    rt_in_buf  resb RT_BUF_SIZE
+    align 8
+    rt_out_len resq 1
+    rt_in_pos  resq 1
+    rt_in_end  resq 1
+
+section .text
+    global rt_print_str
+    global rt_print_int
+    global rt_read_int
+    global rt_exit
+
+; Escreve o buffer de saída (repete o write se a escrita for parcial).
+; Altera rax, rcx, rdx, rsi, rdi e r11
+rt_flush:
+    lea rsi, [rt_out_buf]
+    mov rdx, [rt_out_len]
+.write:
+    test rdx, rdx
+    jz .done
+    mov eax, SYS_WRITE
+    mov edi, 1
+    syscall
+    test rax, rax
+    jle .done                   ; Erro de escrita: descarta o resto
+    add rsi, rax
+    sub rdx, rax
+    jmp .write
+.done:
+    mov qword [rt_out_len], 0
+    ret
+
+rt_print_str:
+    mov r8, rdi
+    lea r9, [rt_out_buf]
+    mov r10, [rt_out_len]
+.next:
+    mov al, [r8]
+    test al, al
+    jz .done
+    cmp r10, RT_BUF_SIZE
+    jb .store
+    mov [rt_out_len], r10
+    call rt_flush               ; Preserva r8, r9 e r10
+    xor r10d, r10d
+    mov al, [r8]
+.store:
+    mov [r9 + r10], al
+    inc r10
+    inc r8
+    jmp .next
+.done:
+    mov [rt_out_len], r10
+    ret
+
+rt_print_int:
+    mov r8, rdi                 ; Guarda o valor (rt_flush altera rdi)
+    mov r10, [rt_out_len]
+    cmp r10, RT_BUF_SIZE - 24   ; Sinal, até 20 dígitos e '\n'
+    jbe .room
+    call rt_flush
+    xor r10d, r10d
+.room:
+    sub rsp, 24                 ; Rascunho: os dígitos são gerados do fim para o início
+    lea rsi, [rsp + 24]
+    mov rax, r8
+    test rax, rax
+    jns .digit
+    neg rax                     ; Sem sinal, o menor inteiro também funciona
+.digit:
+    ; Divisão por 10 com multiplicação pelo inverso: q = (n * 0xCCCCCCCCCCCCCCCD) >> 67
+    mov rcx, rax
+    mov rdx, 0xCCCCCCCCCCCCCCCD
+    mul rdx
+    shr rdx, 3
+    lea rax, [rdx + rdx * 4]
+    add rax, rax
+    sub rcx, rax                ; Resto = n - q * 10
+    add cl, '0'
+    dec rsi
+    mov [rsi], cl
+    mov rax, rdx
+    test rax, rax
+    jnz .digit
+    test r8, r8
+    jns .copy
+    dec rsi
+    mov byte [rsi], '-'
+.copy:
+    lea r9, [rt_out_buf]
+    lea rcx, [rsp + 24]
+.copy_next:
+    mov al, [rsi]
+    mov [r9 + r10], al
+    inc r10
+    inc rsi
+    cmp rsi, rcx
+    jb .copy_next
+    mov byte [r9 + r10], 10
+    inc r10
+    mov [rt_out_len], r10
+    add rsp, 24
+    ret
+
+; Próximo byte da entrada em rax, ou -1 no fim da entrada.
+; Altera rax, rcx, rdx, rsi, rdi e r11
+rt_getc:
+    mov rcx, [rt_in_pos]
+    cmp rcx, [rt_in_end]
+    jb .byte
+    mov eax, SYS_READ
+    xor edi, edi
+    lea rsi, [rt_in_buf]
+    mov edx, RT_BUF_SIZE
+    syscall
+    test rax, rax
+    jle .eof
+    mov [rt_in_end], rax
+    xor ecx, ecx
+.byte:
+    lea rdx, [rt_in_buf]
+    movzx eax, byte [rdx + rcx]
+    inc rcx
+    mov [rt_in_pos], rcx
+    ret
+.eof:
+    mov qword [rt_in_pos], 0
+    mov qword [rt_in_end], 0
+    mov rax, -1
+    ret
+
+rt_read_int:
+.skip:                          ; Pula espaços, tabulações e quebras de linha
+    call rt_getc
+    cmp rax, -1
+    je .eof
+    cmp rax, ' '
+    je .skip
+    lea rcx, [rax - 9]
+    cmp rcx, 4
+    jbe .skip
+    xor r8d, r8d                ; 1 se o número é negativo
+    cmp rax, '-'
+    jne .plus
+    inc r8d
+    jmp .sign
+.plus:
+    cmp rax, '+'
+    jne .digits
+.sign:
+    call rt_getc
+.digits:
+    xor r9d, r9d
+.digit:
+    sub rax, '0'
+    cmp rax, 9
+    ja .end                     ; Não é dígito (o fim da entrada também cai aqui)
+    imul r9, r9, 10
+    add r9, rax
+    call rt_getc
+    jmp .digit
+.end:
+    cmp rax, -1 - '0'
+    je .value
+    dec qword [rt_in_pos]       ; Devolve o caractere que encerrou o número
+.value:
+    mov rax, r9
+    test r8d, r8d
+    jz .return
+    neg rax
+.return:
+    ret
+.eof:
+    xor eax, eax
+    ret
+
+rt_exit:
+    call rt_flush
+    mov eax, SYS_EXIT
+    xor edi, edi
+    syscall
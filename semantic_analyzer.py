@@ -1,43 +1,69 @@
-from parser import Node
+from parser import Node, NodeVisitor
 
 class Symbol:
-    def __init__(self, name, type, is_const=False, value=None):
+    # id é denso (0, 1, 2, ... na ordem das declarações): serve de índice de
+    # array no TAC (Operand.symbol) e nos backends
+    __slots__ = ('name', 'type', 'is_const', 'value', 'id', 'depth')
+
+    def __init__(self, name, type, is_const=False, value=None, id=None, depth=0):
         self.name = name
         self.type = type
         self.is_const = is_const
         self.value = value
+        self.id = id
+        self.depth = depth
 
 class SymbolTable:
+    """
+    Tabela de símbolos plana: um único dict de nome -> pilha de declarações
+    (a do topo é a visível) e, para cada escopo aberto, um log com os nomes
+    declarados nele, desfeito no exit_scope. lookup e declare custam O(1),
+    qualquer que seja a profundidade dos if/while aninhados.
+    """
     def __init__(self):
-        self.symbols = {}
-        self.scopes = [{}]  # Stack of scopes
-        
+        self.bindings = {}     # Nome -> pilha de Symbol
+        self.undo_logs = [[]]  # Nomes declarados em cada escopo aberto
+        self.symbols = []      # Todos os símbolos, indexados pelo id
+
     def enter_scope(self):
-        self.scopes.append({})
-        
+        self.undo_logs.append([])
+
     def exit_scope(self):
-        if len(self.scopes) > 1:
-            self.scopes.pop()
-            
+        if len(self.undo_logs) > 1:
+            bindings = self.bindings
+            for name in self.undo_logs.pop():
+                stack = bindings[name]
+                stack.pop()
+                if not stack:
+                    del bindings[name]
+
     def declare(self, name, type, is_const=False, value=None):
-        if name in self.scopes[-1]:
+        depth = len(self.undo_logs) - 1
+        stack = self.bindings.get(name)
+        if stack is None:
+            stack = self.bindings[name] = []
+        elif stack[-1].depth == depth:
             raise SemanticError(f"Váriavel '{name}' ja declarada.")
-        self.scopes[-1][name] = Symbol(name, type, is_const, value)
-        
+        symbol = Symbol(name, type, is_const, value, len(self.symbols), depth)
+        self.symbols.append(symbol)
+        stack.append(symbol)
+        self.undo_logs[-1].append(name)
+        return symbol
+
     def lookup(self, name):
-        # Search from inner to outer scope
-        for scope in reversed(self.scopes):
-            if name in scope:
-                return scope[name]
-        raise SemanticError(f"Variável '{name}' não declarada.")
+        stack = self.bindings.get(name)
+        if stack is None:
+            raise SemanticError(f"Variável '{name}' não declarada.")
+        return stack[-1]
 
 class SemanticError(Exception):
     pass
 
-class SemanticAnalyzer:
+class SemanticAnalyzer(NodeVisitor):
     def __init__(self):
         self.symbol_table = SymbolTable()
         self.errors = []
+        self.loop_depth = 0  # While abertos, para validar o break
         
     def analyze(self, ast):
         try:
@@ -49,22 +75,9 @@ class SemanticAnalyzer:
             self.errors.append(str(e))
             return False, self.errors
             
-    def visit(self, node):
-        if node is None:
-            return None
-            
-        method_name = f'visit_{node.type}'
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
-        
-    def generic_visit(self, node):
-        for child in node.children:
-            if isinstance(child, Node):
-                self.visit(child)
-    
     def visit_Program(self, node):
         # Visit all statements in the program
-        self.visit(node.children[1])  # statements node
+        yield node.children[1]  # statements node
         
     def visit_Declaration(self, node):
         type_node = node.children[0]
@@ -73,7 +86,7 @@ class SemanticAnalyzer:
         # Process all variables in declaration
         for id_node in node.children[1:]:
             var_name = id_node.leaf
-            self.symbol_table.declare(var_name, var_type)
+            id_node.symbol = self.symbol_table.declare(var_name, var_type)
             
     def visit_ConstDecl(self, node):
         type_node = node.children[0]
@@ -82,68 +95,115 @@ class SemanticAnalyzer:
         value_node = node.children[1]
         
         # Check if literal type matches declared type
-        if not self.check_type_compatibility(var_type, value_node):
+        if not self.check_type_compatibility(var_type, (yield value_node)):
             raise SemanticError(f"Erro de atribuiução de tipo para '{var_name}'")
             
-        self.symbol_table.declare(var_name, var_type, is_const=True, value=value_node.leaf)
+        node.symbol = self.symbol_table.declare(var_name, var_type, is_const=True, value=value_node.leaf)
         
     def visit_Assignment(self, node):
         var_name = node.children[0].leaf
         expr_node = node.children[1]
         
         # Check if variable exists
-        symbol = self.symbol_table.lookup(var_name)
+        symbol = node.children[0].symbol = self.symbol_table.lookup(var_name)
         
         # Check if trying to assign to constant
         if symbol.is_const:
             raise SemanticError(f"'{var_name}' é uma constante e não pode ser alterada")
             
         # Check type compatibility
-        expr_type = self.get_expression_type(expr_node)
+        expr_type = yield expr_node
         if not self.check_type_compatibility(symbol.type, expr_type):
             raise SemanticError(f"Erro de tipo em '{var_name}'")
             
     def visit_If(self, node):
         # Check condition type
-        condition_type = self.get_expression_type(node.children[0])
+        condition_type = yield node.children[0]
         if condition_type != 'bool':
             raise SemanticError("'IF' deve ser booleano")
             
         # Create new scope for if body
         self.symbol_table.enter_scope()
-        self.visit(node.children[1])  # Visit if body
+        yield node.children[1]  # Visit if body
         self.symbol_table.exit_scope()
         
         # If there's an else clause
         if len(node.children) > 2:
             self.symbol_table.enter_scope()
-            self.visit(node.children[2])  # Visit else body
+            yield node.children[2]  # Visit else body
             self.symbol_table.exit_scope()
             
     def visit_While(self, node):
         # Check condition type
-        condition_type = self.get_expression_type(node.children[0])
+        condition_type = yield node.children[0]
         if condition_type != 'bool':
             raise SemanticError("While deve ser booleano")
             
         # Create new scope for while body
         self.symbol_table.enter_scope()
-        self.visit(node.children[1])  # Visit while body
+        self.loop_depth += 1
+        yield node.children[1]  # Visit while body
+        self.loop_depth -= 1
         self.symbol_table.exit_scope()
+
+    def visit_Break(self, node):
+        if self.loop_depth == 0:
+            raise SemanticError("'break' fora de um laço while")
         
+    def visit_Print(self, node):
+        for expr_node in node.children:
+            yield expr_node
+
+    def visit_Input(self, node):
+        for id_node in node.children:
+            id_node.symbol = self.symbol_table.lookup(id_node.leaf)
+            id_node.expr_type = id_node.symbol.type
+
+    # ---- Expressões ----
+    # Cada nó é tipado uma única vez, de baixo para cima: o método devolve o tipo
+    # e o anota em node.expr_type (e o símbolo dos IDs em node.symbol) para o TAC
+
     def get_expression_type(self, node):
-        if node.type == 'Literal':
-            return self.get_literal_type(node.leaf)
-        elif node.type == 'ID':
-            symbol = self.symbol_table.lookup(node.leaf)
-            return symbol.type
-        elif node.type in ['BinOp', 'UnaryOp']:
-            return self.get_operation_type(node)
-        elif node.type in ['LogicalOp', 'RelationalOp']:
-            return 'bool'
-        raise SemanticError(f"Tipo desconhecido: {node.type}")
-        
+        if node.expr_type is not None:
+            return node.expr_type
+        return self.visit(node)
+
+    def visit_Literal(self, node):
+        node.expr_type = self.get_literal_type(node.leaf)
+        return node.expr_type
+
+    def visit_ID(self, node):
+        node.symbol = self.symbol_table.lookup(node.leaf)
+        node.expr_type = node.symbol.type
+        return node.expr_type
+
+    def visit_BinOp(self, node):
+        left_type = yield node.children[0]
+        right_type = yield node.children[1]
+        node.expr_type = self.get_operation_type(node.leaf, left_type, right_type)
+        return node.expr_type
+
+    def visit_UnaryOp(self, node):
+        operand_type = yield node.children[0]
+        if node.leaf == '-':
+            if operand_type not in ['int', 'float']:
+                raise SemanticError("Menos unário aplicado a tipo inválido")
+            node.expr_type = operand_type
+        else:  # '!'
+            node.expr_type = 'bool'
+        return node.expr_type
+
+    def visit_RelationalOp(self, node):
+        yield node.children[0]
+        yield node.children[1]
+        node.expr_type = 'bool'
+        return node.expr_type
+
+    visit_LogicalOp = visit_RelationalOp
+
     def get_literal_type(self, value):
+        if isinstance(value, Node):  # Literal booleano
+            return 'bool'
         if isinstance(value, int):
             return 'int'
         elif isinstance(value, float):
@@ -154,26 +214,14 @@ class SemanticAnalyzer:
             return 'bool'
         raise SemanticError(f"Tipo literal desconhecido para o valor: {value}")
         
-    def get_operation_type(self, node):
-        if node.type == 'UnaryOp':
-            if node.leaf == '-':
-                operand_type = self.get_expression_type(node.children[0])
-                if operand_type in ['int', 'float']:
-                    return operand_type
-                raise SemanticError("Menos unário aplicado a tipo inválido")
-            elif node.leaf == '!':
-                return 'bool'
-                
+    def get_operation_type(self, operator, left_type, right_type):
         # Binary operations
-        left_type = self.get_expression_type(node.children[0])
-        right_type = self.get_expression_type(node.children[1])
-        
-        if node.leaf in ['+', '-', '*', '/']:
+        if operator in ['+', '-', '*', '/']:
             if left_type == right_type and left_type in ['int', 'float']:
                 return left_type
             if 'float' in [left_type, right_type] and left_type in ['int', 'float'] and right_type in ['int', 'float']:
                 return 'float'
-            raise SemanticError(f"Tipo de operando inválido para o operador '{node.leaf}'")
+            raise SemanticError(f"Tipo de operando inválido para o operador '{operator}'")
             
     def check_type_compatibility(self, expected_type, actual_type):
         if expected_type == actual_type:
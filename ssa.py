@@ -0,0 +1,155 @@
+"""
+Construção e destrução da forma SSA sobre o TAC.
+
+Construção (Cytron et al.):
+    - funções phi são inseridas na fronteira de dominância iterada dos blocos
+      que definem cada operando, apenas onde ele está vivo (SSA podada);
+    - a renomeação percorre a árvore de dominadores dando um nome novo a cada
+      definição (x -> x.1, x.2, ...). O nome original continua valendo para
+      leituras que nenhuma definição alcança (o valor inicial da variável).
+
+Destruição: as funções phi são removidas e cada nome volta ao original. Isso
+só é correto enquanto as versões de um mesmo operando não interferem entre si,
+o que vale para a SSA recém-construída; quem transforma o programa em SSA
+(ver value_numbering.py) deve preservar essa propriedade.
+
+Blocos inalcançáveis não são renomeados e voltam inalterados.
+"""
+from cfg import ControlFlowGraph
+from dataflow import Liveness, solve
+from tac import Op, Operand, Quad
+
+
+def _renameable(operand):
+    return operand is not None and not operand.is_literal and not operand.is_label
+
+
+class SSAForm:
+    def __init__(self, instructions):
+        self.cfg = ControlFlowGraph(instructions)
+        self.original = {}  # Nome SSA -> operando original
+        self.versions = {}  # Operando original -> quantidade de versões
+        self.phis = 0
+        self._place_phis()
+        self._rename()
+
+    def sources(self, block):
+        """Origens dos argumentos das funções phi do bloco (None: a entrada do programa)"""
+        if block is self.cfg.entry:
+            return [None] + block.predecessors
+        return block.predecessors
+
+    def single_version(self, name):
+        """O nome SSA é a única versão do operando original"""
+        original = self.original.get(name)
+        return original is not None and self.versions[original] == 1
+
+    def _place_phis(self):
+        cfg = self.cfg
+        reachable = cfg.reverse_postorder()
+        definitions = {}  # Operando -> índices dos blocos que o definem
+        for block in reachable:
+            for instr in block.instructions:
+                defined = instr.defines()
+                if defined is not None:
+                    definitions.setdefault(defined, set()).add(block.index)
+
+        liveness = Liveness(cfg)
+        live_in = solve(liveness).inputs
+        frontiers = cfg.dominance_frontiers()
+        placed = [[] for _ in cfg.blocks]
+
+        for operand, blocks in definitions.items():
+            bit = liveness.mask(operand)  # 0: nunca vivo na entrada de um bloco
+            has_phi = set()
+            worklist = list(blocks)
+            while worklist:
+                for index in frontiers[worklist.pop()]:
+                    if index in has_phi:
+                        continue
+                    has_phi.add(index)
+                    if live_in[index] & bit:
+                        placed[index].append(operand)
+                    if index not in blocks:
+                        worklist.append(index)
+
+        for block in cfg.blocks:
+            if not placed[block.index]:
+                continue
+            arguments = len(self.sources(block))
+            phis = [Quad(Op.PHI, operand, [operand] * arguments) for operand in placed[block.index]]
+            position = 1 if block.label is not None else 0
+            block.instructions[position:position] = phis
+            self.phis += len(phis)
+
+    def _new_name(self, operand, stacks):
+        version = self.versions.get(operand, 0) + 1
+        self.versions[operand] = version
+        name = Operand(operand.kind, f"{operand.value}.{version}", operand.type, operand.symbol)
+        self.original[name] = operand
+        stacks.setdefault(operand, []).append(name)
+        return name
+
+    def _rename(self):
+        cfg = self.cfg
+        children = cfg.dominator_tree()
+        stacks = {}  # Operando original -> pilha de nomes SSA
+
+        def current(operand):
+            if not _renameable(operand):
+                return operand
+            names = stacks.get(operand)
+            return names[-1] if names else operand
+
+        # Percurso iterativo em pré-ordem; (bloco, False) desfaz os nomes ao sair
+        block_pushed = {}
+        work = [(cfg.entry, True)]
+        while work:
+            block, entering = work.pop()
+            if not entering:
+                for operand in block_pushed.pop(block.index):
+                    stacks[operand].pop()
+                continue
+
+            pushed = []
+            renamed = []
+            for instr in block.instructions:
+                if instr.op == Op.PHI:
+                    name = self._new_name(instr.result, stacks)
+                    pushed.append(instr.result)
+                    renamed.append(Quad(Op.PHI, name, list(instr.arg1)))
+                    continue
+                arg1, arg2 = current(instr.arg1), current(instr.arg2)
+                result = instr.result
+                if instr.defines() is not None:
+                    pushed.append(result)
+                    result = self._new_name(result, stacks)
+                renamed.append(Quad(instr.op, result, arg1, arg2))
+            block.instructions = renamed
+
+            for successor in block.successors:
+                position = self.sources(successor).index(block)
+                for instr in successor.instructions:
+                    if instr.op == Op.PHI:
+                        original = self.original.get(instr.result, instr.result)
+                        instr.arg1[position] = current(original)
+                    elif instr.op != Op.LABEL:
+                        break
+
+            block_pushed[block.index] = pushed
+            work.append((block, False))
+            for child in reversed(children[block.index]):
+                work.append((child, True))
+
+    def destruct(self):
+        """Remove as funções phi e devolve o TAC com os nomes originais"""
+        original = self.original
+        instructions = []
+        for block in self.cfg.blocks:
+            for instr in block.instructions:
+                if instr.op == Op.PHI:
+                    continue
+                instructions.append(Quad(instr.op, original.get(instr.result, instr.result),
+                                         original.get(instr.arg1, instr.arg1),
+                                         original.get(instr.arg2, instr.arg2)))
+        return instructions
@@ -0,0 +1,106 @@
+"""
+Cache das tabelas do PLY (lextab/parsetab).
+
+O lexer e o parser são construídos no import dos módulos. Sem cache, cada
+execução do compilador reconstrói a regex mestre do lexer e as tabelas LALR
+do parser. Aqui as tabelas são gravadas como módulos Python no pacote
+`tables/`, com o nome versionado por um hash da especificação
+(ex.: tables/parsetab_3f2a9c0e1b4d.py), e carregadas no modo optimize do PLY,
+que pula a validação da gramática.
+
+Como o nome do módulo muda junto com a gramática, uma tabela antiga nunca é
+carregada por engano. Para desabilitar o cache: LPMS_TABLE_CACHE=0.
+
+Uso para pregerar as tabelas (e remover as obsoletas):
+    python table_cache.py
+"""
+import os
+import types
+import zlib
+
+import ply
+
+TABLES_PACKAGE = 'tables'
+TABLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), TABLES_PACKAGE)
+
+
+def cache_enabled():
+    return os.environ.get('LPMS_TABLE_CACHE', '1') != '0'
+
+
+def _spec_items(namespace, prefix):
+    # Regras de tokens são strings (regex) ou funções (docstring = regex/produção)
+    for name in sorted(namespace):
+        if not name.startswith(prefix):
+            continue
+        value = namespace[name]
+        if isinstance(value, types.FunctionType):
+            yield f"{name}:{value.__doc__}"
+        elif isinstance(value, str):
+            yield f"{name}={value}"
+
+
+def spec_hash(namespace, prefix, *extra):
+    """Hash da especificação PLY: regras com o prefixo dado, tokens e extras"""
+    # zlib evita o custo de importar hashlib na inicialização
+    parts = [ply.__version__, repr(namespace.get('tokens'))]
+    parts.extend(repr(item) for item in extra)
+    parts.extend(_spec_items(namespace, prefix))
+    data = '\n'.join(parts).encode()
+    return f"{zlib.crc32(data):08x}{zlib.adler32(data):08x}"
+
+
+def lextab_name(namespace):
+    return f"lextab_{spec_hash(namespace, 't_', namespace.get('reserved'))}"
+
+
+def parsetab_name(namespace):
+    return f"parsetab_{spec_hash(namespace, 'p_', namespace.get('precedence'), namespace.get('start'))}"
+
+
+def lexer_options(namespace):
+    """Argumentos para lex.lex() usando a tabela em cache"""
+    if not cache_enabled():
+        return {}
+    return {
+        'optimize': True,
+        'lextab': f"{TABLES_PACKAGE}.{lextab_name(namespace)}",
+        'outputdir': TABLES_DIR,
+    }
+
+
+def parser_options(namespace):
+    """Argumentos para yacc.yacc() usando a tabela em cache"""
+    if not cache_enabled():
+        return {'debug': False, 'write_tables': False}
+    return {
+        'optimize': True,
+        'debug': False,
+        'tabmodule': f"{TABLES_PACKAGE}.{parsetab_name(namespace)}",
+        'outputdir': TABLES_DIR,
+    }
+
+
+def remove_stale_tables(current):
+    """Remove tabelas geradas que não correspondem à especificação atual"""
+    removed = []
+    for filename in os.listdir(TABLES_DIR):
+        name, ext = os.path.splitext(filename)
+        if ext != '.py' or not name.startswith(('lextab_', 'parsetab_')):
+            continue
+        if name not in current:
+            os.remove(os.path.join(TABLES_DIR, filename))
+            removed.append(filename)
+    return removed
+
+
+if __name__ == "__main__":
+    # Importar os módulos gera as tabelas que ainda não existem
+    import lexer
+    import parser
+
+    current = {lextab_name(vars(lexer)), parsetab_name(vars(parser))}
+    for filename in remove_stale_tables(current):
+        print(f"Removida tabela obsoleta: {filename}")
+    for name in sorted(current):
+        print(f"Tabela atual: {TABLES_PACKAGE}/{name}.py")
@@ -0,0 +1 @@
+"""Tabelas pregeradas do PLY (ver table_cache.py)."""
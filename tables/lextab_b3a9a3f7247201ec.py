@@ -0,0 +1,10 @@
+# lextab_b3a9a3f7247201ec.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('ASSIGN', 'BOOL', 'BOOL_TYPE', 'BREAK', 'COMMA', 'CONST', 'DIVIDE', 'ELSE', 'EQUALS', 'FALSE', 'FLOAT', 'GREATER', 'GREATEREQUAL', 'ID', 'IF', 'INPUT', 'INT', 'INTEGER', 'LBRACE', 'LESS', 'LESSEQUAL', 'LPAREN', 'MINUS', 'NOT', 'NOTEQUALS', 'PLUS', 'PRINT', 'PROGRAM', 'RBRACE', 'RPAREN', 'SEMICOLON', 'STRING', 'STRING_TYPE', 'TIMES', 'TRUE', 'WHILE'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_ID>[a-zA-Z][a-zA-Z0-9_]*)|(?P<t_FLOAT>\\d+\\.\\d+)|(?P<t_INTEGER>\\d+)|(?P<t_STRING>\\"([^\\\\\\n]|(\\\\.))*?\\")|(?P<t_newline>\\n+)|(?P<t_COMMENT>//.*)|(?P<t_PLUS>\\+)|(?P<t_TIMES>\\*)|(?P<t_EQUALS>==)|(?P<t_NOTEQUALS>!=)|(?P<t_GREATEREQUAL>>=)|(?P<t_LESSEQUAL><=)|(?P<t_LPAREN>\\()|(?P<t_RPAREN>\\))|(?P<t_LBRACE>\\{)|(?P<t_RBRACE>\\})|(?P<t_MINUS>-)|(?P<t_DIVIDE>/)|(?P<t_NOT>!)|(?P<t_GREATER>>)|(?P<t_LESS><)|(?P<t_ASSIGN>=)|(?P<t_COMMA>,)|(?P<t_SEMICOLON>;)', [None, ('t_ID', 'ID'), ('t_FLOAT', 'FLOAT'), ('t_INTEGER', 'INTEGER'), ('t_STRING', 'STRING'), None, None, ('t_newline', 'newline'), ('t_COMMENT', 'COMMENT'), (None, 'PLUS'), (None, 'TIMES'), (None, 'EQUALS'), (None, 'NOTEQUALS'), (None, 'GREATEREQUAL'), (None, 'LESSEQUAL'), (None, 'LPAREN'), (None, 'RPAREN'), (None, 'LBRACE'), (None, 'RBRACE'), (None, 'MINUS'), (None, 'DIVIDE'), (None, 'NOT'), (None, 'GREATER'), (None, 'LESS'), (None, 'ASSIGN'), (None, 'COMMA'), (None, 'SEMICOLON')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
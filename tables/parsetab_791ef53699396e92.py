@@ -0,0 +1,87 @@
+
+# parsetab_791ef53699396e92.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'rightUMINUSleftPLUSMINUSleftTIMESDIVIDEleftEQUALSNOTEQUALSleftGREATERLESSGREATEREQUALLESSEQUALleftNOTASSIGN BOOL BOOL_TYPE BREAK COMMA CONST DIVIDE ELSE EQUALS FALSE FLOAT FLOAT GREATER GREATEREQUAL ID IF INPUT INT INTEGER LBRACE LESS LESSEQUAL LPAREN MINUS NOT NOTEQUALS PLUS PRINT PROGRAM RBRACE RPAREN SEMICOLON STRING STRING_TYPE TIMES TRUE WHILEprogram : PROGRAM ID LBRACE statements RBRACEdeclaration : type ID_list SEMICOLON\n                  | CONST type ID ASSIGN literal SEMICOLONtype : INT\n            | FLOAT\n            | STRING_TYPE\n            | BOOL_TYPEID_list : ID_list COMMA ID\n               | IDstatements : statements statement\n                 | statementstatement : assignment\n                | if_statement\n                | while_statement\n                | break_statement\n                | print_statement\n                | input_statement\n                | declarationassignment : ID ASSIGN expression SEMICOLONif_statement : IF LPAREN expression RPAREN LBRACE statements RBRACE\n                   | IF LPAREN expression RPAREN LBRACE statements RBRACE ELSE LBRACE statements RBRACEwhile_statement : WHILE LPAREN expression RPAREN LBRACE statements RBRACEbreak_statement : BREAK SEMICOLONprint_statement : PRINT LPAREN print_args RPAREN SEMICOLONprint_args : expression\n                 | print_args COMMA expressioninput_statement : INPUT LPAREN input_args RPAREN SEMICOLONinput_args : ID\n                  | input_args COMMA IDexpression : logical_term\n                 | expression logical_operator logical_term\n                 | MINUS expression %prec UMINUSlogical_operator : EQUALS\n                       | NOTEQUALSlogical_term : relational_expression\n                   | NOT logical_termrelational_expression : arithmetic_expression\n                            | arithmetic_expression comparison_operator arithmetic_expressioncomparison_operator : GREATER\n                         | LESS\n                         | GREATEREQUAL\n                         | LESSEQUALarithmetic_expression : term\n                           | arithmetic_expression PLUS term\n                           | arithmetic_expression MINUS termterm : factor\n            | term TIMES factor\n            | term DIVIDE factorfactor : LPAREN arithmetic_expression RPAREN\n              | ID\n              | literalliteral : INTEGER\n               | FLOAT\n               | STRING\n               | booleanboolean : TRUE\n               | FALSE'
+    
+_lr_action_items = {'PROGRAM':([0,],[2,]),'$end':([1,27,],[0,-1,]),'ID':([2,4,6,7,8,9,10,11,12,13,14,20,22,23,24,25,26,28,29,30,31,32,33,36,40,42,46,60,61,63,64,65,66,69,70,71,72,73,74,75,76,77,82,84,94,95,96,98,101,102,103,104,105,107,108,109,],[3,5,5,-11,-12,-13,-14,-15,-16,-17,-18,35,-4,-5,-6,-7,37,-10,37,37,-23,37,59,62,37,37,37,-2,85,-19,37,-33,-34,37,37,37,-39,-40,-41,-42,37,37,37,99,5,5,-24,-27,5,5,-3,-20,-22,5,5,-21,]),'LBRACE':([3,79,80,106,],[4,94,95,107,]),'IF':([4,6,7,8,9,10,11,12,13,14,28,31,60,63,94,95,96,98,101,102,103,104,105,107,108,109,],[15,15,-11,-12,-13,-14,-15,-16,-17,-18,-10,-23,-2,-19,15,15,-24,-27,15,15,-3,-20,-22,15,15,-21,]),'WHILE':([4,6,7,8,9,10,11,12,13,14,28,31,60,63,94,95,96,98,101,102,103,104,105,107,108,109,],[16,16,-11,-12,-13,-14,-15,-16,-17,-18,-10,-23,-2,-19,16,16,-24,-27,16,16,-3,-20,-22,16,16,-21,]),'BREAK':([4,6,7,8,9,10,11,12,13,14,28,31,60,63,94,95,96,98,101,102,103,104,105,107,108,109,],[17,17,-11,-12,-13,-14,-15,-16,-17,-18,-10,-23,-2,-19,17,17,-24,-27,17,17,-3,-20,-22,17,17,-21,]),'PRINT':([4,6,7,8,9,10,11,12,13,14,28,31,60,63,94,95,96,98,101,102,103,104,105,107,108,109,],[18,18,-11,-12,-13,-14,-15,-16,-17,-18,-10,-23,-2,-19,18,18,-24,-27,18,18,-3,-20,-22,18,18,-21,]),'INPUT':([4,6,7,8,9,10,11,12,13,14,28,31,60,63,94,95,96,98,101,102,103,104,105,107,108,109,],[19,19,-11,-12,-13,-14,-15,-16,-17,-18,-10,-23,-2,-19,19,19,-24,-27,19,19,-3,-20,-22,19,19,-21,]),'CONST':([4,6,7,8,9,10,11,12,13,14,28,31,60,63,94,95,96,98,101,102,103,104,105,107,108,109,],[21,21,-11,-12,-13,-14,-15,-16,-17,-18,-10,-23,-2,-19,21,21,-24,-27,21,21,-3,-20,-22,21,21,-21,]),'INT':([4,6,7,8,9,10,11,12,13,14,21,28,31,60,63,94,95,96,98,101,102,103,104,105,107,108,109,],[22,22,-11,-12,-13,-14,-15,-16,-17,-18,22,-10,-23,-2,-19,22,22,-24,-27,22,22,-3,-20,-22,22,22,-21,]),'FLOAT':([4,6,7,8,9,10,11,12,13,14,21,26,28,29,30,31,32,40,42,46,60,63,64,65,66,69,70,71,72,73,74,75,76,77,82,86,94,95,96,98,101,102,103,104,105,107,108,109,],[23,23,-11,-12,-13,-14,-15,-16,-17,-18,23,49,-10,49,49,-23,49,49,49,49,-2,-19,49,-33,-34,49,49,49,-39,-40,-41,-42,49,49,49,49,23,23,-24,-27,23,23,-3,-20,-22,23,23,-21,]),'STRING_TYPE':([4,6,7,8,9,10,11,12,13,14,21,28,31,60,63,94,95,96,98,101,102,103,104,105,107,108,109,],[24,24,-11,-12,-13,-14,-15,-16,-17,-18,24,-10,-23,-2,-19,24,24,-24,-27,24,24,-3,-20,-22,24,24,-21,]),'BOOL_TYPE':([4,6,7,8,9,10,11,12,13,14,21,28,31,60,63,94,95,96,98,101,102,103,104,105,107,108,109,],[25,25,-11,-12,-13,-14,-15,-16,-17,-18,25,-10,-23,-2,-19,25,25,-24,-27,25,25,-3,-20,-22,25,25,-21,]),'ASSIGN':([5,62,],[26,86,]),'RBRACE':([6,7,8,9,10,11,12,13,14,28,31,60,63,96,98,101,102,103,104,105,108,109,],[27,-11,-12,-13,-14,-15,-16,-17,-18,-10,-23,-2,-19,-24,-27,104,105,-3,-20,-22,109,-21,]),'LPAREN':([15,16,18,19,26,29,30,32,40,42,46,64,65,66,69,70,71,72,73,74,75,76,77,82,],[29,30,32,33,46,46,46,46,46,46,46,46,-33,-34,46,46,46,-39,-40,-41,-42,46,46,46,]),'SEMICOLON':([17,34,35,37,38,39,41,43,44,45,47,48,49,50,51,52,53,67,68,81,83,85,87,88,89,90,91,92,93,100,],[31,60,-9,-50,63,-30,-35,-37,-43,-46,-51,-52,-53,-54,-55,-56,-57,-32,-36,96,98,-8,-31,-38,-44,-45,-47,-48,-49,103,]),'MINUS':([26,29,30,32,37,40,43,44,45,47,48,49,50,51,52,53,78,82,88,89,90,91,92,93,],[40,40,40,40,-50,40,71,-43,-46,-51,-52,-53,-54,-55,-56,-57,71,40,71,-44,-45,-47,-48,-49,]),'NOT':([26,29,30,32,40,42,64,65,66,82,],[42,42,42,42,42,42,42,-33,-34,42,]),'INTEGER':([26,29,30,32,40,42,46,64,65,66,69,70,71,72,73,74,75,76,77,82,86,],[48,48,48,48,48,48,48,48,-33,-34,48,48,48,-39,-40,-41,-42,48,48,48,48,]),'STRING':([26,29,30,32,40,42,46,64,65,66,69,70,71,72,73,74,75,76,77,82,86,],[50,50,50,50,50,50,50,50,-33,-34,50,50,50,-39,-40,-41,-42,50,50,50,50,]),'TRUE':([26,29,30,32,40,42,46,64,65,66,69,70,71,72,73,74,75,76,77,82,86,],[52,52,52,52,52,52,52,52,-33,-34,52,52,52,-39,-40,-41,-42,52,52,52,52,]),'FALSE':([26,29,30,32,40,42,46,64,65,66,69,70,71,72,73,74,75,76,77,82,86,],[53,53,53,53,53,53,53,53,-33,-34,53,53,53,-39,-40,-41,-42,53,53,53,53,]),'COMMA':([34,35,37,39,41,43,44,45,47,48,49,50,51,52,53,56,57,58,59,67,68,85,87,88,89,90,91,92,93,97,99,],[61,-9,-50,-30,-35,-37,-43,-46,-51,-52,-53,-54,-55,-56,-57,82,-25,84,-28,-32,-36,-8,-31,-38,-44,-45,-47,-48,-49,-26,-29,]),'TIMES':([37,44,45,47,48,49,50,51,52,53,89,90,91,92,93,],[-50,76,-46,-51,-52,-53,-54,-55,-56,-57,76,76,-47,-48,-49,]),'DIVIDE':([37,44,45,47,48,49,50,51,52,53,89,90,91,92,93,],[-50,77,-46,-51,-52,-53,-54,-55,-56,-57,77,77,-47,-48,-49,]),'PLUS':([37,43,44,45,47,48,49,50,51,52,53,78,88,89,90,91,92,93,],[-50,70,-43,-46,-51,-52,-53,-54,-55,-56,-57,70,70,-44,-45,-47,-48,-49,]),'GREATER':([37,43,44,45,47,48,49,50,51,52,53,89,90,91,92,93,],[-50,72,-43,-46,-51,-52,-53,-54,-55,-56,-57,-44,-45,-47,-48,-49,]),'LESS':([37,43,44,45,47,48,49,50,51,52,53,89,90,91,92,93,],[-50,73,-43,-46,-51,-52,-53,-54,-55,-56,-57,-44,-45,-47,-48,-49,]),'GREATEREQUAL':([37,43,44,45,47,48,49,50,51,52,53,89,90,91,92,93,],[-50,74,-43,-46,-51,-52,-53,-54,-55,-56,-57,-44,-45,-47,-48,-49,]),'LESSEQUAL':([37,43,44,45,47,48,49,50,51,52,53,89,90,91,92,93,],[-50,75,-43,-46,-51,-52,-53,-54,-55,-56,-57,-44,-45,-47,-48,-49,]),'EQUALS':([37,38,39,41,43,44,45,47,48,49,50,51,52,53,54,55,57,67,68,87,88,89,90,91,92,93,97,],[-50,65,-30,-35,-37,-43,-46,-51,-52,-53,-54,-55,-56,-57,65,65,65,65,-36,-31,-38,-44,-45,-47,-48,-49,65,]),'NOTEQUALS':([37,38,39,41,43,44,45,47,48,49,50,51,52,53,54,55,57,67,68,87,88,89,90,91,92,93,97,],[-50,66,-30,-35,-37,-43,-46,-51,-52,-53,-54,-55,-56,-57,66,66,66,66,-36,-31,-38,-44,-45,-47,-48,-49,66,]),'RPAREN':([37,39,41,43,44,45,47,48,49,50,51,52,53,54,55,56,57,58,59,67,68,78,87,88,89,90,91,92,93,97,99,],[-50,-30,-35,-37,-43,-46,-51,-52,-53,-54,-55,-56,-57,79,80,81,-25,83,-28,-32,-36,93,-31,-38,-44,-45,-47,-48,-49,-26,-29,]),'ELSE':([104,],[106,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'program':([0,],[1,]),'statements':([4,94,95,107,],[6,101,102,108,]),'statement':([4,6,94,95,101,102,107,108,],[7,28,7,7,28,28,7,28,]),'assignment':([4,6,94,95,101,102,107,108,],[8,8,8,8,8,8,8,8,]),'if_statement':([4,6,94,95,101,102,107,108,],[9,9,9,9,9,9,9,9,]),'while_statement':([4,6,94,95,101,102,107,108,],[10,10,10,10,10,10,10,10,]),'break_statement':([4,6,94,95,101,102,107,108,],[11,11,11,11,11,11,11,11,]),'print_statement':([4,6,94,95,101,102,107,108,],[12,12,12,12,12,12,12,12,]),'input_statement':([4,6,94,95,101,102,107,108,],[13,13,13,13,13,13,13,13,]),'declaration':([4,6,94,95,101,102,107,108,],[14,14,14,14,14,14,14,14,]),'type':([4,6,21,94,95,101,102,107,108,],[20,20,36,20,20,20,20,20,20,]),'ID_list':([20,],[34,]),'expression':([26,29,30,32,40,82,],[38,54,55,57,67,97,]),'logical_term':([26,29,30,32,40,42,64,82,],[39,39,39,39,39,68,87,39,]),'relational_expression':([26,29,30,32,40,42,64,82,],[41,41,41,41,41,41,41,41,]),'arithmetic_expression':([26,29,30,32,40,42,46,64,69,82,],[43,43,43,43,43,43,78,43,88,43,]),'term':([26,29,30,32,40,42,46,64,69,70,71,82,],[44,44,44,44,44,44,44,44,44,89,90,44,]),'factor':([26,29,30,32,40,42,46,64,69,70,71,76,77,82,],[45,45,45,45,45,45,45,45,45,45,45,91,92,45,]),'literal':([26,29,30,32,40,42,46,64,69,70,71,76,77,82,86,],[47,47,47,47,47,47,47,47,47,47,47,47,47,47,100,]),'boolean':([26,29,30,32,40,42,46,64,69,70,71,76,77,82,86,],[51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,]),'print_args':([32,],[56,]),'input_args':([33,],[58,]),'logical_operator':([38,54,55,57,67,97,],[64,64,64,64,64,64,]),'comparison_operator':([43,],[69,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> program","S'",1,None,None,None),
+  ('program -> PROGRAM ID LBRACE statements RBRACE','program',5,'p_program','parser.py',305),
+  ('declaration -> type ID_list SEMICOLON','declaration',3,'p_declaration','parser.py',309),
+  ('declaration -> CONST type ID ASSIGN literal SEMICOLON','declaration',6,'p_declaration','parser.py',310),
+  ('type -> INT','type',1,'p_type','parser.py',317),
+  ('type -> FLOAT','type',1,'p_type','parser.py',318),
+  ('type -> STRING_TYPE','type',1,'p_type','parser.py',319),
+  ('type -> BOOL_TYPE','type',1,'p_type','parser.py',320),
+  ('ID_list -> ID_list COMMA ID','ID_list',3,'p_ID_list','parser.py',328),
+  ('ID_list -> ID','ID_list',1,'p_ID_list','parser.py',329),
+  ('statements -> statements statement','statements',2,'p_statements','parser.py',337),
+  ('statements -> statement','statements',1,'p_statements','parser.py',338),
+  ('statement -> assignment','statement',1,'p_statement','parser.py',346),
+  ('statement -> if_statement','statement',1,'p_statement','parser.py',347),
+  ('statement -> while_statement','statement',1,'p_statement','parser.py',348),
+  ('statement -> break_statement','statement',1,'p_statement','parser.py',349),
+  ('statement -> print_statement','statement',1,'p_statement','parser.py',350),
+  ('statement -> input_statement','statement',1,'p_statement','parser.py',351),
+  ('statement -> declaration','statement',1,'p_statement','parser.py',352),
+  ('assignment -> ID ASSIGN expression SEMICOLON','assignment',4,'p_assignment','parser.py',356),
+  ('if_statement -> IF LPAREN expression RPAREN LBRACE statements RBRACE','if_statement',7,'p_if_statement','parser.py',360),
+  ('if_statement -> IF LPAREN expression RPAREN LBRACE statements RBRACE ELSE LBRACE statements RBRACE','if_statement',11,'p_if_statement','parser.py',361),
+  ('while_statement -> WHILE LPAREN expression RPAREN LBRACE statements RBRACE','while_statement',7,'p_while_statement','parser.py',368),
+  ('break_statement -> BREAK SEMICOLON','break_statement',2,'p_break_statement','parser.py',372),
+  ('print_statement -> PRINT LPAREN print_args RPAREN SEMICOLON','print_statement',5,'p_print_statement','parser.py',376),
+  ('print_args -> expression','print_args',1,'p_print_args','parser.py',380),
+  ('print_args -> print_args COMMA expression','print_args',3,'p_print_args','parser.py',381),
+  ('input_statement -> INPUT LPAREN input_args RPAREN SEMICOLON','input_statement',5,'p_input_statement','parser.py',389),
+  ('input_args -> ID','input_args',1,'p_input_args','parser.py',393),
+  ('input_args -> input_args COMMA ID','input_args',3,'p_input_args','parser.py',394),
+  ('expression -> logical_term','expression',1,'p_expression','parser.py',402),
+  ('expression -> expression logical_operator logical_term','expression',3,'p_expression','parser.py',403),
+  ('expression -> MINUS expression','expression',2,'p_expression','parser.py',404),
+  ('logical_operator -> EQUALS','logical_operator',1,'p_logical_operator','parser.py',413),
+  ('logical_operator -> NOTEQUALS','logical_operator',1,'p_logical_operator','parser.py',414),
+  ('logical_term -> relational_expression','logical_term',1,'p_logical_term','parser.py',418),
+  ('logical_term -> NOT logical_term','logical_term',2,'p_logical_term','parser.py',419),
+  ('relational_expression -> arithmetic_expression','relational_expression',1,'p_relational_expression','parser.py',426),
+  ('relational_expression -> arithmetic_expression comparison_operator arithmetic_expression','relational_expression',3,'p_relational_expression','parser.py',427),
+  ('comparison_operator -> GREATER','comparison_operator',1,'p_comparison_operator','parser.py',434),
+  ('comparison_operator -> LESS','comparison_operator',1,'p_comparison_operator','parser.py',435),
+  ('comparison_operator -> GREATEREQUAL','comparison_operator',1,'p_comparison_operator','parser.py',436),
+  ('comparison_operator -> LESSEQUAL','comparison_operator',1,'p_comparison_operator','parser.py',437),
+  ('arithmetic_expression -> term','arithmetic_expression',1,'p_arithmetic_expression','parser.py',441),
+  ('arithmetic_expression -> arithmetic_expression PLUS term','arithmetic_expression',3,'p_arithmetic_expression','parser.py',442),
+  ('arithmetic_expression -> arithmetic_expression MINUS term','arithmetic_expression',3,'p_arithmetic_expression','parser.py',443),
+  ('term -> factor','term',1,'p_term','parser.py',450),
+  ('term -> term TIMES factor','term',3,'p_term','parser.py',451),
+  ('term -> term DIVIDE factor','term',3,'p_term','parser.py',452),
+  ('factor -> LPAREN arithmetic_expression RPAREN','factor',3,'p_factor','parser.py',459),
+  ('factor -> ID','factor',1,'p_factor','parser.py',460),
+  ('factor -> literal','factor',1,'p_factor','parser.py',461),
+  ('literal -> INTEGER','literal',1,'p_literal','parser.py',470),
+  ('literal -> FLOAT','literal',1,'p_literal','parser.py',471),
+  ('literal -> STRING','literal',1,'p_literal','parser.py',472),
+  ('literal -> boolean','literal',1,'p_literal','parser.py',473),
+  ('boolean -> TRUE','boolean',1,'p_boolean','parser.py',477),
+  ('boolean -> FALSE','boolean',1,'p_boolean','parser.py',478),
+]
@@ -0,0 +1,227 @@
+from enum import IntEnum
+
+
+class Op(IntEnum):
+    # Declarações e E/S
+    DECLARE = 0
+    INPUT = 1
+    PRINT = 2
+
+    # Cópia e operações aritméticas
+    COPY = 3
+    ADD = 4
+    SUB = 5
+    MUL = 6
+    DIV = 7
+
+    # Operações relacionais e lógicas
+    GT = 8
+    LT = 9
+    GE = 10
+    LE = 11
+    EQ = 12
+    NE = 13
+
+    # Operações unárias
+    NEG = 14
+    NOT = 15
+
+    # Controle de fluxo
+    LABEL = 16
+    GOTO = 17
+    IF_FALSE = 18
+
+    # Forma SSA (só existe entre a construção e a destruição, ver ssa.py)
+    PHI = 19
+
+
+class OperandKind(IntEnum):
+    TEMP = 0
+    VAR = 1
+    LITERAL = 2
+    LABEL = 3
+
+
+# Mapeamento entre os operadores da linguagem e os opcodes do TAC
+BINARY_OPS = {
+    '+': Op.ADD, '-': Op.SUB, '*': Op.MUL, '/': Op.DIV,
+    '>': Op.GT, '<': Op.LT, '>=': Op.GE, '<=': Op.LE,
+    '==': Op.EQ, '!=': Op.NE,
+}
+UNARY_OPS = {'-': Op.NEG, '!': Op.NOT}
+
+OP_SYMBOLS = {op: symbol for symbol, op in BINARY_OPS.items()}
+OP_SYMBOLS.update({op: symbol for symbol, op in UNARY_OPS.items()})
+
+ARITHMETIC_OPS = frozenset((Op.ADD, Op.SUB, Op.MUL, Op.DIV))
+COMPARISON_OPS = frozenset((Op.GT, Op.LT, Op.GE, Op.LE, Op.EQ, Op.NE))
+BINARY_OPCODES = ARITHMETIC_OPS | COMPARISON_OPS
+UNARY_OPCODES = frozenset((Op.NEG, Op.NOT))
+JUMP_OPS = frozenset((Op.GOTO, Op.IF_FALSE))
+
+
+# Tipos da linguagem, como resolvidos pela análise semântica
+TYPES = ('int', 'float', 'str', 'bool')
+
+
+def literal_type(value):
+    """Tipo da linguagem de um valor literal do TAC"""
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, int):
+        return 'int'
+    if isinstance(value, float):
+        return 'float'
+    if isinstance(value, str):
+        return 'str'
+    return None
+
+
+def wrap_int(value, bits):
+    """value com bits bits no complemento de dois, como nos registradores; float fica como está"""
+    if type(value) is not int:
+        return value
+    value &= (1 << bits) - 1
+    return value - (1 << bits) if value >> (bits - 1) else value
+
+
+class Operand:
+    """
+    Operando de uma quádrupla: temporário, variável, literal ou label.
+
+    type é o tipo da linguagem (um de TYPES) vindo da AST anotada, ou None
+    (labels, ou TAC gerado sem análise semântica). symbol é o id denso do
+    símbolo de uma variável declarada (SymbolTable.symbols[symbol]), para os
+    backends indexarem arrays por ele, ou None. O tipo não faz parte da
+    identidade do operando, mas o símbolo faz: uma variável declarada num bloco
+    interno com o nome de outra é outro operando, com seu próprio valor.
+    """
+    __slots__ = ('kind', 'value', 'type', 'symbol')
+
+    def __init__(self, kind, value, type=None, symbol=None):
+        self.kind = kind
+        self.value = value
+        self.type = type
+        self.symbol = symbol
+
+    @property
+    def is_temp(self):
+        return self.kind == OperandKind.TEMP
+
+    @property
+    def is_var(self):
+        return self.kind == OperandKind.VAR
+
+    @property
+    def is_literal(self):
+        return self.kind == OperandKind.LITERAL
+
+    @property
+    def is_label(self):
+        return self.kind == OperandKind.LABEL
+
+    @property
+    def is_string(self):
+        return self.kind == OperandKind.LITERAL and isinstance(self.value, str)
+
+    def __eq__(self, other):
+        return (isinstance(other, Operand) and self.kind == other.kind
+                and type(self.value) is type(other.value) and self.value == other.value
+                and self.symbol == other.symbol)
+
+    def __hash__(self):
+        return hash((self.kind, type(self.value), self.value, self.symbol))
+
+    def __str__(self):
+        if isinstance(self.value, bool):
+            return 'true' if self.value else 'false'
+        return str(self.value)
+
+    def __repr__(self):
+        return f"Operand({self.kind.name}, {self.value!r})"
+
+
+def temp(name, type=None):
+    return Operand(OperandKind.TEMP, name, type)
+
+
+def var(name, type=None, symbol=None):
+    return Operand(OperandKind.VAR, name, type, symbol)
+
+
+def literal(value):
+    return Operand(OperandKind.LITERAL, value, literal_type(value))
+
+
+def label(name):
+    return Operand(OperandKind.LABEL, name)
+
+
+class Quad:
+    """
+    Instrução de três endereços no formato de quádrupla (op, arg1, arg2, result).
+
+    Convenções:
+        DECLARE/INPUT  result = variável
+        DECLARE const  result = variável, arg1 = valor literal da constante
+        PRINT          arg1 = valor
+        COPY           result = arg1
+        binárias       result = arg1 op arg2
+        unárias        result = op arg1
+        LABEL/GOTO     result = label
+        IF_FALSE       if not arg1 goto result
+        PHI            result = phi(arg1[0], arg1[1], ...), um argumento por predecessor
+    """
+    __slots__ = ('op', 'arg1', 'arg2', 'result')
+
+    def __init__(self, op, result=None, arg1=None, arg2=None):
+        self.op = op
+        self.result = result
+        self.arg1 = arg1
+        self.arg2 = arg2
+
+    def uses(self):
+        """Operandos lidos pela instrução"""
+        op = self.op
+        if op in BINARY_OPCODES:
+            return (self.arg1, self.arg2)
+        if op in UNARY_OPCODES or op in (Op.COPY, Op.PRINT, Op.IF_FALSE):
+            return (self.arg1,)
+        if op == Op.PHI:
+            return tuple(self.arg1)
+        return ()
+
+    def defines(self):
+        """Operando escrito pela instrução (ou None)"""
+        if self.op in BINARY_OPCODES or self.op in UNARY_OPCODES or self.op in (Op.COPY, Op.INPUT, Op.PHI):
+            return self.result
+        return None
+
+    def __str__(self):
+        op = self.op
+        if op == Op.DECLARE:
+            if self.arg1 is not None:
+                return f"DECLARE {self.result} = {self.arg1}"
+            return f"DECLARE {self.result}"
+        if op == Op.INPUT:
+            return f"INPUT {self.result}"
+        if op == Op.PRINT:
+            return f"PRINT {self.arg1}"
+        if op == Op.COPY:
+            return f"{self.result} = {self.arg1}"
+        if op in BINARY_OPCODES:
+            return f"{self.result} = {self.arg1} {OP_SYMBOLS[op]} {self.arg2}"
+        if op in UNARY_OPCODES:
+            return f"{self.result} = {OP_SYMBOLS[op]}{self.arg1}"
+        if op == Op.LABEL:
+            return f"{self.result}:"
+        if op == Op.GOTO:
+            return f"goto {self.result}"
+        if op == Op.IF_FALSE:
+            return f"if not {self.arg1} goto {self.result}"
+        if op == Op.PHI:
+            return f"{self.result} = phi({', '.join(str(arg) for arg in self.arg1)})"
+        raise ValueError(f"Opcode desconhecido: {op}")
+
+    def __repr__(self):
+        return f"Quad({self})"
@@ -0,0 +1,29 @@
+"""
+Alvos do compilador: o gerador de código e as opções do nasm e do ligador de
+cada arquitetura. Compartilhado pela linha de comando (main.py) e pela API de
+biblioteca (compiler_api.py).
+"""
+import os
+
+from nasm64_generator import NASM64Generator
+from nasm_generator import NASMGenerator
+
+# Opções do backend de cada arquitetura (fazem parte da chave do cache de artefatos)
+TARGETS = {
+    'x86': {
+        'generator': NASMGenerator,
+        'format': 'elf32',
+        'link': ['-m32', '-no-pie'],  # -no-pie desabilita PIE para compatibilidade
+        'ld': ['-m', 'elf_i386'],     # Runtime freestanding: sem libc nem gcc
+        'runtime': 'runtime.asm',
+    },
+    'x86-64': {
+        'generator': NASM64Generator,
+        'format': 'elf64',
+        'link': [],                   # Código relativo a rip: funciona com PIE e sem multilib
+        'ld': ['-m', 'elf_x86_64'],
+        'runtime': 'runtime64.asm',
+    },
+}
+# Diretório do compilador (onde ficam runtime.asm e runtime64.asm)
+ROOT = os.path.dirname(os.path.abspath(__file__))
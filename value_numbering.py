@@ -0,0 +1,108 @@
+"""
+Numeração global de valores (GVN) sobre a forma SSA.
+
+Percorre a árvore de dominadores (Briggs, Cooper e Simpson) numerando cada
+valor: cópias herdam o número da origem, uma phi cujos argumentos têm todos o
+mesmo número também o herda, e cada expressão é identificada pelo opcode e
+pelos números dos operandos (ordenados nas operações comutativas). Quando a
+mesma chave já foi calculada num bloco dominador, a instrução é redundante:
+    - se o destino é um temporário, ela é removida e os usos passam a ler o
+      valor já calculado;
+    - se o destino é uma variável, vira uma cópia do valor já calculado.
+
+Só nomes com uma única versão em SSA (os temporários) são usados como valor já
+calculado, então estender a vida deles não faz versões de uma mesma variável
+interferirem e a destruição da SSA continua sendo só voltar aos nomes originais.
+"""
+from dataflow import COMMUTATIVE_OPS
+from ssa import SSAForm
+from tac import Op, Quad, BINARY_OPCODES, UNARY_OPCODES
+
+
+class GlobalValueNumbering:
+    def __init__(self):
+        self.redundant = 0
+        self.phis = 0
+
+    def run(self, instructions):
+        ssa = SSAForm(instructions)
+        self.phis += ssa.phis
+        cfg = ssa.cfg
+        children = cfg.dominator_tree()
+
+        numbers = {}   # Nome SSA ou literal -> número do valor
+        table = {}     # (op, número, número) -> nome que já contém o valor
+        replace = {}   # Temporário removido -> nome que o substitui
+
+        def number(operand):
+            value = numbers.get(operand)
+            if value is None:
+                value = numbers[operand] = len(numbers)
+            return value
+
+        def rewrite(operand):
+            return replace.get(operand, operand)
+
+        work = [(cfg.entry, True)]
+        scopes = {}
+        while work:
+            block, entering = work.pop()
+            if not entering:
+                for key in scopes.pop(block.index):
+                    del table[key]
+                continue
+
+            added = []
+            kept = []
+            for instr in block.instructions:
+                op = instr.op
+                if op == Op.PHI:
+                    arguments = [rewrite(arg) for arg in instr.arg1]
+                    known = {numbers.get(arg) for arg in arguments}
+                    if len(known) == 1 and None not in known:
+                        numbers[instr.result] = known.pop()
+                    else:
+                        number(instr.result)
+                    kept.append(Quad(Op.PHI, instr.result, arguments))
+                    continue
+
+                arg1, arg2 = rewrite(instr.arg1), rewrite(instr.arg2)
+                result = instr.result
+
+                if op == Op.COPY:
+                    numbers[result] = number(arg1)
+                elif op in BINARY_OPCODES or op in UNARY_OPCODES:
+                    left = number(arg1)
+                    right = number(arg2) if op in BINARY_OPCODES else None
+                    if op in COMMUTATIVE_OPS and right < left:
+                        left, right = right, left
+                    key = (op, left, right)
+                    leader = table.get(key)
+                    if leader is not None:
+                        self.redundant += 1
+                        numbers[result] = numbers[leader]
+                        if result.is_temp and ssa.single_version(result):
+                            replace[result] = leader
+                            continue
+                        op, arg1, arg2 = Op.COPY, leader, None
+                    else:
+                        number(result)
+                        if ssa.single_version(result):
+                            table[key] = result
+                            added.append(key)
+                elif op == Op.INPUT:
+                    number(result)
+
+                kept.append(Quad(op, result, arg1, arg2))
+            block.instructions = kept
+
+            scopes[block.index] = added
+            work.append((block, False))
+            for child in reversed(children[block.index]):
+                work.append((child, True))
+
+        return ssa.destruct()
+
+    def report(self):
+        return (f"Numeração global de valores: {self.phis} funções phi na SSA, "
+                f"{self.redundant} expressões redundantes eliminadas")
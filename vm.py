@@ -0,0 +1,348 @@
+"""
+Máquina virtual de bytecode para executar programas LPMS sem nasm nem gcc.
+
+O TAC é traduzido para um bytecode compacto: um array de inteiros em que cada
+instrução é o opcode seguido dos operandos. Variáveis, temporários e literais
+viram slots numerados de uma única lista (os literais já começam com o seu
+valor), então todo operando é um índice, e os labels viram posições absolutas
+no array. As variáveis declaradas ocupam os primeiros slots, no id do seu
+símbolo (Operand.symbol); temporários e literais vêm depois.
+
+Superinstruções (com superinstructions=True):
+    t = a < b; if not t goto L   ->  JUMP_IF_NOT_LT a b L   (e os outros 5 relacionais)
+    t = a + b; x = t             ->  ADD x a b              (qualquer operação seguida da cópia)
+quando o temporário t não é lido em nenhum outro lugar.
+
+A E/S segue o runtime dos executáveis: print de string sem quebra de linha,
+de número seguido de '\\n' (booleanos como 0/1) e input lendo números
+separados por espaço (0 no fim da entrada). Os int também se comportam como
+nos executáveis: têm int_bits bits (32 no alvo x86, 64 no x86-64) e dão a
+volta no complemento de dois em vez de crescer sem limite.
+
+Uso:
+    bytecode = BytecodeCompiler().compile(instructions)
+    execute(bytecode)                  # sys.stdin/sys.stdout
+"""
+import sys
+from array import array
+from collections import Counter
+
+from tac import Op, BINARY_OPCODES, COMPARISON_OPS, wrap_int
+
+# Opcodes do bytecode (operandos entre parênteses: d = destino, a/b = origem, L = posição)
+HALT = 0
+COPY = 1            # (d, a)
+ADD = 2             # (d, a, b)
+SUB = 3
+MUL = 4
+DIV = 5
+GT = 6
+LT = 7
+GE = 8
+LE = 9
+EQ = 10
+NE = 11
+NEG = 12            # (d, a)
+NOT = 13
+INPUT = 14          # (d)
+PRINT = 15          # (a)
+PRINT_STR = 16      # (a), a é do tipo str
+JUMP = 17           # (L)
+JUMP_IF_FALSE = 18  # (a, L)
+# Superinstruções: desviam se a comparação é falsa
+JUMP_IF_NOT_GT = 19  # (a, b, L)
+JUMP_IF_NOT_LT = 20
+JUMP_IF_NOT_GE = 21
+JUMP_IF_NOT_LE = 22
+JUMP_IF_NOT_EQ = 23
+JUMP_IF_NOT_NE = 24
+
+OPCODE_NAMES = {value: name for name, value in globals().items() if name.isupper() and isinstance(value, int)}
+
+TAC_OPCODES = {
+    Op.COPY: COPY, Op.ADD: ADD, Op.SUB: SUB, Op.MUL: MUL, Op.DIV: DIV,
+    Op.GT: GT, Op.LT: LT, Op.GE: GE, Op.LE: LE, Op.EQ: EQ, Op.NE: NE,
+    Op.NEG: NEG, Op.NOT: NOT,
+}
+BRANCH_OPCODES = {
+    Op.GT: JUMP_IF_NOT_GT, Op.LT: JUMP_IF_NOT_LT, Op.GE: JUMP_IF_NOT_GE,
+    Op.LE: JUMP_IF_NOT_LE, Op.EQ: JUMP_IF_NOT_EQ, Op.NE: JUMP_IF_NOT_NE,
+}
+# Número de operandos de cada opcode
+OPERAND_COUNTS = {
+    HALT: 0, COPY: 2, NEG: 2, NOT: 2, INPUT: 1, PRINT: 1, PRINT_STR: 1, JUMP: 1, JUMP_IF_FALSE: 2,
+}
+OPERAND_COUNTS.update({opcode: 3 for opcode in (ADD, SUB, MUL, DIV, GT, LT, GE, LE, EQ, NE)})
+OPERAND_COUNTS.update({opcode: 3 for opcode in BRANCH_OPCODES.values()})
+JUMP_OPCODES = frozenset((JUMP, JUMP_IF_FALSE)) | frozenset(BRANCH_OPCODES.values())
+
+OUTPUT_BUFFER = 4096  # Pedaços de saída acumulados antes de cada write
+
+
+class VMError(Exception):
+    pass
+
+
+class Bytecode:
+    def __init__(self, code, slots, names, int_bits=32):
+        self.code = code    # array('i')
+        self.slots = slots  # Valores iniciais dos slots
+        self.names = names  # Nome de cada slot (para a listagem)
+        self.int_bits = int_bits
+
+    def disassemble(self):
+        lines = []
+        code = self.code
+        pc = 0
+        while pc < len(code):
+            opcode = code[pc]
+            count = OPERAND_COUNTS[opcode]
+            operands = list(code[pc + 1:pc + 1 + count])
+            if opcode in JUMP_OPCODES:
+                text = [self.names[slot] for slot in operands[:-1]] + [f"@{operands[-1]}"]
+            else:
+                text = [self.names[slot] for slot in operands]
+            lines.append(f"{pc:5}: {OPCODE_NAMES[opcode]:<15} {', '.join(text)}")
+            pc += 1 + count
+        return '\n'.join(lines)
+
+
+class BytecodeCompiler:
+    def __init__(self, superinstructions=True, int_bits=32):
+        self.superinstructions = superinstructions
+        self.int_bits = int_bits
+        self.fused_branches = 0
+        self.fused_copies = 0
+
+    def compile(self, instructions):
+        self.slot_index = {}
+        # Slots 0..n-1 reservados para os símbolos, indexados pelo id
+        symbols = 1 + max((operand.symbol for instr in instructions for operand in (instr.result, *instr.uses())
+                           if operand is not None and operand.is_var and operand.symbol is not None), default=-1)
+        self.slots = [0] * symbols
+        self.names = [f"#{index}" for index in range(symbols)]
+        uses = Counter(operand for instr in instructions for operand in instr.uses() if not operand.is_literal)
+
+        code = array('i')
+        labels = {}
+        patches = []  # Posições no código que recebem a posição de um label
+        index = 0
+        while index < len(instructions):
+            instr = instructions[index]
+            following = instructions[index + 1] if index + 1 < len(instructions) else None
+            op = instr.op
+            # O resultado só é lido pela instrução seguinte: as duas viram uma
+            single_use = (self.superinstructions and following is not None and instr.result is not None
+                          and instr.result.is_temp and uses[instr.result] == 1)
+
+            if op == Op.LABEL:
+                labels[instr.result] = len(code)
+            elif op == Op.DECLARE:
+                self._slot(instr.result)
+                if instr.arg1 is not None:
+                    code.extend((COPY, self._slot(instr.result), self._slot(instr.arg1)))
+            elif op == Op.INPUT:
+                code.extend((INPUT, self._slot(instr.result)))
+            elif op == Op.PRINT:
+                string = instr.arg1.type == 'str' or instr.arg1.is_string
+                code.extend((PRINT_STR if string else PRINT, self._slot(instr.arg1)))
+            elif op == Op.GOTO:
+                code.extend((JUMP, 0))
+                patches.append((len(code) - 1, instr.result))
+            elif op == Op.IF_FALSE:
+                code.extend((JUMP_IF_FALSE, self._slot(instr.arg1), 0))
+                patches.append((len(code) - 1, instr.result))
+            elif (op in COMPARISON_OPS and single_use and following.op == Op.IF_FALSE
+                  and following.arg1 == instr.result):
+                code.extend((BRANCH_OPCODES[op], self._slot(instr.arg1), self._slot(instr.arg2), 0))
+                patches.append((len(code) - 1, following.result))
+                self.fused_branches += 1
+                index += 1
+            elif op in TAC_OPCODES:
+                target = instr.result
+                if single_use and following.op == Op.COPY and following.arg1 == instr.result:
+                    target = following.result
+                    self.fused_copies += 1
+                    index += 1
+                operands = [self._slot(target), self._slot(instr.arg1)]
+                if op in BINARY_OPCODES:
+                    operands.append(self._slot(instr.arg2))
+                code.append(TAC_OPCODES[op])
+                code.extend(operands)
+            else:
+                raise VMError(f"Instrução não suportada pela VM: {instr}")
+            index += 1
+        code.append(HALT)
+
+        for position, target in patches:
+            code[position] = labels[target]
+        return Bytecode(code, self.slots, self.names, self.int_bits)
+
+    def _slot(self, operand):
+        slot = self.slot_index.get(operand)
+        if slot is None:
+            if operand.is_literal:
+                slot = self.slot_index[operand] = len(self.slots)
+                value = operand.value
+                if isinstance(value, str):
+                    value = value.strip('"')
+                elif not isinstance(value, bool):
+                    value = wrap_int(value, self.int_bits)
+                self.slots.append(value)
+                self.names.append(repr(self.slots[-1]))
+                return slot
+            if operand.symbol is not None:
+                slot = self.slot_index[operand] = operand.symbol
+            else:
+                slot = self.slot_index[operand] = len(self.slots)
+                self.slots.append(None)
+                self.names.append(None)
+            self.slots[slot] = '' if operand.type == 'str' else 0
+            self.names[slot] = str(operand.value)
+        return slot
+
+    def report(self):
+        return (f"Bytecode: {self.fused_branches} comparações fundidas com o desvio, "
+                f"{self.fused_copies} cópias fundidas com a operação")
+
+
+def _read_number(stdin, pending):
+    while not pending:
+        line = stdin.readline()
+        if not line:
+            return 0
+        pending.extend(reversed(line.split()))
+    token = pending.pop()
+    try:
+        return int(token)
+    except ValueError:
+        try:
+            return float(token)
+        except ValueError:
+            return 0
+
+
+def _format(value):
+    if isinstance(value, bool):
+        return '1\n' if value else '0\n'
+    return f"{value}\n"
+
+
+def execute(bytecode, stdin=None, stdout=None):
+    """Executa o bytecode até o fim. Retorna o número de instruções executadas."""
+    stdin = stdin if stdin is not None else sys.stdin
+    stdout = stdout if stdout is not None else sys.stdout
+    code = bytecode.code
+    s = list(bytecode.slots)
+    bits = bytecode.int_bits
+    # Resultados nessa faixa (os float também, quase sempre) não precisam de wrap_int
+    low, high = -(1 << (bits - 1)), (1 << (bits - 1)) - 1
+    pending = []
+    output = []
+    write = output.append
+    executed = 0
+    pc = 0
+
+    try:
+        while True:
+            op = code[pc]
+            executed += 1
+            # Ordem dos testes: os opcodes mais frequentes nos laços primeiro
+            if op == 22:  # JUMP_IF_NOT_LE
+                if s[code[pc + 1]] <= s[code[pc + 2]]:
+                    pc += 4
+                else:
+                    pc = code[pc + 3]
+            elif op == 20:  # JUMP_IF_NOT_LT
+                if s[code[pc + 1]] < s[code[pc + 2]]:
+                    pc += 4
+                else:
+                    pc = code[pc + 3]
+            elif op == 2:  # ADD
+                value = s[code[pc + 2]] + s[code[pc + 3]]
+                s[code[pc + 1]] = value if low <= value <= high else wrap_int(value, bits)
+                pc += 4
+            elif op == 17:  # JUMP
+                pc = code[pc + 1]
+            elif op == 1:  # COPY
+                s[code[pc + 1]] = s[code[pc + 2]]
+                pc += 3
+            elif op == 3:  # SUB
+                value = s[code[pc + 2]] - s[code[pc + 3]]
+                s[code[pc + 1]] = value if low <= value <= high else wrap_int(value, bits)
+                pc += 4
+            elif op == 4:  # MUL
+                value = s[code[pc + 2]] * s[code[pc + 3]]
+                s[code[pc + 1]] = value if low <= value <= high else wrap_int(value, bits)
+                pc += 4
+            elif op == 15:  # PRINT
+                write(_format(s[code[pc + 1]]))
+                if len(output) >= OUTPUT_BUFFER:
+                    stdout.write(''.join(output))
+                    output.clear()
+                pc += 2
+            elif op == 16:  # PRINT_STR
+                write(s[code[pc + 1]])
+                pc += 2
+            elif op == 18:  # JUMP_IF_FALSE
+                if s[code[pc + 1]]:
+                    pc += 3
+                else:
+                    pc = code[pc + 2]
+            elif 19 <= op <= 24:  # Demais comparações com desvio
+                left, right = s[code[pc + 1]], s[code[pc + 2]]
+                if op == 19:
+                    result = left > right
+                elif op == 21:
+                    result = left >= right
+                elif op == 23:
+                    result = left == right
+                else:
+                    result = left != right
+                pc = pc + 4 if result else code[pc + 3]
+            elif 6 <= op <= 11:  # Comparações
+                left, right = s[code[pc + 2]], s[code[pc + 3]]
+                if op == 6:
+                    result = left > right
+                elif op == 7:
+                    result = left < right
+                elif op == 8:
+                    result = left >= right
+                elif op == 9:
+                    result = left <= right
+                elif op == 10:
+                    result = left == right
+                else:
+                    result = left != right
+                s[code[pc + 1]] = result
+                pc += 4
+            elif op == 5:  # DIV (inteira truncada em direção a zero, como idiv)
+                left, right = s[code[pc + 2]], s[code[pc + 3]]
+                if type(left) is int and type(right) is int:
+                    quotient = abs(left) // abs(right)
+                    # Só o mínimo / -1 sai da faixa
+                    s[code[pc + 1]] = wrap_int(quotient if (left < 0) == (right < 0) else -quotient, bits)
+                else:
+                    s[code[pc + 1]] = left / right
+                pc += 4
+            elif op == 12:  # NEG
+                s[code[pc + 1]] = wrap_int(-s[code[pc + 2]], bits)
+                pc += 3
+            elif op == 13:  # NOT
+                s[code[pc + 1]] = not s[code[pc + 2]]
+                pc += 3
+            elif op == 14:  # INPUT
+                stdout.write(''.join(output))  # O que já foi impresso aparece antes da leitura
+                output.clear()
+                s[code[pc + 1]] = wrap_int(_read_number(stdin, pending), bits)
+                pc += 2
+            elif op == 0:  # HALT
+                break
+            else:
+                raise VMError(f"Opcode inválido {op} na posição {pc}")
+    except ZeroDivisionError:
+        raise VMError(f"Divisão por zero na posição {pc}") from None
+    finally:
+        stdout.write(''.join(output))
+        stdout.flush()
+    return executed
@@ -0,0 +1,619 @@
+"""
+Montador x86 (32 bits) em processo para o subconjunto de NASM gerado pelo
+NASMGenerator e usado em runtime.asm.
+
+Cada arquivo é uma unidade: labels e constantes (equ) são locais à unidade, a
+menos que sejam declarados com global; extern só documenta o que vem de outra
+unidade. Labels que começam com '.' pertencem ao último label normal.
+
+Os saltos e chamadas usam sempre deslocamentos de 32 bits, então o tamanho de
+cada instrução não depende dos endereços e uma única passada basta: operandos
+que dependem de um label são emitidos com 32 bits e anotados como correções
+(fixups), aplicadas em link() depois que os endereços das seções são conhecidos.
+
+Uso:
+    assembler = Assembler()
+    assembler.assemble(runtime)
+    assembler.assemble(codigo_gerado)
+    text, data = assembler.link(text_address, data_address, bss_address)
+"""
+import re
+import struct
+
+REGISTERS_32 = {'eax': 0, 'ecx': 1, 'edx': 2, 'ebx': 3, 'esp': 4, 'ebp': 5, 'esi': 6, 'edi': 7}
+REGISTERS_8 = {'al': 0, 'cl': 1, 'dl': 2, 'bl': 3, 'ah': 4, 'ch': 5, 'dh': 6, 'bh': 7}
+
+CONDITION_CODES = {
+    'o': 0, 'no': 1, 'b': 2, 'c': 2, 'nae': 2, 'ae': 3, 'nb': 3, 'nc': 3,
+    'e': 4, 'z': 4, 'ne': 5, 'nz': 5, 'be': 6, 'na': 6, 'a': 7, 'nbe': 7,
+    's': 8, 'ns': 9, 'p': 10, 'np': 11, 'l': 12, 'nge': 12, 'ge': 13, 'nl': 13,
+    'le': 14, 'ng': 14, 'g': 15, 'nle': 15,
+}
+
+# Operações aritméticas com a mesma codificação (número da extensão em /r)
+ALU_OPS = {'add': 0, 'or': 1, 'and': 4, 'sub': 5, 'xor': 6, 'cmp': 7}
+# Operações F7 /n sobre r/m32
+GROUP3_OPS = {'not': 2, 'neg': 3, 'mul': 4, 'idiv': 7, 'div': 6}
+SHIFT_OPS = {'shl': 4, 'sal': 4, 'shr': 5, 'sar': 7}
+SIMPLE_OPS = {'ret': b'\xc3', 'cdq': b'\x99', 'pushad': b'\x60', 'popad': b'\x61', 'nop': b'\x90'}
+
+SECTIONS = ('.text', '.data', '.bss')
+
+TOKEN_RE = re.compile(r"\s*(?:(0x[0-9a-fA-F]+|\d+)|('[^']')|(__float32__\([^)]*\))|([A-Za-z_.][\w.]*)|(.))")
+
+
+class AssemblerError(Exception):
+    pass
+
+
+class Value:
+    """Valor de uma expressão: constante mais, opcionalmente, o endereço de um símbolo"""
+    __slots__ = ('constant', 'symbol')
+
+    def __init__(self, constant=0, symbol=None):
+        self.constant = constant
+        self.symbol = symbol
+
+    def __add__(self, other):
+        if self.symbol and other.symbol:
+            raise AssemblerError("Expressão com dois símbolos")
+        return Value(self.constant + other.constant, self.symbol or other.symbol)
+
+    def __neg__(self):
+        if self.symbol:
+            raise AssemblerError(f"Endereço negado: {self.symbol}")
+        return Value(-self.constant)
+
+    def __mul__(self, other):
+        if self.symbol or other.symbol:
+            raise AssemblerError("Endereço multiplicado")
+        return Value(self.constant * other.constant)
+
+
+class Memory:
+    __slots__ = ('base', 'index', 'scale', 'displacement', 'size')
+
+    def __init__(self, base, index, scale, displacement, size):
+        self.base = base
+        self.index = index
+        self.scale = scale
+        self.displacement = displacement
+        self.size = size
+
+
+class Unit:
+    """Símbolos locais de um arquivo"""
+
+    def __init__(self):
+        self.symbols = {}    # Nome -> (seção, deslocamento)
+        self.constants = {}  # Nome -> valor (equ)
+        self.globals = set()
+
+
+class Assembler:
+    def __init__(self):
+        self.sections = {'.text': bytearray(), '.data': bytearray()}
+        self.bss_size = 0
+        self.units = []
+        self.exported = {}  # Símbolos globais: nome -> (unidade, seção, deslocamento)
+        self.fixups = []    # (unidade, seção, posição, valor, relativo)
+
+    def copy(self):
+        """Cópia do estado atual: permite montar uma unidade fixa (o runtime) uma única vez"""
+        clone = Assembler()
+        clone.sections = {name: bytearray(content) for name, content in self.sections.items()}
+        clone.bss_size = self.bss_size
+        clone.units = list(self.units)
+        clone.exported = dict(self.exported)
+        clone.fixups = list(self.fixups)
+        return clone
+
+    # ---- Análise das linhas ----
+
+    def assemble(self, source):
+        unit = Unit()
+        self.units.append(unit)
+        self.unit = unit
+        self.section = '.text'
+        self.scope = ''
+        for number, line in enumerate(source.split('\n'), 1):
+            try:
+                self._line(line)
+            except AssemblerError as e:
+                raise AssemblerError(f"linha {number}: {e}: {line.strip()}") from None
+        for name in unit.globals:
+            if name not in unit.symbols:
+                raise AssemblerError(f"Símbolo global não definido: {name}")
+            self.exported[name] = (unit,) + unit.symbols[name]
+
+    def _line(self, line):
+        line = _strip_comment(line).strip()
+        if not line:
+            return
+        match = re.match(r'([A-Za-z_.][\w.]*):\s*(.*)$', line)
+        if match:
+            self._define_label(match.group(1))
+            line = match.group(2)
+            if not line:
+                return
+        head, _, rest = line.partition(' ')
+        head, rest = head.lower(), rest.strip()
+
+        if head == 'section' or head == 'segment':
+            name = rest.split()[0]
+            if name not in SECTIONS:
+                raise AssemblerError(f"Seção não suportada: {name}")
+            self.section = name
+        elif head == 'global':
+            self.unit.globals.update(name.strip() for name in rest.split(','))
+        elif head == 'extern':
+            pass  # Resolvido pelos símbolos globais das outras unidades
+        elif head == 'bits':
+            if rest != '32':
+                raise AssemblerError("Só o modo de 32 bits é suportado")
+        elif head == 'align':
+            self._align(self._constant(rest))
+        elif head in ('resb', 'resd') or head in ('db', 'dd'):
+            raise AssemblerError("Diretiva de dados sem label")
+        else:
+            parts = rest.split(None, 1)
+            if parts and parts[0].lower() in ('equ', 'db', 'dd', 'resb', 'resd'):
+                self._data_directive(line.split(None, 1)[0], parts[0].lower(), parts[1] if len(parts) > 1 else '')
+            else:
+                self._instruction(head, rest)
+
+    def _define_label(self, name):
+        if name.startswith('.'):
+            name = self.scope + name
+        else:
+            self.scope = name
+        if name in self.unit.symbols:
+            raise AssemblerError(f"Label redefinido: {name}")
+        offset = self.bss_size if self.section == '.bss' else len(self.sections[self.section])
+        self.unit.symbols[name] = (self.section, offset)
+
+    def _data_directive(self, name, directive, operands):
+        if directive == 'equ':
+            self.unit.constants[name] = self._constant(operands)
+            return
+        self._define_label(name)
+        if directive in ('resb', 'resd'):
+            if self.section != '.bss':
+                raise AssemblerError(f"{directive} fora da seção .bss")
+            self.bss_size += self._constant(operands) * (4 if directive == 'resd' else 1)
+            return
+        if self.section == '.bss':
+            raise AssemblerError(f"{directive} na seção .bss")
+        for item in _split_operands(operands):
+            if directive == 'db' and item.startswith("'") and item.endswith("'") and len(item) != 3:
+                self._emit(item[1:-1].encode('latin-1'))
+            else:
+                value = self._expression(item)
+                if directive == 'db':
+                    self._emit(bytes([self._resolved(value) & 0xFF]))
+                else:
+                    self._emit_imm32(value)
+
+    def _align(self, alignment):
+        if self.section == '.bss':
+            self.bss_size += -self.bss_size % alignment
+        else:
+            padding = -len(self.sections[self.section]) % alignment
+            self._emit((b'\x90' if self.section == '.text' else b'\x00') * padding)
+
+    # ---- Expressões e operandos ----
+
+    def _expression(self, text):
+        tokens = [token for token in TOKEN_RE.findall(text) if any(token)]
+        position = 0
+
+        def peek():
+            return tokens[position][4] if position < len(tokens) else None
+
+        def primary():
+            nonlocal position
+            number, char, float_literal, name, symbol = tokens[position]
+            position += 1
+            if number:
+                return Value(int(number, 0))
+            if char:
+                return Value(ord(char[1]))
+            if float_literal:
+                value = float(float_literal[len('__float32__('):-1])
+                return Value(struct.unpack('<i', struct.pack('<f', value))[0])
+            if name:
+                if name in self.unit.constants:
+                    return Value(self.unit.constants[name])
+                return Value(0, self.scope + name if name.startswith('.') else name)
+            if symbol == '-':
+                return -primary()
+            if symbol == '+':
+                return primary()
+            if symbol == '(':
+                value = additive()
+                position += 1  # ')'
+                return value
+            raise AssemblerError(f"Expressão inválida: {text}")
+
+        def term():
+            nonlocal position
+            value = primary()
+            while peek() == '*':
+                position += 1
+                value = value * primary()
+            return value
+
+        def additive():
+            nonlocal position
+            value = term()
+            while peek() in ('+', '-'):
+                sign = peek()
+                position += 1
+                right = term()
+                value = value + (right if sign == '+' else -right)
+            return value
+
+        if not tokens:
+            raise AssemblerError("Expressão vazia")
+        value = additive()
+        if position != len(tokens):
+            raise AssemblerError(f"Expressão inválida: {text}")
+        return value
+
+    def _constant(self, text):
+        return self._resolved(self._expression(text))
+
+    def _resolved(self, value):
+        if value.symbol:
+            raise AssemblerError(f"Constante esperada, encontrado o símbolo {value.symbol}")
+        return value.constant
+
+    def _operand(self, text):
+        """('reg32', n), ('reg8', n), ('mem', Memory) ou ('imm', Value)"""
+        text = text.strip()
+        lowered = text.lower()
+        if lowered in REGISTERS_32:
+            return 'reg32', REGISTERS_32[lowered]
+        if lowered in REGISTERS_8:
+            return 'reg8', REGISTERS_8[lowered]
+        size = None
+        for prefix, prefix_size in (('byte', 8), ('dword', 32)):
+            if lowered.startswith(prefix + ' ') or lowered.startswith(prefix + '['):
+                size = prefix_size
+                text = text[len(prefix):].strip()
+                break
+        if text.startswith('['):
+            if not text.endswith(']'):
+                raise AssemblerError(f"Operando de memória inválido: {text}")
+            return 'mem', self._memory(text[1:-1], size)
+        return 'imm', self._expression(text)
+
+    def _memory(self, text, size):
+        base = index = None
+        scale = 1
+        constant_terms = []
+        for sign, term in re.findall(r'([+-]?)\s*([^+-]+)', text.replace(' ', '')):
+            factors = term.split('*')
+            registers = [factor for factor in factors if factor.lower() in REGISTERS_32]
+            if registers:
+                if sign == '-':
+                    raise AssemblerError("Registrador subtraído no endereço")
+                register = REGISTERS_32[registers[0].lower()]
+                if len(factors) == 2:
+                    other = factors[1] if factors[0] in registers else factors[0]
+                    index, scale = register, self._constant(other)
+                elif base is None:
+                    base = register
+                else:
+                    index = register
+            else:
+                constant_terms.append(sign + term)
+        displacement = self._expression(''.join(constant_terms)) if constant_terms else Value()
+        if index == REGISTERS_32['esp']:
+            if scale != 1 or base == REGISTERS_32['esp']:
+                raise AssemblerError("esp não pode ser índice")
+            base, index = index, base
+        return Memory(base, index, scale, displacement, size)
+
+    # ---- Emissão ----
+
+    def _emit(self, data):
+        if self.section == '.bss':
+            raise AssemblerError("Dados na seção .bss")
+        self.sections[self.section] += data
+
+    def _emit_imm32(self, value, relative=False):
+        if value.symbol:
+            position = len(self.sections[self.section])
+            self.fixups.append((self.unit, self.section, position, value, relative))
+        self._emit(struct.pack('<i', _wrap32(value.constant)))
+
+    def _modrm(self, reg, operand):
+        """ModR/M (e SIB e deslocamento) para reg e um operando registrador ou memória"""
+        kind, value = operand
+        if kind in ('reg32', 'reg8'):
+            self._emit(bytes([0xC0 | reg << 3 | value]))
+            return
+        memory = value
+        displacement = memory.displacement
+        if memory.base is None and memory.index is None:
+            self._emit(bytes([reg << 3 | 0b101]))
+            self._emit_imm32(displacement)
+            return
+
+        if displacement.symbol:
+            mod = 0b10
+        elif displacement.constant == 0 and memory.base != REGISTERS_32['ebp']:
+            mod = 0b00
+        elif -128 <= displacement.constant <= 127:
+            mod = 0b01
+        else:
+            mod = 0b10
+
+        if memory.index is None and memory.base != REGISTERS_32['esp']:
+            self._emit(bytes([mod << 6 | reg << 3 | memory.base]))
+        else:
+            index = 0b100 if memory.index is None else memory.index
+            scale = {1: 0, 2: 1, 4: 2, 8: 3}[memory.scale]
+            if memory.base is None:
+                mod, base = 0b00, 0b101  # Índice sem base: sempre disp32
+            else:
+                base = memory.base
+            self._emit(bytes([mod << 6 | reg << 3 | 0b100, scale << 6 | index << 3 | base]))
+            if memory.base is None:
+                self._emit_imm32(displacement)
+                return
+
+        if mod == 0b01:
+            self._emit(struct.pack('<b', displacement.constant))
+        elif mod == 0b10:
+            self._emit_imm32(displacement)
+
+    def _instruction(self, mnemonic, rest):
+        operands = [self._operand(text) for text in _split_operands(rest)] if rest else []
+        kinds = tuple(kind for kind, _ in operands)
+
+        if mnemonic in SIMPLE_OPS and not operands:
+            self._emit(SIMPLE_OPS[mnemonic])
+
+        elif mnemonic == 'mov':
+            self._mov(operands, kinds)
+
+        elif mnemonic == 'movzx':
+            if kinds[0] != 'reg32' or _size(operands[1]) != 8:
+                raise AssemblerError("movzx suportado só de 8 para 32 bits")
+            self._emit(b'\x0f\xb6')
+            self._modrm(operands[0][1], operands[1])
+
+        elif mnemonic == 'lea':
+            if kinds != ('reg32', 'mem'):
+                raise AssemblerError("lea exige registrador e memória")
+            self._emit(b'\x8d')
+            self._modrm(operands[0][1], operands[1])
+
+        elif mnemonic in ALU_OPS or mnemonic == 'test':
+            self._alu(mnemonic, operands, kinds)
+
+        elif mnemonic == 'imul':
+            self._imul(operands, kinds)
+
+        elif mnemonic in GROUP3_OPS:
+            self._emit(b'\xf6' if _size(operands[0]) == 8 else b'\xf7')
+            self._modrm(GROUP3_OPS[mnemonic], operands[0])
+
+        elif mnemonic in ('inc', 'dec'):
+            extension = 0 if mnemonic == 'inc' else 1
+            if kinds[0] == 'reg32':
+                self._emit(bytes([(0x40 if mnemonic == 'inc' else 0x48) + operands[0][1]]))
+            else:
+                self._emit(b'\xfe' if _size(operands[0]) == 8 else b'\xff')
+                self._modrm(extension, operands[0])
+
+        elif mnemonic in SHIFT_OPS:
+            count = self._resolved(operands[1][1]) if kinds[1] == 'imm' else None
+            if count is None:
+                raise AssemblerError("Deslocamento só por imediato")
+            if count == 1:
+                self._emit(b'\xd1')
+                self._modrm(SHIFT_OPS[mnemonic], operands[0])
+            else:
+                self._emit(b'\xc1')
+                self._modrm(SHIFT_OPS[mnemonic], operands[0])
+                self._emit(bytes([count & 0xFF]))
+
+        elif mnemonic == 'push':
+            kind, value = operands[0]
+            if kind == 'reg32':
+                self._emit(bytes([0x50 + value]))
+            elif kind == 'imm':
+                if not value.symbol and -128 <= value.constant <= 127:
+                    self._emit(b'\x6a' + struct.pack('<b', value.constant))
+                else:
+                    self._emit(b'\x68')
+                    self._emit_imm32(value)
+            else:
+                self._emit(b'\xff')
+                self._modrm(6, operands[0])
+
+        elif mnemonic == 'pop':
+            kind, value = operands[0]
+            if kind == 'reg32':
+                self._emit(bytes([0x58 + value]))
+            else:
+                self._emit(b'\x8f')
+                self._modrm(0, operands[0])
+
+        elif mnemonic == 'int':
+            self._emit(bytes([0xCD, self._resolved(operands[0][1]) & 0xFF]))
+
+        elif mnemonic in ('call', 'jmp'):
+            if kinds != ('imm',):
+                raise AssemblerError(f"{mnemonic} só com label")
+            self._emit(b'\xe8' if mnemonic == 'call' else b'\xe9')
+            self._emit_imm32(operands[0][1], relative=True)
+
+        elif mnemonic.startswith('j') and mnemonic[1:] in CONDITION_CODES:
+            self._emit(bytes([0x0F, 0x80 + CONDITION_CODES[mnemonic[1:]]]))
+            self._emit_imm32(operands[0][1], relative=True)
+
+        elif mnemonic.startswith('set') and mnemonic[3:] in CONDITION_CODES:
+            self._emit(bytes([0x0F, 0x90 + CONDITION_CODES[mnemonic[3:]]]))
+            self._modrm(0, operands[0])
+
+        else:
+            raise AssemblerError(f"Instrução não suportada: {mnemonic}")
+
+    def _mov(self, operands, kinds):
+        (kind, target), (source_kind, source) = operands
+        size = _size(operands[0]) or _size(operands[1])
+        if size is None:
+            raise AssemblerError("Tamanho do operando indefinido")
+        wide = size == 32
+        if source_kind == 'imm':
+            if kind in ('reg32', 'reg8'):
+                self._emit(bytes([(0xB8 if wide else 0xB0) + target]))
+            else:
+                self._emit(b'\xc7' if wide else b'\xc6')
+                self._modrm(0, operands[0])
+            if wide:
+                self._emit_imm32(source)
+            else:
+                self._emit(bytes([self._resolved(source) & 0xFF]))
+        elif source_kind in ('reg32', 'reg8'):
+            self._emit(b'\x89' if wide else b'\x88')
+            self._modrm(source, operands[0])
+        elif kind in ('reg32', 'reg8'):
+            self._emit(b'\x8b' if wide else b'\x8a')
+            self._modrm(target, operands[1])
+        else:
+            raise AssemblerError("mov de memória para memória")
+
+    def _alu(self, mnemonic, operands, kinds):
+        (kind, target), (source_kind, source) = operands
+        size = _size(operands[0]) or _size(operands[1])
+        if size is None:
+            raise AssemblerError("Tamanho do operando indefinido")
+        wide = size == 32
+        if mnemonic == 'test':
+            if source_kind == 'imm':
+                self._emit(b'\xf7' if wide else b'\xf6')
+                self._modrm(0, operands[0])
+                self._emit_imm32(source) if wide else self._emit(bytes([self._resolved(source) & 0xFF]))
+            else:
+                self._emit(b'\x85' if wide else b'\x84')
+                self._modrm(source, operands[0])
+            return
+        extension = ALU_OPS[mnemonic]
+        if source_kind == 'imm':
+            if not wide:
+                self._emit(b'\x80')
+                self._modrm(extension, operands[0])
+                self._emit(bytes([self._resolved(source) & 0xFF]))
+            elif not source.symbol and -128 <= source.constant <= 127:
+                self._emit(b'\x83')
+                self._modrm(extension, operands[0])
+                self._emit(struct.pack('<b', source.constant))
+            else:
+                self._emit(b'\x81')
+                self._modrm(extension, operands[0])
+                self._emit_imm32(source)
+        elif source_kind in ('reg32', 'reg8'):
+            self._emit(bytes([extension << 3 | (1 if wide else 0)]))
+            self._modrm(source, operands[0])
+        elif kind in ('reg32', 'reg8'):
+            self._emit(bytes([extension << 3 | (3 if wide else 2)]))
+            self._modrm(target, operands[1])
+        else:
+            raise AssemblerError(f"{mnemonic} de memória para memória")
+
+    def _imul(self, operands, kinds):
+        if kinds == ('reg32', 'imm'):
+            operands = [operands[0], operands[0], operands[1]]
+            kinds = ('reg32', 'reg32', 'imm')
+        if len(operands) == 3:
+            immediate = operands[2][1]
+            if not immediate.symbol and -128 <= immediate.constant <= 127:
+                self._emit(b'\x6b')
+                self._modrm(operands[0][1], operands[1])
+                self._emit(struct.pack('<b', immediate.constant))
+            else:
+                self._emit(b'\x69')
+                self._modrm(operands[0][1], operands[1])
+                self._emit_imm32(immediate)
+        elif kinds[0] == 'reg32' and len(operands) == 2:
+            self._emit(b'\x0f\xaf')
+            self._modrm(operands[0][1], operands[1])
+        else:
+            self._emit(b'\xf7')
+            self._modrm(5, operands[0])
+
+    # ---- Ligação ----
+
+    def _address(self, unit, symbol, addresses):
+        if symbol in unit.symbols:
+            section, offset = unit.symbols[symbol]
+        elif symbol in self.exported:
+            _, section, offset = self.exported[symbol]
+        else:
+            raise AssemblerError(f"Símbolo não definido: {symbol}")
+        return addresses[section] + offset
+
+    def symbol_address(self, symbol, addresses):
+        """Endereço de um símbolo global"""
+        if symbol not in self.exported:
+            raise AssemblerError(f"Símbolo não definido: {symbol}")
+        unit, _, _ = self.exported[symbol]
+        return self._address(unit, symbol, addresses)
+
+    def link(self, addresses):
+        """Aplica as correções com os endereços das seções. Retorna o conteúdo de .text e .data."""
+        for unit, section, position, value, relative in self.fixups:
+            target = self._address(unit, value.symbol, addresses) + value.constant
+            if relative:
+                target -= addresses[section] + position + 4
+            struct.pack_into('<I', self.sections[section], position, target & 0xFFFFFFFF)
+        self.fixups = []
+        return bytes(self.sections['.text']), bytes(self.sections['.data'])
+
+
+def _size(operand):
+    kind, value = operand
+    if kind == 'reg32':
+        return 32
+    if kind == 'reg8':
+        return 8
+    if kind == 'mem':
+        return value.size
+    return None
+
+
+def _wrap32(value):
+    return (value + 2 ** 31) % 2 ** 32 - 2 ** 31
+
+
+def _strip_comment(line):
+    quoted = False
+    for position, char in enumerate(line):
+        if char == "'":
+            quoted = not quoted
+        elif char == ';' and not quoted:
+            return line[:position]
+    return line
+
+
+def _split_operands(text):
+    """Separa os operandos por vírgula, respeitando strings entre aspas"""
+    operands = []
+    current = ''
+    quoted = False
+    for char in text:
+        if char == "'":
+            quoted = not quoted
+        if char == ',' and not quoted:
+            operands.append(current.strip())
+            current = ''
+        else:
+            current += char
+    if current.strip():
+        operands.append(current.strip())
+    return operands